@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+from config.counters import recount
+
+
+def backfill(apps, schema_editor):
+    recount(apps.get_model("accounts", "Seller"), "property_count", apps.get_model("property", "Property"), "seller")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('property', '0011_property_lead_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seller',
+            name='property_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,19 +1,24 @@
 from django.db import models
 
+from config.counters import CounterFieldsMixin
 
-class Seller(models.Model):
+
+class Seller(CounterFieldsMixin, models.Model):
     name = models.CharField(max_length=100)
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=15)
     password = models.CharField(max_length=255)
     joined_at = models.DateTimeField(auto_now_add=True)
+    property_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("property_count",)
 
     def __str__(self) -> str:
         return self.name
 
     @property
     def total_properties(self) -> int:
-        return self.properties.count()
+        return self.property_count
 
 
 
@@ -0,0 +1,113 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from leads.models import BuyerLead
+from property.models import Property
+
+from .models import Seller
+
+
+def make_property(seller: Seller) -> Property:
+    return Property.objects.create(
+        seller=seller,
+        title="Flat",
+        category=Property.RESIDENTIAL,
+        subcategory="APARTMENT",
+        property_type="SELL",
+        price=100,
+        address="1 Main Road",
+        city="Pune",
+        state="Maharashtra",
+    )
+
+
+class DashboardQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = Seller.objects.create(name="Seller", email="seller@example.com", phone="9000000000")
+
+    def setUp(self):
+        session = self.client.session
+        session["seller_id"] = self.seller.id
+        session.save()
+
+    def add_property(self, leads: int) -> Property:
+        prop = make_property(self.seller)
+        for n in range(leads):
+            BuyerLead.objects.create(property=prop, name="Buyer", email=f"b{n}@example.com", phone="1")
+        return prop
+
+    def test_query_count_does_not_grow_with_properties_or_leads(self):
+        self.add_property(leads=1)
+        with self.assertNumQueries(3):  # session, seller, properties
+            response = self.client.get(reverse("accounts:dashboard"))
+        self.assertEqual(response.context["total_leads"], 1)
+
+        for leads in (0, 2, 3, 5):
+            self.add_property(leads=leads)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("accounts:dashboard"))
+        self.assertEqual(len(response.context["properties"]), 5)
+        self.assertEqual(response.context["total_leads"], 11)
+        self.assertEqual(sorted(p.lead_count for p in response.context["properties"]), [0, 1, 2, 3, 5])
+
+
+class CounterTests(TestCase):
+    """``config.counters``, through ``Seller.property_count`` and ``Property.lead_count``."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = Seller.objects.create(name="Seller", email="seller@example.com", phone="9000000000")
+
+    def property_count(self) -> int:
+        return Seller.objects.values_list("property_count", flat=True).get(pk=self.seller.pk)
+
+    def test_create_and_delete(self):
+        first, second = make_property(self.seller), make_property(self.seller)
+        lead = BuyerLead.objects.create(property=first, name="Buyer", email="b@example.com", phone="1")
+        self.assertEqual(self.property_count(), 2)
+        first.refresh_from_db()
+        self.assertEqual(first.lead_count, 1)
+
+        lead.delete()
+        second.delete()
+        self.assertEqual(self.property_count(), 1)
+        first.refresh_from_db()
+        self.assertEqual(first.lead_count, 0)
+
+        Property.objects.filter(seller=self.seller).delete()
+        self.assertEqual(self.property_count(), 0)
+
+    def test_rolled_back_create_leaves_count(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            make_property(self.seller)
+            self.assertEqual(self.property_count(), 1)
+            raise RuntimeError
+        self.assertEqual(self.property_count(), 0)
+
+    def test_saving_stale_instance_keeps_count(self):
+        stale = Seller.objects.get(pk=self.seller.pk)
+        make_property(self.seller)
+        stale.name = "Renamed"
+        stale.save()
+        self.assertEqual(self.property_count(), 1)
+
+    def test_repair_counters_check_reports_then_repair_fixes_drift(self):
+        make_property(self.seller)
+        Seller.objects.update(property_count=5)
+
+        out = StringIO()
+        call_command("repair_counters", "--check", stdout=out)
+        self.assertIn("accounts.Seller.property_count: 1 rows off.", out.getvalue())
+        self.assertIn("property.Property.lead_count: 0 rows off.", out.getvalue())
+        self.assertEqual(self.property_count(), 5)
+
+        call_command("repair_counters", stdout=StringIO())
+        self.assertEqual(self.property_count(), 1)
+        out = StringIO()
+        call_command("repair_counters", "--check", stdout=out)
+        self.assertIn("accounts.Seller.property_count: 0 rows off.", out.getvalue())
@@ -6,4 +6,5 @@ class DashboardConfig(AppConfig):
     name = "apps.dashboard"
     label = "core_dashboard"
 
-
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard import rollups
+
+
+class Command(BaseCommand):
+    help = "Refresh the hourly and daily analytics rollups. Runs until interrupted unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Refresh once, then exit.")
+        parser.add_argument("--full", action="store_true", help="Rebuild the tables from scratch first.")
+        parser.add_argument("--interval", type=float, default=300.0, help="Seconds between refreshes.")
+
+    def handle(self, *args, **options):
+        full = options["full"]
+        while True:
+            for model in rollups.TABLES:
+                written = rollups.refresh(model, full=full)
+                self.stdout.write(f"{model.__name__}: wrote {written} row(s).")
+            full = False
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=50, unique=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('metric', models.CharField(choices=[('users', 'Users'), ('properties', 'Properties'), ('enquiries', 'Enquiries')], max_length=20)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('property_type', models.CharField(blank=True, max_length=20)),
+                ('is_approved', models.BooleanField(null=True)),
+                ('count', models.PositiveIntegerField()),
+            ],
+            options={
+                'ordering': ['bucket'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['bucket', 'metric'], name='core_dashbo_bucket_fc7a90_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('metric', models.CharField(choices=[('users', 'Users'), ('properties', 'Properties'), ('enquiries', 'Enquiries')], max_length=20)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('property_type', models.CharField(blank=True, max_length=20)),
+                ('is_approved', models.BooleanField(null=True)),
+                ('count', models.PositiveIntegerField()),
+            ],
+            options={
+                'ordering': ['bucket'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['bucket', 'metric'], name='core_dashbo_bucket_8ae0f4_idx')],
+            },
+        ),
+    ]
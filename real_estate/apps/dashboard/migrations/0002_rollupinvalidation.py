@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:50
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # refresh() reads the current models; it only touches columns that exist
+    # from the dependencies below on (created_at, updated_at, city,
+    # property_type, is_approved).
+    from apps.dashboard import rollups
+
+    for model in rollups.TABLES:
+        rollups.refresh(model, full=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_dashboard', '0001_initial'),
+        ('core_accounts', '0001_initial'),
+        ('core_enquiries', '0001_initial'),
+        ('core_properties', '0007_property_enquiry_count_property_wishlist_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupInvalidation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=50)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['table', 'id'], name='core_dashbo_table_987293_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+from django.db import models
+
+
+class Metric(models.TextChoices):
+    USERS = "users", "Users"
+    PROPERTIES = "properties", "Properties"
+    ENQUIRIES = "enquiries", "Enquiries"
+
+
+class Rollup(models.Model):
+    """
+    Rows of ``metric`` created during the period starting at ``bucket``.
+    Property rows are split by city, type and current approval state; the
+    other metrics leave those blank.
+    """
+
+    bucket = models.DateTimeField()
+    metric = models.CharField(max_length=20, choices=Metric.choices)
+    city = models.CharField(max_length=100, blank=True)
+    property_type = models.CharField(max_length=20, blank=True)
+    is_approved = models.BooleanField(null=True)
+    count = models.PositiveIntegerField()
+
+    class Meta:
+        abstract = True
+        ordering = ["bucket"]
+
+
+class HourlyRollup(Rollup):
+    INTERVAL = "hour"
+
+    class Meta(Rollup.Meta):
+        indexes = [models.Index(fields=["bucket", "metric"])]
+
+
+class DailyRollup(Rollup):
+    INTERVAL = "day"
+
+    class Meta(Rollup.Meta):
+        indexes = [models.Index(fields=["bucket", "metric"])]
+
+
+class RollupCheckpoint(models.Model):
+    """When each rollup table was last brought up to date."""
+
+    table = models.CharField(max_length=50, unique=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.table} @ {self.refreshed_at or 'never'}"
+
+
+class RollupInvalidation(models.Model):
+    """A source row created at ``created_at`` was deleted; ``table`` must recount that period."""
+
+    table = models.CharField(max_length=50)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["table", "id"])]
@@ -0,0 +1,209 @@
+"""
+Precomputed counts for the admin analytics endpoint.
+
+``HourlyRollup`` and ``DailyRollup`` hold, per period (in ``TIME_ZONE``),
+how many users, properties and enquiries were created, with properties
+split by city, type and approval state. ``AdminAnalyticsView`` sums these
+small tables instead of counting and grouping the source tables.
+
+``refresh`` is incremental. It recomputes every period from the previous
+run (less ``LATE_COMMIT_GRACE``, for rows whose transaction committed late)
+up to now. It also recomputes the periods of older properties edited since
+then, so approvals move between the approved and pending counts, and the
+periods of rows deleted since then, which ``signals`` records as
+``RollupInvalidation`` rows in the deleting transaction.
+``refresh(model, full=True)`` rebuilds a table from scratch; migration 0002
+does that once, and ``manage.py refresh_analytics`` runs both tables on a
+schedule.
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.enquiries.models import Enquiry
+from apps.properties.models import Property
+
+from .models import DailyRollup, HourlyRollup, Metric, RollupCheckpoint, RollupInvalidation
+
+LATE_COMMIT_GRACE = timedelta(minutes=5)
+TABLES = (HourlyRollup, DailyRollup)
+DIMENSIONS = ("city", "property_type", "is_approved")
+
+_TRUNC = {"hour": TruncHour, "day": TruncDay}
+
+
+def floor(model, value: datetime) -> datetime:
+    """Start of the ``model`` period containing ``value``."""
+    local = timezone.localtime(value)
+    if model.INTERVAL == "hour":
+        return local.replace(minute=0, second=0, microsecond=0)
+    return timezone.make_aware(datetime.combine(local.date(), time()))
+
+
+def following(model, bucket: datetime) -> datetime:
+    if model.INTERVAL == "hour":
+        # Step in UTC so a DST change doesn't repeat or skip an hour.
+        return timezone.localtime(bucket.astimezone(dt_timezone.utc) + timedelta(hours=1))
+    return timezone.make_aware(datetime.combine(timezone.localtime(bucket).date() + timedelta(days=1), time()))
+
+
+def buckets(model, start: datetime, end: datetime) -> list[datetime]:
+    """Every period start from the one containing ``start`` to the one containing ``end``."""
+    bucket, last, result = floor(model, start), floor(model, end), []
+    while bucket <= last:
+        result.append(bucket)
+        bucket = following(model, bucket)
+    return result
+
+
+def retention_start(model, now: datetime) -> datetime | None:
+    if model is HourlyRollup:
+        return floor(model, now - timedelta(days=settings.ANALYTICS_HOURLY_RETENTION_DAYS))
+    return None
+
+
+def invalidate(created_at: datetime) -> None:
+    """Have the next refresh of each table recompute the period holding ``created_at``."""
+    RollupInvalidation.objects.bulk_create(
+        [RollupInvalidation(table=model._meta.label, created_at=created_at) for model in TABLES]
+    )
+
+
+def _sources():
+    yield Metric.USERS, User.objects.all(), ()
+    yield Metric.PROPERTIES, Property.objects.all(), DIMENSIONS
+    yield Metric.ENQUIRIES, Enquiry.objects.all(), ()
+
+
+def _aggregate(model, window: Q) -> list:
+    trunc = _TRUNC[model.INTERVAL]
+    rows = []
+    for metric, queryset, dimensions in _sources():
+        grouped = (
+            queryset.filter(window)
+            .annotate(period=trunc("created_at"))
+            .values("period", *dimensions)
+            .annotate(n=Count("pk"))
+            .order_by()
+        )
+        for row in grouped:
+            rows.append(
+                model(
+                    bucket=row.pop("period"),
+                    metric=metric,
+                    count=row.pop("n"),
+                    **row,
+                )
+            )
+    return rows
+
+
+def refresh(model, full: bool = False) -> int:
+    """Bring ``model`` up to date; returns the number of rows written."""
+    now = timezone.now()
+    oldest = retention_start(model, now)
+    RollupCheckpoint.objects.get_or_create(table=model._meta.label)
+    with transaction.atomic():
+        # Serialises concurrent refreshes of the same table.
+        checkpoint = RollupCheckpoint.objects.select_for_update().get(table=model._meta.label)
+        invalidations = RollupInvalidation.objects.filter(table=model._meta.label)
+        last_invalidation = invalidations.order_by("-pk").values_list("pk", flat=True).first()
+        if full or checkpoint.refreshed_at is None:
+            window = Q() if oldest is None else Q(created_at__gte=oldest)
+            stale = model.objects.all()
+        else:
+            since = checkpoint.refreshed_at - LATE_COMMIT_GRACE
+            start = floor(model, since if oldest is None else max(since, oldest))
+            edited = Property.objects.filter(updated_at__gte=since, created_at__lt=start)
+            if oldest is not None:
+                edited = edited.filter(created_at__gte=oldest)
+            touched = set(
+                edited.annotate(period=_TRUNC[model.INTERVAL]("created_at"))
+                .values_list("period", flat=True)
+                .distinct()
+                .order_by()
+            )
+            # Periods that lost rows to deletes.
+            for created_at in invalidations.values_list("created_at", flat=True).distinct():
+                if created_at < start and (oldest is None or created_at >= oldest):
+                    touched.add(floor(model, created_at))
+            window = Q(created_at__gte=start)
+            for bucket in touched:
+                window |= Q(created_at__gte=bucket, created_at__lt=following(model, bucket))
+            stale = model.objects.filter(Q(bucket__gte=start) | Q(bucket__in=touched))
+        stale.delete()
+        rows = model.objects.bulk_create(_aggregate(model, window), batch_size=1000)
+        if oldest is not None:
+            model.objects.filter(bucket__lt=oldest).delete()
+        if last_invalidation is not None:
+            invalidations.filter(pk__lte=last_invalidation).delete()
+        checkpoint.refreshed_at = now
+        checkpoint.save(update_fields=["refreshed_at"])
+    return len(rows)
+
+
+def refreshed_at() -> datetime | None:
+    return (
+        RollupCheckpoint.objects.filter(table=DailyRollup._meta.label)
+        .values_list("refreshed_at", flat=True)
+        .first()
+    )
+
+
+def totals() -> dict:
+    """All-time counts, and the top cities and property types, from the daily table."""
+    counts = {
+        (row["metric"], row["is_approved"]): row["n"]
+        for row in DailyRollup.objects.values("metric", "is_approved").annotate(n=Sum("count")).order_by()
+    }
+    properties = DailyRollup.objects.filter(metric=Metric.PROPERTIES)
+    approved = counts.get((Metric.PROPERTIES, True), 0)
+    pending = counts.get((Metric.PROPERTIES, False), 0)
+    return {
+        "total_users": counts.get((Metric.USERS, None), 0),
+        "total_properties": approved + pending,
+        "approved_properties": approved,
+        "pending_properties": pending,
+        "total_enquiries": counts.get((Metric.ENQUIRIES, None), 0),
+        "properties_by_city": list(
+            properties.values("city").annotate(count=Sum("count")).order_by("-count", "city")[:10]
+        ),
+        "properties_by_type": list(
+            properties.values("property_type").annotate(count=Sum("count")).order_by("-count", "property_type")
+        ),
+    }
+
+
+def series(model, start: datetime, end: datetime) -> list[dict]:
+    """One point per period from ``start`` to ``end``, zero-filled."""
+    periods = buckets(model, start, end)
+    points = {
+        bucket: {
+            "bucket": bucket.isoformat(),
+            "users": 0,
+            "properties": 0,
+            "approved_properties": 0,
+            "pending_properties": 0,
+            "enquiries": 0,
+        }
+        for bucket in periods
+    }
+    rows = (
+        model.objects.filter(bucket__gte=periods[0], bucket__lte=periods[-1])
+        .values("bucket", "metric", "is_approved")
+        .annotate(n=Sum("count"))
+        .order_by()
+    )
+    for row in rows:
+        point = points.get(timezone.localtime(row["bucket"]))
+        if point is None:
+            continue
+        point[row["metric"]] += row["n"]
+        if row["metric"] == Metric.PROPERTIES:
+            point["approved_properties" if row["is_approved"] else "pending_properties"] += row["n"]
+    return list(points.values())
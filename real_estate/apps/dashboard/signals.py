@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.accounts.models import User
+from apps.enquiries.models import Enquiry
+from apps.properties.models import Property
+
+from . import rollups
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Property)
+@receiver(post_delete, sender=Enquiry)
+def invalidate_rollups(sender, instance, **kwargs) -> None:
+    """Deletes leave nothing for ``refresh`` to find, so note the period now."""
+    if instance.created_at is not None:
+        rollups.invalidate(instance.created_at)
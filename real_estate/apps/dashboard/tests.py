@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.enquiries.models import Enquiry
+from apps.properties.models import Property
+
+from . import rollups
+from .models import DailyRollup, HourlyRollup, RollupInvalidation
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_superuser(email="admin@example.com", password="x")
+
+    def add_property(self, days_ago: int = 0, **fields) -> Property:
+        prop = Property.objects.create(
+            owner=self.owner,
+            title="Flat",
+            property_type="FLAT",
+            listing_type="SALE",
+            price=100,
+            area_sqft=500,
+            city="Pune",
+            **fields,
+        )
+        if days_ago:
+            Property.objects.filter(pk=prop.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+            prop.refresh_from_db()
+        return prop
+
+    def refresh(self, full: bool = False) -> None:
+        for model in rollups.TABLES:
+            rollups.refresh(model, full=full)
+
+    def test_incremental_refresh_adds_new_rows(self):
+        self.refresh(full=True)
+        self.add_property()
+        Enquiry.objects.create(buyer=self.owner, property=self.add_property(), message="Hi")
+        self.refresh()
+        totals = rollups.totals()
+        self.assertEqual(
+            (totals["total_users"], totals["total_properties"], totals["total_enquiries"]), (1, 2, 1)
+        )
+        self.assertEqual(totals["properties_by_city"], [{"city": "Pune", "count": 2}])
+
+    def test_delete_of_an_old_row_is_subtracted(self):
+        old = self.add_property(days_ago=10)
+        self.add_property(days_ago=3)
+        self.refresh(full=True)
+        self.assertEqual(rollups.totals()["total_properties"], 2)
+
+        old.delete()
+        self.assertEqual(RollupInvalidation.objects.count(), len(rollups.TABLES))
+        self.refresh()
+        self.assertEqual(rollups.totals()["total_properties"], 1)
+        self.assertFalse(RollupInvalidation.objects.exists())
+        points = rollups.series(DailyRollup, timezone.now() - timedelta(days=13), timezone.now())
+        self.assertEqual([point["properties"] for point in points if point["properties"]], [1])
+
+    def test_rolled_back_delete_invalidates_nothing(self):
+        prop = self.add_property(days_ago=10)
+        self.refresh(full=True)
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            prop.delete()
+            raise RuntimeError
+        self.assertFalse(RollupInvalidation.objects.exists())
+
+    def test_approving_an_old_property_moves_it_to_approved(self):
+        prop = self.add_property(days_ago=5)
+        self.refresh(full=True)
+        self.assertEqual(rollups.totals()["pending_properties"], 1)
+        prop.is_approved = True
+        prop.save()
+        self.refresh()
+        totals = rollups.totals()
+        self.assertEqual((totals["approved_properties"], totals["pending_properties"]), (1, 0))
+
+    def test_hourly_series_is_zero_filled(self):
+        self.add_property()
+        self.refresh(full=True)
+        now = timezone.now()
+        points = rollups.series(HourlyRollup, now - timedelta(hours=23), now)
+        self.assertEqual(len(points), 24)
+        self.assertEqual(sum(point["properties"] for point in points), 1)
+        self.assertEqual(points[-1]["pending_properties"], 1)
+
+
+class AdminAnalyticsViewTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser(email="admin@example.com", password="x"))
+
+    def test_series_length_follows_range(self):
+        rollups.refresh(DailyRollup, full=True)
+        response = self.client.get("/api/admin/analytics/", {"range": "7d"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["interval"], "day")
+        self.assertEqual(len(response.data["series"]), 7)
+
+    def test_bad_range_is_rejected(self):
+        for value in ("0d", "1y", "9999d"):
+            self.assertEqual(self.client.get("/api/admin/analytics/", {"range": value}).status_code, 400)
@@ -1,12 +1,14 @@
 from django.urls import path
 
 from apps.properties.views import PropertyViewSet
-from .views import AdminAnalyticsView, AdminUsersView
+from .views import AdminAnalyticsView, AdminCacheStatsView, AdminDbStatsView, AdminUsersView
 
 
 urlpatterns = [
     path("admin/users/", AdminUsersView.as_view()),
     path("admin/analytics/", AdminAnalyticsView.as_view()),
+    path("admin/cache/", AdminCacheStatsView.as_view()),
+    path("admin/db/", AdminDbStatsView.as_view()),
     # exact endpoint requested: PUT /api/admin/property/{id}/approve/
     path("admin/property/<uuid:pk>/approve/", PropertyViewSet.as_view({"put": "approve"})),
 ]
@@ -1,5 +1,9 @@
-from django.db.models import Count, Q
+import re
+from datetime import timedelta
+
+from django.conf import settings
 from django.shortcuts import render
+from django.utils import timezone
 from django.views import View
 from rest_framework import status
 from rest_framework.permissions import IsAdminUser
@@ -7,7 +11,15 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.accounts.models import User
-from apps.properties.models import Property
+from config.cache import cache_stats, get_cache
+from config.db_backends import db_stats
+from config.db_router import replica_reads
+
+from . import rollups
+from .models import DailyRollup, HourlyRollup
+
+ANALYTICS_CACHE_TIMEOUT = 60
+RANGE_RE = re.compile(r"^(\d+)([hd])$")
 
 
 class BuyerDashboardView(View):
@@ -57,31 +69,61 @@ class AdminUsersView(APIView):
 
 
 class AdminAnalyticsView(APIView):
+    """
+    Totals plus a time series read from the rollup tables (see ``.rollups``).
+
+    ``?range=<n>h`` gives hourly points for the last ``n`` hours (within
+    ``ANALYTICS_HOURLY_RETENTION_DAYS``); ``?range=<n>d`` gives daily points
+    for the last ``n`` days, at most ``MAX_RANGE_DAYS``. Default: ``30d``.
+    """
+
     permission_classes = [IsAdminUser]
-    
+    DEFAULT_RANGE = "30d"
+    MAX_RANGE_DAYS = 730
+
     def get(self, request):
-        total_users = User.objects.count()
-        total_properties = Property.objects.count()
-        approved_properties = Property.objects.filter(is_approved=True).count()
-        pending_properties = Property.objects.filter(is_approved=False).count()
-        
-        # Properties by city
-        properties_by_city = (
-            Property.objects.values('city')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:10]
-        )
-        
-        # Total enquiries
-        from apps.enquiries.models import Enquiry
-        total_enquiries = Enquiry.objects.count()
-        
-        data = {
-            'total_users': total_users,
-            'total_properties': total_properties,
-            'approved_properties': approved_properties,
-            'pending_properties': pending_properties,
-            'total_enquiries': total_enquiries,
-            'properties_by_city': list(properties_by_city),
-        }
+        value = request.query_params.get("range", self.DEFAULT_RANGE)
+        match = RANGE_RE.match(value)
+        if match is None:
+            return Response(
+                {"detail": "range must be a number of hours or days, e.g. 24h or 30d."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        length, unit = int(match[1]), match[2]
+        limit = settings.ANALYTICS_HOURLY_RETENTION_DAYS * 24 if unit == "h" else self.MAX_RANGE_DAYS
+        if not 1 <= length <= limit:
+            return Response({"detail": f"range must be 1{unit} to {limit}{unit}."}, status=status.HTTP_400_BAD_REQUEST)
+        with replica_reads():
+            data = get_cache("apps.dashboard").get_or_set_locked(
+                f"admin:analytics:{length}{unit}",
+                lambda: self.compute(length, unit),
+                ANALYTICS_CACHE_TIMEOUT,
+            )
         return Response(data)
+
+    @staticmethod
+    def compute(length: int, unit: str) -> dict:
+        model, step = (HourlyRollup, timedelta(hours=1)) if unit == "h" else (DailyRollup, timedelta(days=1))
+        now = timezone.now()
+        refreshed_at = rollups.refreshed_at()
+        return {
+            **rollups.totals(),
+            "refreshed_at": refreshed_at.isoformat() if refreshed_at else None,
+            "range": f"{length}{unit}",
+            "interval": model.INTERVAL,
+            "series": rollups.series(model, now - step * (length - 1), now),
+        }
+
+
+class AdminCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
+
+class AdminDbStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(db_stats())
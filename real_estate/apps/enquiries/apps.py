@@ -6,4 +6,5 @@ class EnquiriesConfig(AppConfig):
     name = "apps.enquiries"
     label = "core_enquiries"
 
-
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
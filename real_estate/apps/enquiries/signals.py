@@ -0,0 +1,5 @@
+from config import counters
+
+from .models import Enquiry
+
+counters.track(Enquiry, "property", "enquiry_count")
@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -25,7 +26,8 @@ class EnquiryCreateView(APIView):
         if not prop:
             return Response({"detail": "Property not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        enquiry = Enquiry.objects.create(buyer=request.user, property=prop, message=message)
+        with transaction.atomic():
+            enquiry = Enquiry.objects.create(buyer=request.user, property=prop, message=message)
 
         # Email notification hook (configure email backend in prod)
         # send_mail(...)
@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from .models import CityAlias
+
+
+@admin.register(CityAlias)
+class CityAliasAdmin(admin.ModelAdmin):
+    list_display = ("alias", "city")
+    search_fields = ("alias", "city")
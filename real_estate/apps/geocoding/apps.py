@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class GeocodingConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.geocoding"
+    label = "core_geocoding"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
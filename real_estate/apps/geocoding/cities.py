@@ -0,0 +1,68 @@
+"""
+Canonical city names.
+
+Listing cities are stored normalize()d and mapped through ``CityAlias``, so
+"Bangalore", "bengaluru " and "BENGALURU" all become "bengaluru". The alias
+table is small; it is cached whole and dropped whenever a row changes.
+
+Changing an alias also re-canonicalises the stored ``city_normalized`` of
+the listings it affects (``renormalize_listings``); the
+``renormalize_cities`` command redoes every listing.
+"""
+from django.apps import apps
+
+from config.cache import get_cache
+
+from .models import CityAlias
+from .text import normalize
+
+ALIASES_KEY = "city_aliases"
+ALIASES_TIMEOUT = 60 * 60
+
+_cache = get_cache("apps.geocoding")
+
+
+def _load_aliases() -> dict[str, str]:
+    return dict(CityAlias.objects.values_list("alias", "city"))
+
+
+def aliases() -> dict[str, str]:
+    return _cache.get_or_set_locked(ALIASES_KEY, _load_aliases, ALIASES_TIMEOUT)
+
+
+def invalidate_aliases() -> None:
+    _cache.delete(ALIASES_KEY)
+
+
+def canonical_city(name: str) -> str:
+    key = normalize(name)
+    return aliases().get(key, key)
+
+
+LISTING_MODELS = ("property.Property", "core_properties.Property")
+
+
+def renormalize_listings(names=None, batch_size: int = 1000) -> int:
+    """
+    Recompute ``city_normalized`` for listings currently stored under one of
+    the normalized ``names`` (all listings when ``None``). Returns how many
+    rows changed.
+    """
+    changed = 0
+    for label in LISTING_MODELS:
+        model = apps.get_model(label)
+        queryset = model._default_manager.all()
+        if names is not None:
+            queryset = queryset.filter(city_normalized__in={normalize(name) for name in names})
+        batch = []
+        for listing in queryset.only("pk", "city", "city_normalized").iterator(chunk_size=batch_size):
+            city = canonical_city(listing.city)
+            if city != listing.city_normalized:
+                listing.city_normalized = city
+                batch.append(listing)
+            if len(batch) == batch_size:
+                model._default_manager.bulk_update(batch, ["city_normalized"])
+                changed, batch = changed + len(batch), []
+        model._default_manager.bulk_update(batch, ["city_normalized"])
+        changed += len(batch)
+    return changed
@@ -0,0 +1,58 @@
+"""
+Reading the gazetteer CSV (name,kind,city,state,latitude,longitude,population).
+
+Shared by the ``load_gazetteer`` command and the migration that loads the
+bundled ``data/india_places.csv``, so it takes the ``Place`` model to fill
+in (the historical one, in the migration).
+"""
+import csv
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from .models import PlaceKind
+from .text import normalize
+
+DEFAULT_FILE = Path(__file__).resolve().parent / "data" / "india_places.csv"
+BATCH_SIZE = 1000
+
+
+def read_places(place_model, path=DEFAULT_FILE) -> list:
+    """Unsaved ``place_model`` rows for ``path``. Raises ``ValueError`` on a bad row."""
+    places = []
+    with open(path, newline="", encoding="utf-8") as handle:
+        for line, row in enumerate(csv.DictReader(handle), start=2):
+            kind = (row.get("kind") or PlaceKind.CITY).strip().upper()
+            if kind not in PlaceKind.values:
+                raise ValueError(f"{path}:{line}: unknown kind {kind!r}")
+            try:
+                latitude = Decimal(row["latitude"]).quantize(Decimal("0.000001"))
+                longitude = Decimal(row["longitude"]).quantize(Decimal("0.000001"))
+                population = int(row.get("population") or 0)
+            except (KeyError, InvalidOperation, ValueError) as exc:
+                raise ValueError(f"{path}:{line}: bad coordinates or population") from exc
+            name, city, state = (row.get(k, "").strip() for k in ("name", "city", "state"))
+            places.append(
+                place_model(
+                    name=name,
+                    kind=kind,
+                    city=city,
+                    state=state,
+                    latitude=latitude,
+                    longitude=longitude,
+                    population=population,
+                    normalized_name=normalize(name),
+                    search_name=normalize(" ".join((name, city, state))),
+                )
+            )
+    return places
+
+
+def save_places(place_model, places: list) -> None:
+    """Insert ``places``, updating the ones already there."""
+    place_model.objects.bulk_create(
+        places,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["kind", "normalized_name", "city", "state"],
+        update_fields=["name", "latitude", "longitude", "population", "search_name"],
+    )
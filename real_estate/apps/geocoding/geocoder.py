@@ -0,0 +1,104 @@
+"""
+Query -> coordinates lookup for the property form's location search.
+
+1. The local gazetteer (``Place``): prefix match on the place name or on
+   "name city state", then a close-spelling match for typos.
+2. ``GeocodeCacheEntry``: earlier remote answers, kept for
+   ``GEOCODING_CACHE_TTL`` seconds.
+3. The remote provider (see ``providers``), whose answer is cached. It is
+   always asked for ``MAX_LIMIT`` results, so one entry serves any limit.
+   A failed lookup is cached as "no results" for the shorter
+   ``GEOCODING_NEGATIVE_CACHE_TTL``; a rate-limited one is not cached at all.
+"""
+import difflib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import GeocodeCacheEntry, Place
+from .providers import GeocodingError, RateLimited, get_provider
+from .text import normalize, prefix_q
+
+logger = logging.getLogger(__name__)
+
+MIN_QUERY_LENGTH = 2
+MAX_LIMIT = 10
+FUZZY_CANDIDATES = 500
+
+
+def _place_result(place: Place) -> dict:
+    return {
+        "name": place.name,
+        "display_name": place.display_name,
+        "latitude": float(place.latitude),
+        "longitude": float(place.longitude),
+        "kind": place.kind,
+        "source": "gazetteer",
+    }
+
+
+def gazetteer_lookup(query: str, limit: int = 5) -> list[Place]:
+    key = normalize(query)
+    if len(key) < MIN_QUERY_LENGTH:
+        return []
+    places = list(
+        Place.objects.filter(prefix_q("normalized_name", key) | prefix_q("search_name", key))[:limit]
+    )
+    if places:
+        return places
+    # Typo tolerance: compare against names sharing the first two letters.
+    candidates = {
+        place.normalized_name: place
+        for place in Place.objects.filter(prefix_q("normalized_name", key[:2]))[:FUZZY_CANDIDATES]
+    }
+    matches = difflib.get_close_matches(key, candidates, n=limit, cutoff=0.75)
+    return [candidates[name] for name in matches]
+
+
+def _remote_lookup(key: str, limit: int) -> list[dict]:
+    now = timezone.now()
+    entry = GeocodeCacheEntry.objects.filter(query=key, expires_at__gt=now).first()
+    if entry is not None:
+        return entry.results[:limit]
+    provider = get_provider()
+    if provider is None:
+        return []
+    try:
+        results = provider.search(key, MAX_LIMIT)
+    except RateLimited:
+        return []
+    except GeocodingError as exc:
+        logger.warning("Geocoding %r via %s failed: %s", key, provider.name, exc)
+        results = []
+        ttl = getattr(settings, "GEOCODING_NEGATIVE_CACHE_TTL", 5 * 60)
+    else:
+        ttl = getattr(settings, "GEOCODING_CACHE_TTL", 30 * 24 * 60 * 60)
+    for result in results:
+        result["source"] = provider.name
+    GeocodeCacheEntry.objects.update_or_create(
+        query=key,
+        defaults={
+            "provider": provider.name,
+            "results": results,
+            "expires_at": now + timedelta(seconds=ttl),
+        },
+    )
+    return results[:limit]
+
+
+def geocode(query: str, limit: int = 5) -> list[dict]:
+    """Return up to ``limit`` matches for ``query``, best first."""
+    key = normalize(query)[:255]
+    if len(key) < MIN_QUERY_LENGTH:
+        return []
+    places = gazetteer_lookup(key, limit)
+    if places:
+        return [_place_result(place) for place in places]
+    return _remote_lookup(key, limit)
+
+
+def purge_expired() -> int:
+    deleted, _ = GeocodeCacheEntry.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.geocoding.gazetteer import DEFAULT_FILE, read_places, save_places
+from apps.geocoding.models import Place
+
+
+class Command(BaseCommand):
+    help = (
+        "Load gazetteer places from a CSV file with the columns "
+        "name,kind,city,state,latitude,longitude,population. Existing places are updated. "
+        "The bundled file is loaded by the migrations already."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", default=str(DEFAULT_FILE))
+        parser.add_argument("--replace", action="store_true", help="Delete all places first.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            places = read_places(Place, path)
+        except OSError as exc:
+            raise CommandError(f"Cannot open {path}: {exc}") from exc
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        with transaction.atomic():
+            if options["replace"]:
+                Place.objects.all().delete()
+            save_places(Place, places)
+        self.stdout.write(self.style.SUCCESS(f"Loaded {len(places)} places."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.geocoding.geocoder import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete expired remote geocoding answers."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired entries."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.geocoding.cities import renormalize_listings
+
+
+class Command(BaseCommand):
+    help = "Recompute every listing's canonical city from its city and the current aliases."
+
+    def handle(self, *args, **options):
+        changed = renormalize_listings()
+        self.stdout.write(self.style.SUCCESS(f"Updated {changed} listing(s)."))
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255, unique=True)),
+                ('provider', models.CharField(max_length=100)),
+                ('results', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Place',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150)),
+                ('kind', models.CharField(choices=[('CITY', 'City'), ('LOCALITY', 'Locality')], max_length=10)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('latitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('longitude', models.DecimalField(decimal_places=6, max_digits=9)),
+                ('population', models.PositiveIntegerField(default=0)),
+                ('normalized_name', models.CharField(max_length=150)),
+                ('search_name', models.CharField(max_length=400)),
+            ],
+            options={
+                'ordering': ['-population', 'name'],
+                'indexes': [models.Index(fields=['normalized_name'], name='core_geocod_normali_86d659_idx'), models.Index(fields=['search_name'], name='core_geocod_search__3acc23_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='place',
+            constraint=models.UniqueConstraint(fields=('kind', 'normalized_name', 'city', 'state'), name='unique_place'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+from apps.geocoding.text import normalize
+
+CITY_ALIASES = {
+    "Allahabad": "Prayagraj",
+    "Bangalore": "Bengaluru",
+    "Banaras": "Varanasi",
+    "Baroda": "Vadodara",
+    "Belgaum": "Belagavi",
+    "Benares": "Varanasi",
+    "Bombay": "Mumbai",
+    "Calcutta": "Kolkata",
+    "Cochin": "Kochi",
+    "Gurgaon": "Gurugram",
+    "Madras": "Chennai",
+    "Mangalore": "Mangaluru",
+    "Mysore": "Mysuru",
+    "New Bombay": "Navi Mumbai",
+    "Pondicherry": "Puducherry",
+    "Poona": "Pune",
+    "Trivandrum": "Thiruvananthapuram",
+    "Vizag": "Visakhapatnam",
+}
+
+
+def seed_aliases(apps, schema_editor):
+    CityAlias = apps.get_model("core_geocoding", "CityAlias")
+    CityAlias.objects.bulk_create(
+        [CityAlias(alias=normalize(alias), city=normalize(city)) for alias, city in CITY_ALIASES.items()],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_geocoding', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CityAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True)),
+                ('city', models.CharField(max_length=100)),
+            ],
+            options={
+                'verbose_name_plural': 'city aliases',
+                'ordering': ['alias'],
+            },
+        ),
+        migrations.RunPython(seed_aliases, migrations.RunPython.noop),
+    ]
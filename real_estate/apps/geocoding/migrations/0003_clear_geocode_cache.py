@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def clear_cache(apps, schema_editor):
+    # Entries were stored at whatever limit the first caller asked for; drop
+    # them so every entry holds the provider's full answer.
+    apps.get_model("core_geocoding", "GeocodeCacheEntry").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_geocoding', '0002_cityalias'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_cache, migrations.RunPython.noop),
+    ]
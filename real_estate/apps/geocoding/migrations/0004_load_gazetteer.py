@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from apps.geocoding.gazetteer import read_places, save_places
+
+
+def load_gazetteer(apps, schema_editor):
+    # Without places every location search goes to the remote provider.
+    Place = apps.get_model("core_geocoding", "Place")
+    save_places(Place, read_places(Place))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_geocoding', '0003_clear_geocode_cache'),
+    ]
+
+    operations = [
+        migrations.RunPython(load_gazetteer, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+from django.db import models
+
+from .text import normalize
+
+
+class PlaceKind(models.TextChoices):
+    CITY = "CITY", "City"
+    LOCALITY = "LOCALITY", "Locality"
+
+
+class Place(models.Model):
+    """A gazetteer entry loaded with ``manage.py load_gazetteer``."""
+
+    name = models.CharField(max_length=150)
+    kind = models.CharField(max_length=10, choices=PlaceKind.choices)
+    city = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100, blank=True)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6)
+    population = models.PositiveIntegerField(default=0)
+    # normalize()d copies used for prefix lookups
+    normalized_name = models.CharField(max_length=150)
+    search_name = models.CharField(max_length=400)
+
+    class Meta:
+        ordering = ["-population", "name"]
+        indexes = [
+            models.Index(fields=["normalized_name"]),
+            models.Index(fields=["search_name"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "normalized_name", "city", "state"], name="unique_place"),
+        ]
+
+    def __str__(self) -> str:
+        return self.display_name
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize(self.name)
+        self.search_name = normalize(" ".join((self.name, self.city, self.state)))
+        super().save(*args, **kwargs)
+
+    @property
+    def display_name(self) -> str:
+        parts = [self.name]
+        if self.city and self.city != self.name:
+            parts.append(self.city)
+        if self.state:
+            parts.append(self.state)
+        return ", ".join(parts + ["India"])
+
+
+class CityAlias(models.Model):
+    """
+    Another spelling or former name of a city ("Bombay" -> "Mumbai"). Listing
+    cities are stored and searched under the canonical name; see ``cities``.
+    """
+
+    alias = models.CharField(max_length=100, unique=True)
+    city = models.CharField(max_length=100)
+
+    class Meta:
+        ordering = ["alias"]
+        verbose_name_plural = "city aliases"
+
+    def __str__(self) -> str:
+        return f"{self.alias} -> {self.city}"
+
+    def save(self, *args, **kwargs):
+        self.alias = normalize(self.alias)
+        self.city = normalize(self.city)
+        super().save(*args, **kwargs)
+
+
+class GeocodeCacheEntry(models.Model):
+    """Remote provider answer for a normalised query, reused until ``expires_at``."""
+
+    query = models.CharField(max_length=255, unique=True)
+    provider = models.CharField(max_length=100)
+    results = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return self.query
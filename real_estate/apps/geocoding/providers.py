@@ -0,0 +1,81 @@
+"""
+Remote geocoding providers, used only when the gazetteer has no answer.
+
+``GEOCODING_PROVIDER`` names the class to use (dotted path, or ``""`` to
+disable remote lookups). ``GEOCODING_PROVIDER_URL`` lets tests point the
+Nominatim provider at a local stand-in server.
+"""
+import json
+import threading
+import time
+from urllib.error import URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class GeocodingError(Exception):
+    pass
+
+
+class RateLimited(GeocodingError):
+    """The provider's next request slot isn't free yet; try again later."""
+
+
+class NominatimProvider:
+    """
+    OpenStreetMap Nominatim ``/search``, throttled to one request per interval.
+    A request that would have to wait for its slot raises ``RateLimited``
+    instead of holding a web worker asleep.
+    """
+
+    name = "nominatim"
+    min_interval = 1.0  # seconds; Nominatim's usage policy allows 1 req/s
+
+    _lock = threading.Lock()
+    _next_slot = 0.0
+
+    def __init__(self):
+        self.url = getattr(settings, "GEOCODING_PROVIDER_URL", "https://nominatim.openstreetmap.org/search")
+        self.timeout = getattr(settings, "GEOCODING_PROVIDER_TIMEOUT", 5)
+        self.user_agent = getattr(settings, "GEOCODING_USER_AGENT", "RealEstateHub/1.0")
+
+    def _take_turn(self) -> bool:
+        cls = type(self)
+        with cls._lock:
+            now = time.monotonic()
+            if now < cls._next_slot:
+                return False
+            cls._next_slot = now + self.min_interval
+            return True
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        params = urlencode({"q": query, "format": "json", "limit": limit, "countrycodes": "in"})
+        request = Request(f"{self.url}?{params}", headers={"User-Agent": self.user_agent})
+        if not self._take_turn():
+            raise RateLimited(f"{self.name} allows one request every {self.min_interval}s")
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                payload = json.load(response)
+        except (URLError, TimeoutError, ValueError) as exc:
+            raise GeocodingError(str(exc)) from exc
+        return [
+            {
+                "name": item.get("name") or item["display_name"].split(",")[0],
+                "display_name": item["display_name"],
+                "latitude": float(item["lat"]),
+                "longitude": float(item["lon"]),
+                "kind": item.get("type", ""),
+            }
+            for item in payload
+            if "lat" in item and "lon" in item and "display_name" in item
+        ]
+
+
+def get_provider():
+    path = getattr(settings, "GEOCODING_PROVIDER", "apps.geocoding.providers.NominatimProvider")
+    if not path:
+        return None
+    return import_string(path)()
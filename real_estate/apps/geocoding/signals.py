@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cities import invalidate_aliases, renormalize_listings
+from .models import CityAlias
+
+
+@receiver(pre_save, sender=CityAlias)
+def remember_previous_alias(sender, instance: CityAlias, **kwargs) -> None:
+    instance._previous_names = set()
+    if instance.pk is not None:
+        instance._previous_names = set(
+            CityAlias.objects.filter(pk=instance.pk).values_list("alias", "city").first() or ()
+        )
+
+
+@receiver(post_save, sender=CityAlias)
+@receiver(post_delete, sender=CityAlias)
+def drop_cached_aliases(sender, instance: CityAlias, **kwargs) -> None:
+    invalidate_aliases()
+    # Listings stored under the alias (not yet mapped) or under either city
+    # (mapped by the old row) are the only ones whose canonical city can move.
+    renormalize_listings({instance.alias, instance.city, *getattr(instance, "_previous_names", ())})
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import geocoder
+from .models import GeocodeCacheEntry, Place
+from .providers import GeocodingError, NominatimProvider, RateLimited
+
+
+class FakeProvider:
+    name = "fake"
+    search = mock.Mock()
+
+
+@override_settings(
+    GEOCODING_PROVIDER="apps.geocoding.tests.FakeProvider",
+    GEOCODING_CACHE_TTL=3600,
+    GEOCODING_NEGATIVE_CACHE_TTL=60,
+)
+class RemoteLookupTests(TestCase):
+    QUERY = "nowhere in particular"
+
+    def setUp(self):
+        FakeProvider.search.reset_mock(return_value=True, side_effect=True)
+
+    def expires_in(self) -> float:
+        entry = GeocodeCacheEntry.objects.get(query=self.QUERY)
+        return (entry.expires_at - timezone.now()).total_seconds()
+
+    def test_bundled_gazetteer_is_loaded_by_migrations(self):
+        self.assertTrue(Place.objects.filter(normalized_name="mumbai").exists())
+        self.assertEqual(geocoder.geocode("Mumbai", 1)[0]["source"], "gazetteer")
+        FakeProvider.search.assert_not_called()
+
+    def test_answers_are_cached(self):
+        FakeProvider.search.return_value = [{"name": "Somewhere", "latitude": 1.0, "longitude": 2.0}]
+        self.assertEqual(geocoder.geocode(self.QUERY)[0]["source"], "fake")
+        self.assertEqual(geocoder.geocode(self.QUERY)[0]["name"], "Somewhere")
+        FakeProvider.search.assert_called_once_with(self.QUERY, geocoder.MAX_LIMIT)
+        self.assertAlmostEqual(self.expires_in(), 3600, delta=5)
+
+    def test_failures_are_cached_briefly(self):
+        FakeProvider.search.side_effect = GeocodingError("timed out")
+        with self.assertLogs("apps.geocoding.geocoder", "WARNING"):
+            self.assertEqual(geocoder.geocode(self.QUERY), [])
+        self.assertEqual(geocoder.geocode(self.QUERY), [])
+        FakeProvider.search.assert_called_once()
+        self.assertAlmostEqual(self.expires_in(), 60, delta=5)
+
+    def test_rate_limited_lookups_are_not_cached(self):
+        FakeProvider.search.side_effect = RateLimited("busy")
+        self.assertEqual(geocoder.geocode(self.QUERY), [])
+        self.assertFalse(GeocodeCacheEntry.objects.exists())
+
+    def test_expired_entries_are_retried(self):
+        GeocodeCacheEntry.objects.create(
+            query=self.QUERY, provider="fake", results=[], expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        FakeProvider.search.return_value = []
+        geocoder.geocode(self.QUERY)
+        FakeProvider.search.assert_called_once()
+
+
+class NominatimThrottleTests(TestCase):
+    def setUp(self):
+        NominatimProvider._next_slot = 0.0
+        self.addCleanup(setattr, NominatimProvider, "_next_slot", 0.0)
+
+    def test_second_request_in_the_interval_fails_fast(self):
+        provider = NominatimProvider()
+        response = mock.MagicMock()
+        response.__enter__.return_value.read.return_value = b"[]"
+        with mock.patch("apps.geocoding.providers.urlopen", return_value=response) as urlopen, mock.patch(
+            "apps.geocoding.providers.time.sleep"
+        ) as sleep:
+            self.assertEqual(provider.search("pune", 5), [])
+            with self.assertRaises(RateLimited):
+                provider.search("pune", 5)
+        urlopen.assert_called_once()
+        sleep.assert_not_called()
+
+    def test_slot_frees_up_after_the_interval(self):
+        provider = NominatimProvider()
+        with mock.patch("apps.geocoding.providers.time.monotonic", side_effect=[100.0, 100.5, 101.0]):
+            self.assertEqual([provider._take_turn() for _ in range(3)], [True, False, True])
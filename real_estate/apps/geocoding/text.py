@@ -0,0 +1,28 @@
+import re
+import sys
+import unicodedata
+
+from django.db.models import Q
+
+_NON_WORD_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    """Lower-case, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def prefix_q(field: str, prefix: str) -> Q:
+    """
+    ``field`` starts with ``prefix``, written as a range so it can use a plain
+    index on every backend (SQLite's case-insensitive LIKE cannot).
+    ``field`` must hold normalize()d text.
+    """
+    if not prefix:
+        return Q()
+    last = ord(prefix[-1])
+    if last >= sys.maxunicode:
+        return Q(**{f"{field}__gte": prefix})
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": prefix[:-1] + chr(last + 1)})
@@ -0,0 +1,20 @@
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
+
+from .geocoder import MAX_LIMIT, geocode
+
+
+class GeocodeView(APIView):
+    permission_classes = [AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "geocode"
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 5)), MAX_LIMIT))
+        except ValueError:
+            limit = 5
+        return Response({"results": geocode(query, limit)})
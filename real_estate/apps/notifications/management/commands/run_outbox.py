@@ -0,0 +1,32 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.outbox import dispatch, purge_sent
+
+
+class Command(BaseCommand):
+    help = "Send queued outbox emails. Runs until interrupted unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Send what is due now, then exit.")
+        parser.add_argument("--batch-size", type=int, default=50, help="Messages per SMTP connection.")
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent SMTP connections.")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds to sleep when idle.")
+        parser.add_argument(
+            "--keep-days", type=int, default=7, help="Delete sent messages older than this many days."
+        )
+
+    def handle(self, *args, **options):
+        keep = timedelta(days=options["keep_days"])
+        purge_sent(keep)
+        while True:
+            claimed, sent = dispatch(options["batch_size"], options["workers"])
+            if claimed:
+                self.stdout.write(f"Sent {sent} of {claimed} message(s).")
+                continue
+            if options["once"]:
+                break
+            purge_sent(keep)
+            time.sleep(options["interval"])
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:35
+
+from django.db import migrations, models
+
+OTP_SUBJECT = "Your verification code for property enquiry"
+
+
+def redact_existing_codes(apps, schema_editor):
+    OutboxMessage = apps.get_model("core_notifications", "OutboxMessage")
+    codes = OutboxMessage.objects.filter(subject=OTP_SUBJECT)
+    codes.update(sensitive=True)
+    codes.filter(status__in=["SENT", "FAILED"]).update(body="[redacted after delivery]")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='sensitive',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(redact_existing_codes, migrations.RunPython.noop),
+    ]
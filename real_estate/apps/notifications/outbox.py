@@ -0,0 +1,176 @@
+"""
+Durable email outbox.
+
+Request handlers call ``enqueue()``, which only inserts a row. The
+``run_outbox`` management command claims due messages in batches and sends
+each batch over a single SMTP connection from a thread pool. A failed message
+is retried with exponential backoff until ``MAX_ATTEMPTS``, then marked
+``FAILED``.
+
+Claiming is a conditional ``UPDATE`` that stamps a per-batch token, so several
+workers can run side by side without sending a message twice. A worker that
+dies mid-batch leaves a lease (``locked_until``) that expires on its own, and
+results are only written back while the row still carries the worker's token.
+
+Messages enqueued with ``sensitive=True`` (one-time codes) have their body
+replaced by ``REDACTED_BODY`` as soon as they are sent or given up on, so the
+secret only sits in the table while it is waiting to go out.
+"""
+import logging
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import close_old_connections, connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxMessage, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 30  # seconds; doubled after every failed attempt
+BACKOFF_MAX = 60 * 60
+LEASE_SECONDS = 5 * 60
+REDACTED_BODY = "[redacted after delivery]"
+
+
+def enqueue(subject: str, body: str, to: list[str], from_email: str = "", sensitive: bool = False) -> OutboxMessage:
+    return OutboxMessage.objects.create(
+        subject=subject, body=body, to=list(to), from_email=from_email or "", sensitive=sensitive
+    )
+
+
+def _finish(message: OutboxMessage, **changes) -> bool:
+    """
+    Release ``message`` with ``changes`` applied, but only if this worker still
+    holds it. A worker that stalled past its lease may find the message
+    reclaimed by another one; its write then matches no row and is dropped.
+    """
+    token = message.claim_token
+    changes.update(claim_token=None, locked_until=None)
+    if message.sensitive and changes.get("status") in (OutboxStatus.SENT, OutboxStatus.FAILED):
+        changes["body"] = REDACTED_BODY
+    released = OutboxMessage.objects.filter(pk=message.pk, claim_token=token).update(**changes)
+    for field, value in changes.items():
+        setattr(message, field, value)
+    if not released:
+        logger.warning("Outbox message %s was reclaimed by another worker; dropping this result", message.pk)
+    return bool(released)
+
+
+def _claimable(now) -> Q:
+    return Q(status=OutboxStatus.PENDING, next_attempt_at__lte=now) | Q(
+        status=OutboxStatus.SENDING, locked_until__lt=now
+    )
+
+
+def claim_batch(size: int) -> list[OutboxMessage]:
+    """Lease up to ``size`` due messages to the caller."""
+    now = timezone.now()
+    due = OutboxMessage.objects.filter(_claimable(now)).order_by("next_attempt_at")
+    ids = list(due.values_list("pk", flat=True)[:size])
+    if not ids:
+        return []
+    token = uuid.uuid4()
+    OutboxMessage.objects.filter(_claimable(now), pk__in=ids).update(
+        status=OutboxStatus.SENDING,
+        claim_token=token,
+        locked_until=now + timedelta(seconds=LEASE_SECONDS),
+    )
+    return list(OutboxMessage.objects.filter(claim_token=token, status=OutboxStatus.SENDING))
+
+
+def backoff(attempts: int) -> timedelta:
+    delay = min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _mark_sent(message: OutboxMessage) -> None:
+    _finish(
+        message,
+        status=OutboxStatus.SENT,
+        attempts=message.attempts + 1,
+        sent_at=timezone.now(),
+        last_error="",
+    )
+
+
+def _mark_failed(message: OutboxMessage, error: Exception) -> None:
+    attempts = message.attempts + 1
+    changes = {"attempts": attempts, "last_error": f"{type(error).__name__}: {error}"[:2000]}
+    if attempts >= MAX_ATTEMPTS:
+        changes["status"] = OutboxStatus.FAILED
+    else:
+        changes["status"] = OutboxStatus.PENDING
+        changes["next_attempt_at"] = timezone.now() + backoff(attempts)
+    if _finish(message, **changes) and message.status == OutboxStatus.FAILED:
+        logger.error("Giving up on outbox message %s: %s", message.pk, message.last_error)
+
+
+def send_batch(messages: list[OutboxMessage]) -> int:
+    """Send ``messages`` over one SMTP connection. Returns how many were sent."""
+    sent = 0
+    pending = list(messages)
+    try:
+        connection = get_connection()
+        while pending:
+            try:
+                connection.open()
+            except Exception as exc:  # noqa: BLE001 - any transport error is retried
+                for message in pending:
+                    _mark_failed(message, exc)
+                break
+            try:
+                while pending:
+                    message = pending.pop(0)
+                    email = EmailMessage(
+                        subject=message.subject,
+                        body=message.body,
+                        from_email=message.from_email or None,
+                        to=message.to,
+                        connection=connection,
+                    )
+                    try:
+                        email.send(fail_silently=False)
+                    except Exception as exc:  # noqa: BLE001
+                        _mark_failed(message, exc)
+                        # The server may have dropped us; reconnect for the rest.
+                        break
+                    _mark_sent(message)
+                    sent += 1
+            finally:
+                connection.close()
+    finally:
+        # Worker threads get their own DB connections; don't leak them.
+        connections.close_all()
+    return sent
+
+
+def dispatch(batch_size: int = 50, workers: int = 4) -> tuple[int, int]:
+    """
+    Claim and send one round of batches (one per worker). Returns
+    ``(claimed, sent)``; the difference was rescheduled or given up on.
+    """
+    close_old_connections()
+    batches = []
+    for _ in range(workers):
+        batch = claim_batch(batch_size)
+        if not batch:
+            break
+        batches.append(batch)
+    if not batches:
+        return 0, 0
+    with ThreadPoolExecutor(max_workers=len(batches), thread_name_prefix="outbox") as pool:
+        sent = sum(pool.map(send_batch, batches))
+    return sum(len(batch) for batch in batches), sent
+
+
+def purge_sent(older_than: timedelta) -> int:
+    deleted, _ = OutboxMessage.objects.filter(
+        status=OutboxStatus.SENT, sent_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
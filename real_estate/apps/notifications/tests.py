@@ -0,0 +1,103 @@
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase
+from django.utils import timezone
+
+from . import outbox
+from .models import OutboxMessage, OutboxStatus
+
+
+class OutboxTests(TestCase):
+    def enqueue(self, **fields) -> OutboxMessage:
+        return outbox.enqueue("Your code", "Code: 123456", ["buyer@example.com"], **fields)
+
+    def expire_leases(self) -> None:
+        OutboxMessage.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+
+    def failing_send(self):
+        return mock.patch("apps.notifications.outbox.EmailMessage.send", side_effect=SMTPException("boom"))
+
+    def test_claimed_messages_are_not_claimed_again(self):
+        message = self.enqueue()
+        self.assertEqual([m.pk for m in outbox.claim_batch(10)], [message.pk])
+        self.assertEqual(outbox.claim_batch(10), [])
+
+    def test_expired_lease_is_claimable_again(self):
+        self.enqueue()
+        first = outbox.claim_batch(10)[0]
+        self.expire_leases()
+        second = outbox.claim_batch(10)[0]
+        self.assertEqual(first.pk, second.pk)
+        self.assertNotEqual(first.claim_token, second.claim_token)
+
+    def test_future_messages_are_not_claimed(self):
+        self.enqueue()
+        OutboxMessage.objects.update(next_attempt_at=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(outbox.claim_batch(10), [])
+
+    def test_send_marks_sent_and_redacts_sensitive_bodies(self):
+        self.enqueue(sensitive=True)
+        plain = self.enqueue()
+        self.assertEqual(outbox.send_batch(outbox.claim_batch(10)), 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].body, "Code: 123456")
+        bodies = dict(OutboxMessage.objects.values_list("pk", "body"))
+        self.assertEqual(bodies.pop(plain.pk), "Code: 123456")
+        self.assertEqual(list(bodies.values()), [outbox.REDACTED_BODY])
+        for message in OutboxMessage.objects.all():
+            self.assertEqual((message.status, message.attempts), (OutboxStatus.SENT, 1))
+            self.assertIsNone(message.claim_token)
+            self.assertIsNotNone(message.sent_at)
+
+    def test_failure_is_rescheduled_with_backoff(self):
+        message = self.enqueue(sensitive=True)
+        before = timezone.now()
+        with self.failing_send():
+            self.assertEqual(outbox.send_batch(outbox.claim_batch(10)), 0)
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboxStatus.PENDING, 1))
+        self.assertEqual(message.last_error, "SMTPException: boom")
+        # Still needed for the retry.
+        self.assertEqual(message.body, "Code: 123456")
+        delay = (message.next_attempt_at - before).total_seconds()
+        self.assertTrue(outbox.BACKOFF_BASE * 0.8 <= delay <= outbox.BACKOFF_BASE * 1.2 + 1, delay)
+        self.assertEqual(outbox.claim_batch(10), [])
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        with mock.patch("apps.notifications.outbox.random.uniform", return_value=1):
+            delays = [outbox.backoff(n).total_seconds() for n in (1, 2, 3, 20)]
+        self.assertEqual(delays, [30, 60, 120, outbox.BACKOFF_MAX])
+
+    def test_last_attempt_marks_failed_and_redacts(self):
+        message = self.enqueue(sensitive=True)
+        OutboxMessage.objects.update(attempts=outbox.MAX_ATTEMPTS - 1)
+        with self.failing_send(), self.assertLogs("apps.notifications.outbox", "ERROR"):
+            outbox.send_batch(outbox.claim_batch(10))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), (OutboxStatus.FAILED, outbox.MAX_ATTEMPTS))
+        self.assertEqual(message.body, outbox.REDACTED_BODY)
+        self.assertEqual(outbox.claim_batch(10), [])
+
+    def test_stale_worker_cannot_overwrite_a_reclaimed_message(self):
+        self.enqueue()
+        stale = outbox.claim_batch(10)
+        self.expire_leases()
+        current = outbox.claim_batch(10)
+        with self.failing_send(), self.assertLogs("apps.notifications.outbox", "WARNING"):
+            outbox.send_batch(stale)
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.status, message.attempts), (OutboxStatus.SENDING, 0))
+        self.assertEqual(message.claim_token, current[0].claim_token)
+        self.assertEqual(outbox.send_batch(current), 1)
+        self.assertEqual(OutboxMessage.objects.get().status, OutboxStatus.SENT)
+
+    def test_dispatch_splits_due_messages_across_workers(self):
+        for _ in range(5):
+            self.enqueue()
+        with mock.patch("apps.notifications.outbox.ThreadPoolExecutor") as pool:
+            pool.return_value.__enter__.return_value.map = map
+            self.assertEqual(outbox.dispatch(batch_size=2, workers=2), (4, 4))
+        self.assertEqual(OutboxMessage.objects.filter(status=OutboxStatus.PENDING).count(), 1)
@@ -6,4 +6,5 @@ class PropertiesConfig(AppConfig):
     name = "apps.properties"
     label = "core_properties"
 
-
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
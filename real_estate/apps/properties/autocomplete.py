@@ -0,0 +1,226 @@
+"""
+Location autocomplete served from an in-memory prefix trie.
+
+Each worker keeps one ``PrefixTrie`` per kind (city, state, locality) of
+normalised names with listing counts, and the spelling most listings use for
+each name, which is what suggestions show. Every node stores its best
+``TOP_K`` names, so a lookup is a walk of ``len(prefix)`` nodes. Multi-word
+names are also reachable from each later word ("navi mumbai" matches "mum").
+
+Workers stay in step through the cache: when a listing is approved, edited or
+deactivated, ``AutocompleteIndex.refresh`` recounts the affected terms and
+publishes the absolute counts as a numbered delta. Other workers apply the
+deltas they have not seen on their next lookup, and fall back to a full
+rebuild (one GROUP BY per kind) when a delta has expired, too many are
+pending, or the tries are older than ``REBUILD_INTERVAL``.
+"""
+import threading
+import time
+from typing import Callable, Iterable
+
+from django.db.models import Count
+
+from apps.geocoding.text import normalize
+from config.cache import get_cache
+
+# Nodes keep as many names as a lookup may ask for.
+MAX_LIMIT = 20
+TOP_K = MAX_LIMIT
+DELTA_TIMEOUT = 60 * 60
+REBUILD_INTERVAL = 15 * 60
+MAX_DELTAS = 500
+
+
+class _Node:
+    __slots__ = ("children", "names", "top")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.names: set[str] = set()
+        self.top: list[str] = []
+
+
+class PrefixTrie:
+    """
+    Normalised names with counts and display spellings; each node keeps its
+    ``TOP_K`` best names.
+    """
+
+    def __init__(self, counts: dict[str, int] | None = None, labels: dict[str, str] | None = None):
+        self.root = _Node()
+        self.counts: dict[str, int] = {}
+        self.labels: dict[str, str] = {}
+        for name, count in (counts or {}).items():
+            if count > 0:
+                self.counts[name] = count
+                self.labels[name] = (labels or {}).get(name) or name.title()
+                for path in self._paths(name):
+                    path[-1].names.add(name)
+        self._rank(self.root)
+
+    def _paths(self, name: str) -> Iterable[list[_Node]]:
+        words = name.split(" ")
+        for start in range(len(words)):
+            node, path = self.root, [self.root]
+            for char in " ".join(words[start:]):
+                node = node.children.setdefault(char, _Node())
+                path.append(node)
+            yield path
+
+    def _best(self, node: _Node) -> list[str]:
+        candidates = set(node.names)
+        for child in node.children.values():
+            candidates.update(child.top)
+        return sorted(candidates, key=lambda name: (-self.counts[name], name))[:TOP_K]
+
+    def _rank(self, node: _Node) -> None:
+        for child in node.children.values():
+            self._rank(child)
+        node.top = self._best(node)
+
+    def set_count(self, name: str, count: int, label: str = "") -> None:
+        if count > 0:
+            self.counts[name] = count
+            self.labels[name] = label or self.labels.get(name) or name.title()
+        elif self.counts.pop(name, None) is None:
+            return
+        else:
+            self.labels.pop(name, None)
+        # Re-rank every affected node, deepest first, once all anchors are updated.
+        by_depth: dict[int, tuple[int, _Node]] = {}
+        for path in self._paths(name):
+            if count > 0:
+                path[-1].names.add(name)
+            else:
+                path[-1].names.discard(name)
+            for depth, node in enumerate(path):
+                by_depth.setdefault(id(node), (depth, node))
+        for depth, node in sorted(by_depth.values(), key=lambda item: -item[0]):
+            node.top = self._best(node)
+
+    def lookup(self, prefix: str, limit: int = TOP_K) -> list[tuple[str, str, int]]:
+        """``(name, label, count)`` for the best ``limit`` names starting with ``prefix``."""
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [(name, self.labels[name], self.counts[name]) for name in node.top[:limit]]
+
+
+class AutocompleteIndex:
+    """
+    ``queryset`` returns the live listings; ``fields`` maps each suggestion
+    kind to the normalised column it is counted on and the column holding
+    the spelling to display.
+    """
+
+    def __init__(self, name: str, queryset: Callable, fields: dict[str, tuple[str, str]]):
+        self.name = name
+        self.queryset = queryset
+        self.fields = {kind: field for kind, (field, _) in fields.items()}
+        self.label_fields = {kind: label for kind, (_, label) in fields.items()}
+        self.cache = get_cache(f"autocomplete.{name}")
+        self._lock = threading.Lock()
+        self._tries: dict[str, PrefixTrie] | None = None
+        self._version = 0
+        self._built_at = 0.0
+
+    # -- counting -----------------------------------------------------------
+
+    def _count(self, kind: str, names: Iterable[str] | None = None) -> tuple[dict[str, int], dict[str, str]]:
+        """Listing counts per name, and each name's most used spelling."""
+        field, label_field = self.fields[kind], self.label_fields[kind]
+        qs = self.queryset().exclude(**{field: ""})
+        if names is not None:
+            qs = qs.filter(**{f"{field}__in": list(names)})
+        counts: dict[str, int] = {}
+        labels: dict[str, tuple[int, str]] = {}
+        for name, label, n in qs.order_by().values_list(field, label_field).annotate(n=Count("pk")):
+            counts[name] = counts.get(name, 0) + n
+            label = " ".join(label.split())
+            if (n, label) > labels.get(name, (0, "")):
+                labels[name] = (n, label)
+        return counts, {name: label for name, (_, label) in labels.items()}
+
+    def terms_for(self, instance) -> set[tuple[str, str]]:
+        """(kind, name) pairs ``instance`` is counted under."""
+        return {(kind, getattr(instance, field)) for kind, field in self.fields.items() if getattr(instance, field)}
+
+    # -- publishing ---------------------------------------------------------
+
+    def _next_version(self) -> int:
+        try:
+            return self.cache.incr("version")
+        except ValueError:
+            self.cache.add("version", 0, None)
+            return self.cache.incr("version")
+
+    def refresh(self, terms: Iterable[tuple[str, str]]) -> None:
+        """Recount ``terms`` ((kind, name) pairs) and publish the counts to every worker."""
+        by_kind: dict[str, set[str]] = {}
+        for kind, name in terms:
+            by_kind.setdefault(kind, set()).add(name)
+        if not by_kind:
+            return
+        changes = []
+        for kind, names in by_kind.items():
+            counts, labels = self._count(kind, names)
+            changes.extend((kind, name, counts.get(name, 0), labels.get(name, "")) for name in names)
+        version = self._next_version()
+        self.cache.set(f"delta:{version}", changes, DELTA_TIMEOUT)
+
+    # -- reading ------------------------------------------------------------
+
+    def _rebuild(self, version: int) -> None:
+        self._tries = {kind: PrefixTrie(*self._count(kind)) for kind in self.fields}
+        self._version = version
+        self._built_at = time.monotonic()
+
+    def _sync(self) -> dict[str, PrefixTrie]:
+        version = self.cache.get("version") or 0
+        with self._lock:
+            stale = time.monotonic() - self._built_at > REBUILD_INTERVAL
+            behind = version - self._version
+            if self._tries is None or stale or behind < 0 or behind > MAX_DELTAS:
+                self._rebuild(version)
+            elif behind:
+                keys = [f"delta:{n}" for n in range(self._version + 1, version + 1)]
+                deltas = self.cache.get_many(keys)
+                if len(deltas) < len(keys):
+                    self._rebuild(version)
+                else:
+                    for key in keys:
+                        for kind, name, count, label in deltas[key]:
+                            self._tries[kind].set_count(name, count, label)
+                    self._version = version
+            return self._tries
+
+    def suggest(self, query: str, limit: int = 8, kinds: Iterable[str] | None = None) -> list[dict]:
+        """Best matches for ``query`` across ``kinds`` (default: all), most listings first."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        limit = max(1, min(limit, MAX_LIMIT))
+        tries = self._sync()
+        matches = [
+            (count, kind, name, label)
+            for kind in (kinds or self.fields)
+            if kind in tries
+            for name, label, count in tries[kind].lookup(prefix, limit)
+        ]
+        matches.sort(key=lambda match: (-match[0], match[2]))
+        return [{"kind": kind, "name": label, "count": count} for count, kind, _, label in matches[:limit]]
+
+
+def _approved_listings():
+    from .models import Property
+
+    return Property.objects.approved()
+
+
+listing_index = AutocompleteIndex(
+    "core_properties",
+    _approved_listings,
+    {"city": ("city_normalized", "city"), "locality": ("locality_normalized", "locality")},
+)
@@ -4,8 +4,8 @@ from .models import Property
 
 
 class PropertyFilter(django_filters.FilterSet):
-    city = django_filters.CharFilter(field_name="city", lookup_expr="icontains")
-    locality = django_filters.CharFilter(field_name="locality", lookup_expr="icontains")
+    city = django_filters.CharFilter(method="filter_city")
+    locality = django_filters.CharFilter(method="filter_locality")
     price_min = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
     price_max = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
     bedrooms = django_filters.NumberFilter(field_name="bedrooms")
@@ -28,4 +28,8 @@ class PropertyFilter(django_filters.FilterSet):
             "status",
         ]
 
+    def filter_city(self, queryset, name, value):
+        return queryset.for_city(value)
 
+    def filter_locality(self, queryset, name, value):
+        return queryset.for_locality(value)
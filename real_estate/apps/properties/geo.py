@@ -0,0 +1,153 @@
+"""
+Radius and bounding-box search over property coordinates.
+
+``near()`` first narrows rows to the bounding box of the search circle, which
+is a range scan on the ``(latitude, longitude)`` index, and only then
+computes the exact haversine distance for the rows inside the box. Results
+are annotated with ``distance_km`` and ordered by it.
+
+Both property models mix :class:`GeoQuerySetMixin` into their querysets.
+"""
+import math
+
+from django.db.models import FloatField, Q
+from django.db.models.functions import ASin, Cast, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+MAX_RADIUS_KM = 200
+DEFAULT_RADIUS_KM = 5
+MAX_RESULTS = 200
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> tuple[float, float, float, float]:
+    """Return ``(min_lat, min_lng, max_lat, max_lng)`` enclosing the circle."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - lat_delta, lat + lat_delta
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle covers a pole, so every longitude is in range.
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    lng_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(lat))))
+    return min_lat, lng - lng_delta, max_lat, lng + lng_delta
+
+
+def bbox_q(min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> Q:
+    condition = Q(latitude__gte=min_lat, latitude__lte=max_lat)
+    if max_lng - min_lng >= 360:
+        return condition
+    if min_lng < -180:
+        return condition & (Q(longitude__gte=min_lng + 360) | Q(longitude__lte=max_lng))
+    if max_lng > 180:
+        return condition & (Q(longitude__gte=min_lng) | Q(longitude__lte=max_lng - 360))
+    if min_lng > max_lng:
+        # Viewport spanning the antimeridian (west edge east of the east edge).
+        return condition & (Q(longitude__gte=min_lng) | Q(longitude__lte=max_lng))
+    return condition & Q(longitude__gte=min_lng, longitude__lte=max_lng)
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def distance_expression(lat: float, lng: float):
+    """Haversine distance in km from ``(lat, lng)`` to each row, as an expression."""
+    row_lat = Radians(Cast("latitude", FloatField()))
+    row_lng = Radians(Cast("longitude", FloatField()))
+    phi = math.radians(lat)
+    a = Power(Sin((row_lat - phi) / 2), 2) + math.cos(phi) * Cos(row_lat) * Power(
+        Sin((row_lng - math.radians(lng)) / 2), 2
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a), output_field=FloatField())
+
+
+class GeoQuerySetMixin:
+    def within_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+        return self.filter(bbox_q(min_lat, min_lng, max_lat, max_lng))
+
+    def with_distance(self, lat: float, lng: float):
+        return self.annotate(distance_km=distance_expression(lat, lng))
+
+    def near(self, lat: float, lng: float, radius_km: float = DEFAULT_RADIUS_KM):
+        return (
+            self.within_bbox(*bounding_box(lat, lng, radius_km))
+            .with_distance(lat, lng)
+            .filter(distance_km__lte=radius_km)
+            .order_by("distance_km")
+        )
+
+
+def _coordinate(value, name: str, limit: float) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be a number.") from None
+    if not math.isfinite(number) or abs(number) > limit:
+        raise ValueError(f"'{name}' must be between -{limit:g} and {limit:g}.")
+    return number
+
+
+def _wrap_lng(lng: float) -> float:
+    return (lng + 180) % 360 - 180 if abs(lng) > 180 else lng
+
+
+def parse_bbox(value: str) -> tuple[float, float, float, float]:
+    """
+    Parse Leaflet's ``toBBoxString()`` (``west,south,east,north``) into
+    ``(south, west, north, east)`` with longitudes wrapped into [-180, 180].
+    ``west > east`` afterwards means the box spans the antimeridian.
+    """
+    parts = (value or "").split(",")
+    if len(parts) != 4:
+        raise ValueError("'bbox' must be 'west,south,east,north'.")
+    west = _coordinate(parts[0], "west", 540)
+    south = _coordinate(parts[1], "south", 90)
+    east = _coordinate(parts[2], "east", 540)
+    north = _coordinate(parts[3], "north", 90)
+    if south > north or west > east:
+        raise ValueError("'bbox' must be 'west,south,east,north'.")
+    if east - west >= 360:
+        return south, -180.0, north, 180.0
+    # Leaflet reports longitudes past +/-180 once the map is panned across
+    # the antimeridian; wrap them back.
+    return south, _wrap_lng(west), north, _wrap_lng(east)
+
+
+def geo_filter(queryset, params):
+    """
+    Apply the geo query in ``params`` (a ``GET`` QueryDict) to ``queryset``.
+
+    * ``lat``, ``lng`` and optional ``radius`` (km) -> rows within the circle,
+      nearest first.
+    * ``bbox=west,south,east,north`` (Leaflet's ``toBBoxString()``) -> rows in
+      the viewport, nearest to its centre first.
+
+    Raises ``ValueError`` with a user-facing message on bad input.
+    """
+    if params.get("bbox"):
+        south, west, north, east = parse_bbox(params["bbox"])
+        centre_lng = (west + east) / 2 if west <= east else ((west + east + 360) / 2 + 180) % 360 - 180
+        return (
+            queryset.within_bbox(south, west, north, east)
+            .with_distance((south + north) / 2, centre_lng)
+            .order_by("distance_km")
+        )
+    if "lat" not in params or "lng" not in params:
+        raise ValueError("Pass 'lat' and 'lng', or 'bbox'.")
+    lat = _coordinate(params.get("lat"), "lat", 90)
+    lng = _coordinate(params.get("lng"), "lng", 180)
+    radius = _coordinate(params.get("radius", DEFAULT_RADIUS_KM), "radius", MAX_RADIUS_KM)
+    if radius <= 0:
+        raise ValueError("'radius' must be positive.")
+    return queryset.near(lat, lng, radius)
+
+
+def result_limit(params) -> int:
+    try:
+        limit = int(params.get("limit", MAX_RESULTS))
+    except (TypeError, ValueError):
+        return MAX_RESULTS
+    return max(1, min(limit, MAX_RESULTS))
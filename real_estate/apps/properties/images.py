@@ -0,0 +1,214 @@
+"""
+Responsive image variants for uploaded listing photos.
+
+After an image is saved (and the transaction commits), ``schedule`` hands it
+to a small per-process thread pool that writes a WebP and a JPEG copy at each
+width in ``VARIANTS`` next to the upload and stores their metadata on the
+row's ``variants`` field::
+
+    {"source": "<upload path>", "width": 4000, "height": 3000,
+     "card": {"width": 640, "height": 480, "webp": "<path>", "jpeg": "<path>"}, ...}
+
+Templates and serializers build ``srcset`` strings from it with ``srcset()``
+and fall back to the original file until the variants exist. Rows missing
+variants (older uploads, or a worker that died) are filled in by
+``manage.py generate_image_variants``.
+"""
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# name -> target width in pixels; smaller originals are never upscaled.
+VARIANTS = {"thumb": 320, "card": 640, "full": 1600}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+# Sent with (sender=model, instance) once an instance's variants are stored.
+variants_generated = Signal()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def variant_path(name: str, variant: str, ext: str) -> str:
+    """
+    Preferred name for a variant of the upload ``name``. The source extension
+    stays in it so ``house.jpg`` and ``house.png`` don't compete for one name;
+    ``storage.save`` still picks a free name if it is taken.
+    """
+    directory, filename = posixpath.split(name)
+    stem, source_ext = posixpath.splitext(filename)
+    suffix = f"-{source_ext[1:]}" if source_ext else ""
+    return posixpath.join(directory, "variants", f"{stem}{suffix}-{variant}.{ext}")
+
+
+def _encode(image: Image.Image, fmt: str) -> bytes:
+    buffer = BytesIO()
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    else:
+        image.save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def generate_variants(field_file) -> dict:
+    """Write every variant of ``field_file`` to its storage and return the metadata."""
+    storage = field_file.storage
+    with storage.open(field_file.name, "rb") as source:
+        image = Image.open(source)
+        width, height = image.size
+        if image.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+            width, height = height, width
+        meta = {"source": field_file.name, "width": width, "height": height}
+        # Let the JPEG decoder downscale while reading when the original is huge.
+        image.draft("RGB", (max(VARIANTS.values()),) * 2)
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA", "P"):
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.convert("RGBA").getchannel("A"))
+            image = background
+        image = image.convert("RGB")
+    # Largest first, each resized from the previous one.
+    current = image
+    for variant, target in sorted(VARIANTS.items(), key=lambda item: -item[1]):
+        if current.width > target:
+            size = (target, max(1, round(current.height * target / current.width)))
+            current = current.resize(size, Image.LANCZOS, reducing_gap=3.0)
+        entry = {"width": current.width, "height": current.height}
+        for ext in ("webp", "jpeg"):
+            entry[ext] = storage.save(variant_path(field_file.name, variant, ext), ContentFile(_encode(current, ext)))
+        meta[variant] = entry
+    return meta
+
+
+def delete_variants(field_file, variants: dict) -> None:
+    for variant in VARIANTS:
+        for ext in ("webp", "jpeg"):
+            path = (variants.get(variant) or {}).get(ext)
+            if path:
+                field_file.storage.delete(path)
+
+
+def process(model, pk, field: str) -> None:
+    """Generate and store the variants for one row (runs in a pool thread)."""
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+    field_file = getattr(instance, field)
+    previous = instance.variants or {}
+    try:
+        variants = generate_variants(field_file)
+    except Exception:  # noqa: BLE001 - a bad upload must not kill the worker
+        logger.exception("Could not generate variants for %s %s", model.__name__, pk)
+        return
+    # Only store them if the file wasn't replaced meanwhile.
+    updated = model._default_manager.filter(pk=pk, **{field: field_file.name}).update(variants=variants)
+    if updated:
+        # Drop the files this row pointed at before (a regeneration).
+        delete_variants(field_file, previous)
+        instance.variants = variants
+        variants_generated.send(sender=model, instance=instance)
+    else:
+        delete_variants(field_file, variants)
+
+
+def run(model, pk, field: str) -> None:
+    """``process`` for a thread of its own, which has to manage its DB connection."""
+    close_old_connections()
+    try:
+        process(model, pk, field)
+    finally:
+        close_old_connections()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_VARIANT_WORKERS, thread_name_prefix="image-variants"
+            )
+        return _pool
+
+
+def is_stale(instance, field: str) -> bool:
+    """True when ``instance`` has a file whose variants haven't been generated yet."""
+    name = getattr(instance, field).name
+    return bool(name) and (instance.variants or {}).get("source") != name
+
+
+def schedule(instance, field: str) -> None:
+    """Generate ``instance``'s variants in the background once the transaction commits."""
+    model, pk = type(instance), instance.pk
+    if settings.IMAGE_VARIANT_WORKERS <= 0:
+        transaction.on_commit(lambda: process(model, pk, field))
+    else:
+        transaction.on_commit(lambda: _get_pool().submit(run, model, pk, field))
+
+
+def srcset(field_file, variants: dict, fmt: str = "jpeg", absolute=None) -> str:
+    """
+    ``"<url> 320w, <url> 640w, ..."`` for ``fmt``, or "" before variants exist.
+    ``absolute`` (e.g. ``request.build_absolute_uri``) is applied to each URL.
+    """
+    storage = field_file.storage
+    candidates = {}
+    for name in VARIANTS:
+        entry = variants.get(name) or {}
+        # Small originals produce several variants of the same width; list each width once.
+        if fmt in entry and entry["width"] not in candidates:
+            url = storage.url(entry[fmt])
+            candidates[entry["width"]] = absolute(url) if absolute else url
+    return ", ".join(f"{url} {width}w" for width, url in candidates.items())
+
+
+def variant_url(field_file, variants: dict, variant: str, fmt: str = "jpeg") -> str:
+    """URL of one variant, falling back to the original upload."""
+    entry = variants.get(variant) or {}
+    if fmt in entry:
+        return field_file.storage.url(entry[fmt])
+    return field_file.url
+
+
+class ResponsiveImageMixin:
+    """
+    Model mixin for a row with a ``variants`` JSONField describing the file in
+    ``IMAGE_FIELD``. Gives templates ``srcset_webp`` / ``srcset_jpeg`` and the
+    per-variant URLs (``thumb_url``, ``card_url``, ``full_url``).
+    """
+
+    IMAGE_FIELD = "image"
+
+    @property
+    def _image_file(self):
+        return getattr(self, self.IMAGE_FIELD)
+
+    @property
+    def srcset_webp(self) -> str:
+        return srcset(self._image_file, self.variants or {}, "webp")
+
+    @property
+    def srcset_jpeg(self) -> str:
+        return srcset(self._image_file, self.variants or {}, "jpeg")
+
+    @property
+    def thumb_url(self) -> str:
+        return variant_url(self._image_file, self.variants or {}, "thumb")
+
+    @property
+    def card_url(self) -> str:
+        return variant_url(self._image_file, self.variants or {}, "card")
+
+    @property
+    def full_url(self) -> str:
+        return variant_url(self._image_file, self.variants or {}, "full")
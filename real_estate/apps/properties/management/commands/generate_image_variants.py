@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.properties import images
+from apps.properties.models import MediaType, PropertyMedia
+from property.models import PropertyImage
+
+
+class Command(BaseCommand):
+    help = "Generate missing WebP/JPEG variants for listing photos (both property models)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate variants that already exist.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=max(1, settings.IMAGE_VARIANT_WORKERS),
+            help="Images resized in parallel.",
+        )
+
+    def handle(self, *args, **options):
+        sources = [
+            (PropertyImage, "image", PropertyImage.objects.exclude(image="")),
+            (PropertyMedia, "file", PropertyMedia.objects.filter(media_type=MediaType.IMAGE)),
+        ]
+        jobs = [
+            (model, row.pk, field)
+            for model, field, queryset in sources
+            for row in queryset.only("pk", field, "variants").iterator()
+            if options["force"] or images.is_stale(row, field)
+        ]
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            list(pool.map(lambda job: images.run(*job), jobs))
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(jobs)} images."))
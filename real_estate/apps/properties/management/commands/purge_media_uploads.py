@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.properties.uploads import purge_stale
+
+
+class Command(BaseCommand):
+    help = "Delete chunked media uploads (and their part files) that have been idle too long."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="Idle time before an upload is purged.")
+
+    def handle(self, *args, **options):
+        deleted = purge_stale(timedelta(hours=options["hours"]))
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} uploads."))
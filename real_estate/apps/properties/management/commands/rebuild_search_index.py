@@ -0,0 +1,32 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.properties.search import get_search_backend
+
+DEFAULT_MODELS = ("property.Property", "core_properties.Property")
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for property listings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            default=DEFAULT_MODELS,
+            help="Model labels to reindex (default: both property models).",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        for label in options["models"]:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as exc:
+                raise CommandError(f"Unknown model {label!r}") from exc
+            backend = get_search_backend(model, options["database"])
+            backend.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt {label} search index ({type(backend).__name__}).")
+            )
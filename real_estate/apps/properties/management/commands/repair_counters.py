@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from config import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalised property, lead, enquiry and wishlist counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Only report counters that are off.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        for counter in counters.counters():
+            drifted = counters.drifted(counter, using)
+            if options["check"]:
+                self.stdout.write(f"{counter.label}: {drifted.count()} rows off.")
+                continue
+            with transaction.atomic(using=using):
+                # Lock the parents being fixed so concurrent bumps wait for the recount.
+                pks = list(drifted.select_for_update().values_list("pk", flat=True))
+                queryset = counter.parent._default_manager.using(using).filter(pk__in=pks)
+                counters.recount(counter.parent, counter.field, counter.child, counter.fk, queryset)
+            self.stdout.write(self.style.SUCCESS(f"{counter.label}: repaired {len(pks)} rows."))
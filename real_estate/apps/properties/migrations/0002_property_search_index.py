@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from apps.properties.search import get_search_backend
+
+SEARCH_FIELDS = ("title", "description", "city", "locality")
+
+
+def create_search_index(apps, schema_editor):
+    Property = apps.get_model("core_properties", "Property")
+    backend = get_search_backend(Property, schema_editor.connection.alias, SEARCH_FIELDS)
+    backend.create_index()
+    backend.rebuild()
+
+
+def drop_search_index(apps, schema_editor):
+    Property = apps.get_model("core_properties", "Property")
+    get_search_backend(Property, schema_editor.connection.alias, SEARCH_FIELDS).drop_index()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_properties', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
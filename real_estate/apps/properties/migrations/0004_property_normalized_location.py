@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+from apps.geocoding.text import normalize
+
+
+def backfill_normalized_location(apps, schema_editor):
+    CityAlias = apps.get_model("core_geocoding", "CityAlias")
+    Property = apps.get_model("core_properties", "Property")
+    aliases = dict(CityAlias.objects.values_list("alias", "city"))
+    batch = []
+    for prop in Property.objects.only("pk", "city", "locality").iterator(chunk_size=1000):
+        city = normalize(prop.city)
+        prop.city_normalized = aliases.get(city, city)
+        prop.locality_normalized = normalize(prop.locality)
+        batch.append(prop)
+        if len(batch) == 1000:
+            Property.objects.bulk_update(batch, ["city_normalized", "locality_normalized"])
+            batch = []
+    Property.objects.bulk_update(batch, ["city_normalized", "locality_normalized"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_properties', '0003_property_lat_lng_index'),
+        ('core_geocoding', '0002_cityalias'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='property',
+            name='core_proper_city_2297a5_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='property',
+            name='core_proper_localit_dacad3_idx',
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='city_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='locality_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=150),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['city_normalized'], name='core_proper_city_no_d6ccbe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['locality_normalized'], name='core_proper_localit_6708ae_idx'),
+        ),
+        migrations.RunPython(backfill_normalized_location, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+from config.counters import recount
+
+
+def backfill(apps, schema_editor):
+    Property = apps.get_model("core_properties", "Property")
+    recount(Property, "enquiry_count", apps.get_model("core_enquiries", "Enquiry"), "property")
+    recount(Property, "wishlist_count", apps.get_model("core_wishlist", "Wishlist"), "property")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core_properties', '0006_mediaupload'),
+        ('core_enquiries', '0001_initial'),
+        ('core_wishlist', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='enquiry_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='wishlist_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
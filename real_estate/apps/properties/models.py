@@ -3,6 +3,13 @@ import uuid
 from django.conf import settings
 from django.db import models
 
+from apps.geocoding.cities import canonical_city
+from apps.geocoding.text import normalize, prefix_q
+from config.counters import CounterFieldsMixin
+
+from .geo import GeoQuerySetMixin
+from .images import ResponsiveImageMixin
+from .search import SearchQuerySetMixin
 from .validators import validate_image_file, validate_video_file
 
 
@@ -24,7 +31,23 @@ class PropertyStatus(models.TextChoices):
     PENDING = "PENDING", "Pending"
 
 
-class Property(models.Model):
+class PropertyQuerySet(SearchQuerySetMixin, GeoQuerySetMixin, models.QuerySet):
+    def approved(self):
+        return self.filter(is_approved=True)
+
+    def for_city(self, city: str):
+        """Listings whose (canonical) city starts with ``city``."""
+        if city:
+            return self.filter(prefix_q("city_normalized", canonical_city(city)))
+        return self
+
+    def for_locality(self, locality: str):
+        if locality:
+            return self.filter(prefix_q("locality_normalized", normalize(locality)))
+        return self
+
+
+class Property(CounterFieldsMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="properties")
 
@@ -38,29 +61,49 @@ class Property(models.Model):
     bathrooms = models.PositiveIntegerField(default=0)
     city = models.CharField(max_length=100)
     locality = models.CharField(max_length=150, blank=True)
+    # Lower-cased, trimmed copies maintained by save(); the city is canonical.
+    city_normalized = models.CharField(max_length=100, blank=True, editable=False)
+    locality_normalized = models.CharField(max_length=150, blank=True, editable=False)
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
     status = models.CharField(max_length=20, choices=PropertyStatus.choices, default=PropertyStatus.AVAILABLE)
     is_approved = models.BooleanField(default=False)
+    # Kept in step with the enquiry and wishlist rows by config.counters.
+    enquiry_count = models.PositiveIntegerField(default=0, editable=False)
+    wishlist_count = models.PositiveIntegerField(default=0, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PropertyQuerySet.as_manager()
+
+    SEARCH_FIELDS = ("title", "description", "city", "locality")
+    COUNTER_FIELDS = ("enquiry_count", "wishlist_count")
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["city"]),
-            models.Index(fields=["locality"]),
+            models.Index(fields=["city_normalized"]),
+            models.Index(fields=["locality_normalized"]),
             models.Index(fields=["price"]),
             models.Index(fields=["property_type"]),
             models.Index(fields=["listing_type"]),
             models.Index(fields=["status"]),
             models.Index(fields=["is_approved"]),
+            models.Index(fields=["latitude", "longitude"]),
         ]
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.city_normalized = canonical_city(self.city)
+        self.locality_normalized = normalize(self.locality)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"city", "locality"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "city_normalized", "locality_normalized"}
+        super().save(*args, **kwargs)
+
 
 class MediaType(models.TextChoices):
     IMAGE = "IMAGE", "Image"
@@ -71,11 +114,15 @@ def property_media_upload_path(instance: "PropertyMedia", filename: str) -> str:
     return f"property_media/{instance.property_id}/{filename}"
 
 
-class PropertyMedia(models.Model):
+class PropertyMedia(ResponsiveImageMixin, models.Model):
     id = models.BigAutoField(primary_key=True)
     property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="media")
     file = models.FileField(upload_to=property_media_upload_path)
     media_type = models.CharField(max_length=10, choices=MediaType.choices)
+    # Resized WebP/JPEG copies of an image, written by .images.
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+
+    IMAGE_FIELD = "file"
     
     def clean(self):
         from django.core.exceptions import ValidationError
@@ -92,3 +139,35 @@ class PropertyMedia(models.Model):
         return f"{self.media_type} for {self.property_id}"
 
 
+class UploadStatus(models.TextChoices):
+    OPEN = "OPEN", "Open"
+    COMPLETE = "COMPLETE", "Complete"
+
+
+class MediaUpload(models.Model):
+    """
+    A resumable, chunked upload of one ``PropertyMedia`` file. Chunks are
+    appended to a part file on local disk (see ``.uploads``); ``offset`` is
+    how many bytes of it are committed.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="uploads")
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="media_uploads")
+    filename = models.CharField(max_length=255)
+    media_type = models.CharField(max_length=10, choices=MediaType.choices)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=UploadStatus.choices, default=UploadStatus.OPEN)
+    media = models.OneToOneField(PropertyMedia, on_delete=models.SET_NULL, null=True, blank=True, related_name="upload")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "updated_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.offset}/{self.size})"
@@ -0,0 +1,200 @@
+"""
+Keyset (cursor) pagination shared by the legacy property list and the API.
+
+Pages are addressed by the sort key of the last row seen instead of an
+OFFSET, so every page costs the same index range scan however deep it is.
+The total ``COUNT(*)`` is optional because it is the expensive part on
+filtered (``.distinct()``) querysets.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# Every ordering ends with the primary key so the keyset is unique.
+SORT_ORDERINGS = {
+    "newest": ("-created_at", "-id"),
+    "price_high": ("-price", "-id"),
+    "price_low": ("price", "id"),
+    "relevance": ("-search_rank", "-id"),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values: list, reverse: bool = False) -> str:
+    payload = json.dumps({"v": values, "r": int(reverse)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[list, bool]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return list(payload["v"]), bool(payload.get("r"))
+    except (TypeError, ValueError, KeyError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor, count):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Paginate ``queryset`` by ``ordering`` (e.g. ``("-price", "-id")``).
+
+    ``get_page(cursor)`` returns a :class:`KeysetPage`; pass its
+    ``next_cursor``/``previous_cursor`` back in to move between pages.
+    """
+
+    def __init__(self, queryset, ordering, per_page: int, with_count: bool = True):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.with_count = with_count
+
+    def _fields(self) -> list[tuple[str, bool]]:
+        return [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    def _to_python(self, name: str, value):
+        query = self.queryset.query
+        if name in query.annotations:
+            return query.annotations[name].output_field.to_python(value)
+        return self.queryset.model._meta.get_field(name).to_python(value)
+
+    def _position(self, obj) -> list:
+        values = []
+        for name, _ in self._fields():
+            value = getattr(obj, name)
+            values.append(value if isinstance(value, (int, float)) else str(value))
+        return values
+
+    def _seek(self, values: list, backwards: bool) -> Q:
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y), flipped per direction.
+        fields = self._fields()
+        if len(values) != len(fields):
+            raise InvalidCursor("Invalid cursor")
+        try:
+            values = [self._to_python(name, value) for (name, _), value in zip(fields, values)]
+        except ValidationError as exc:
+            raise InvalidCursor("Invalid cursor") from exc
+        condition = Q()
+        for i, (name, descending) in enumerate(fields):
+            lookup = "lt" if descending != backwards else "gt"
+            term = Q(**{f"{name}__{lookup}": values[i]})
+            for j in range(i):
+                term &= Q(**{fields[j][0]: values[j]})
+            condition |= term
+        return condition
+
+    def get_page(self, cursor: str | None = None) -> KeysetPage:
+        values, backwards = decode_cursor(cursor) if cursor else (None, False)
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+        qs = self.queryset.order_by(*ordering)
+        if values is not None:
+            qs = qs.filter(self._seek(values, backwards))
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        has_next = has_more if not backwards else True
+        has_previous = has_more if backwards else values is not None
+        next_cursor = encode_cursor(self._position(rows[-1])) if rows and has_next else None
+        previous_cursor = (
+            encode_cursor(self._position(rows[0]), reverse=True) if rows and has_previous else None
+        )
+        count = self.queryset.order_by().count() if self.with_count else None
+        return KeysetPage(rows, has_next, has_previous, next_cursor, previous_cursor, count)
+
+
+def resolve_ordering(sort: str | None, searched: bool = False) -> tuple[str, ...]:
+    if sort in SORT_ORDERINGS and (sort != "relevance" or searched):
+        return SORT_ORDERINGS[sort]
+    return SORT_ORDERINGS["relevance" if searched else "newest"]
+
+
+class PropertyKeysetPagination(BasePagination):
+    """
+    DRF pagination for ``PropertyViewSet``.
+
+    Query params: ``cursor``, ``sort`` (newest/price_high/price_low/relevance),
+    ``page_size`` and ``count=0`` to skip the total count.
+    """
+
+    page_size = 12
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    sort_query_param = "sort"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        searched = "search_rank" in queryset.query.annotations
+        ordering = resolve_ordering(request.query_params.get(self.sort_query_param), searched)
+        with_count = request.query_params.get(self.count_query_param, "1").lower() not in ("0", "false")
+        paginator = KeysetPaginator(queryset, ordering, self.get_page_size(request), with_count)
+        try:
+            self.page = paginator.get_page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor as exc:
+            raise NotFound("Invalid cursor") from exc
+        self.request = request
+        return list(self.page)
+
+    def _link(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self._link(self.page.next_cursor),
+            "previous": self._link(self.page.previous_cursor),
+        }
+        if self.page.count is not None:
+            payload["count"] = self.page.count
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "count": {"type": "integer"},
+                "results": schema,
+            },
+        }
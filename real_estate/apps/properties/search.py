@@ -0,0 +1,250 @@
+"""
+Full-text search backends for property listings.
+
+Both the legacy ``property.Property`` and ``core_properties.Property`` models
+search through ``PropertyQuerySet.search()``, which ``SearchQuerySetMixin``
+provides. It delegates to one of the backends below, depending on the
+database vendor:
+
+* SQLite  -> an FTS5 shadow table (``<db_table>_fts``) kept in sync by the
+             receivers ``connect_index_signals`` registers.
+* MySQL   -> a FULLTEXT index maintained by InnoDB itself.
+* other   -> the old ``icontains`` scan.
+
+Matched rows are annotated with ``search_rank`` (higher is more relevant) and
+ordered by it; callers may still apply their own ``order_by()`` afterwards.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_fts5_support: dict[str, bool] = {}
+
+
+def tokenize(query: str) -> list[str]:
+    return [token.lower() for token in _TOKEN_RE.findall(query or "")]
+
+
+class TableRawSQL(RawSQL):
+    """
+    ``RawSQL`` whose ``{table}`` placeholder is filled with the alias the model
+    table has in the query being compiled, so the expression survives being
+    relabelled inside a subquery.
+    """
+
+    def as_sql(self, compiler, connection):
+        table = compiler.quote_name_unless_alias(compiler.query.get_initial_alias())
+        return "(%s)" % self.sql.format(table=table), self.params
+
+
+class LikeSearchBackend:
+    """Fallback backend: a plain ``icontains`` scan over the search fields."""
+
+    def __init__(self, model, using: str, fields=None):
+        self.model = model
+        self.using = using
+        self.fields = tuple(fields or model.SEARCH_FIELDS)
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    @property
+    def base_table(self) -> str:
+        return self.model._meta.db_table
+
+    @property
+    def index_name(self) -> str:
+        return f"{self.base_table}_fts"
+
+    def columns(self) -> list[str]:
+        return [self.model._meta.get_field(name).column for name in self.fields]
+
+    def search(self, queryset, query: str):
+        query = (query or "").strip()
+        if not query:
+            return queryset
+        condition = Q()
+        for name in self.fields:
+            condition |= Q(**{f"{name}__icontains": query})
+        return queryset.filter(condition).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    def create_index(self) -> None:
+        pass
+
+    def drop_index(self) -> None:
+        pass
+
+    def rebuild(self) -> None:
+        pass
+
+    def index(self, instance) -> None:
+        pass
+
+    def remove(self, pk) -> None:
+        pass
+
+
+class SQLiteFTS5Backend(LikeSearchBackend):
+    """FTS5 virtual table holding a copy of the searchable columns."""
+
+    def _object_id(self, pk):
+        return self.model._meta.pk.get_db_prep_value(pk, self.connection)
+
+    def search(self, queryset, query: str):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        match = " ".join(f'"{token}"*' for token in tokens)
+        table = self.index_name
+        pk_column = self.connection.ops.quote_name(self.model._meta.pk.column)
+        # The ranked matches are produced once per query. LIMIT -1 keeps SQLite
+        # from flattening the subquery into one MATCH per result row, and the
+        # unary + on the key (a plain column to the planner, not a rowid alias)
+        # lets it build an automatic index over the matches for the lookup.
+        return (
+            queryset.filter(
+                pk__in=RawSQL(f"SELECT object_id FROM {table} WHERE {table} MATCH %s", [match])
+            )
+            .annotate(
+                search_rank=TableRawSQL(
+                    f"SELECT matches.rank FROM (SELECT object_id, -bm25({table}) AS rank FROM {table} "
+                    f"WHERE {table} MATCH %s LIMIT -1) AS matches "
+                    f"WHERE matches.object_id = +{{table}}.{pk_column}",
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-search_rank")
+        )
+
+    def create_index(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.index_name} USING fts5("
+                f"object_id UNINDEXED, {', '.join(self.fields)}, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def drop_index(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.index_name}")
+
+    def rebuild(self) -> None:
+        qn = self.connection.ops.quote_name
+        source_columns = ", ".join(qn(column) for column in self.columns())
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.index_name}")
+            cursor.execute(
+                f"INSERT INTO {self.index_name} (object_id, {', '.join(self.fields)}) "
+                f"SELECT {qn(self.model._meta.pk.column)}, {source_columns} FROM {qn(self.base_table)}"
+            )
+
+    def index(self, instance) -> None:
+        object_id = self._object_id(instance.pk)
+        values = [getattr(instance, name) or "" for name in self.fields]
+        placeholders = ", ".join(["%s"] * (len(self.fields) + 1))
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.index_name} WHERE object_id = %s", [object_id])
+            cursor.execute(
+                f"INSERT INTO {self.index_name} (object_id, {', '.join(self.fields)}) "
+                f"VALUES ({placeholders})",
+                [object_id, *values],
+            )
+
+    def remove(self, pk) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.index_name} WHERE object_id = %s", [self._object_id(pk)]
+            )
+
+
+class MySQLFullTextBackend(LikeSearchBackend):
+    """InnoDB FULLTEXT index; the engine keeps it current on every write."""
+
+    def search(self, queryset, query: str):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        qn = self.connection.ops.quote_name
+        columns = ", ".join(f"{{table}}.{qn(column)}" for column in self.columns())
+        against = " ".join(f"+{token}*" for token in tokens)
+        return (
+            queryset.annotate(
+                search_rank=TableRawSQL(
+                    f"MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)",
+                    [against],
+                    output_field=FloatField(),
+                )
+            )
+            .filter(search_rank__gt=0)
+            .order_by("-search_rank")
+        )
+
+    def create_index(self) -> None:
+        qn = self.connection.ops.quote_name
+        columns = ", ".join(qn(column) for column in self.columns())
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {qn(self.base_table)} "
+                f"ADD FULLTEXT INDEX {qn(self.index_name)} ({columns})"
+            )
+
+    def drop_index(self) -> None:
+        qn = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(self.base_table)} DROP INDEX {qn(self.index_name)}")
+
+
+class SearchQuerySetMixin:
+    """``search()`` for the property querysets (see the module docstring)."""
+
+    def search(self, query: str):
+        return get_search_backend(self.model, self.db).search(self, query)
+
+
+def connect_index_signals(model) -> None:
+    """Keep ``model``'s search index in step with saves and deletes."""
+
+    def index(sender, instance, using: str, update_fields=None, **kwargs) -> None:
+        if update_fields and not set(update_fields) & set(sender.SEARCH_FIELDS):
+            return
+        get_search_backend(sender, using).index(instance)
+
+    def unindex(sender, instance, using: str, **kwargs) -> None:
+        get_search_backend(sender, using).remove(instance.pk)
+
+    uid = f"search-index:{model._meta.label}"
+    post_save.connect(index, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(unindex, sender=model, weak=False, dispatch_uid=uid)
+
+
+def _sqlite_has_fts5(using: str) -> bool:
+    if using not in _fts5_support:
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            _fts5_support[using] = bool(cursor.fetchone()[0])
+    return _fts5_support[using]
+
+
+def get_search_backend(model, using: str = "default", fields=None) -> LikeSearchBackend:
+    """
+    Return the search backend for ``model`` on database ``using``.
+
+    Set ``PROPERTY_SEARCH_BACKEND = "like"`` to force the ``icontains`` fallback.
+    """
+    if getattr(settings, "PROPERTY_SEARCH_BACKEND", "auto") == "like":
+        return LikeSearchBackend(model, using, fields)
+    vendor = connections[using].vendor
+    if vendor == "sqlite" and _sqlite_has_fts5(using):
+        return SQLiteFTS5Backend(model, using, fields)
+    if vendor == "mysql":
+        return MySQLFullTextBackend(model, using, fields)
+    return LikeSearchBackend(model, using, fields)
@@ -1,12 +1,35 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
 
-from .models import Property, PropertyMedia
+from . import images, uploads
+from .models import MediaUpload, Property, PropertyMedia
 
 
 class PropertyMediaSerializer(serializers.ModelSerializer):
+    variants = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = PropertyMedia
-        fields = ("id", "file", "media_type")
+        fields = ("id", "file", "media_type", "variants", "srcset")
+
+    def _absolute(self, url: str) -> str:
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def get_variants(self, obj: PropertyMedia) -> dict:
+        """``{"thumb": {"width", "height", "webp", "jpeg"}, ...}`` with absolute URLs; empty until generated."""
+        storage = obj.file.storage
+        return {
+            name: {**entry, **{fmt: self._absolute(storage.url(entry[fmt])) for fmt in ("webp", "jpeg")}}
+            for name, entry in (obj.variants or {}).items()
+            if name in images.VARIANTS
+        }
+
+    def get_srcset(self, obj: PropertyMedia) -> dict:
+        return {fmt: images.srcset(obj.file, obj.variants or {}, fmt, self._absolute) for fmt in ("webp", "jpeg")}
 
 
 class PropertySerializer(serializers.ModelSerializer):
@@ -32,10 +55,79 @@ class PropertySerializer(serializers.ModelSerializer):
             "longitude",
             "status",
             "is_approved",
+            "enquiry_count",
+            "wishlist_count",
             "created_at",
             "updated_at",
             "media",
         )
-        read_only_fields = ("id", "owner_id", "is_approved", "created_at", "updated_at")
+        read_only_fields = (
+            "id",
+            "owner_id",
+            "is_approved",
+            "enquiry_count",
+            "wishlist_count",
+            "created_at",
+            "updated_at",
+        )
+
+
+class NearbyPropertySerializer(PropertySerializer):
+    distance_km = serializers.FloatField(read_only=True)
+
+    class Meta(PropertySerializer.Meta):
+        fields = PropertySerializer.Meta.fields + ("distance_km",)
+
+
+class MediaUploadSerializer(serializers.ModelSerializer):
+    property = serializers.PrimaryKeyRelatedField(queryset=Property.objects.all())
+    media = PropertyMediaSerializer(read_only=True)
+    max_chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MediaUpload
+        fields = (
+            "id",
+            "property",
+            "filename",
+            "media_type",
+            "size",
+            "offset",
+            "status",
+            "media",
+            "max_chunk_size",
+            "created_at",
+        )
+        read_only_fields = ("id", "offset", "status", "media", "created_at")
+
+    def get_max_chunk_size(self, obj: MediaUpload) -> int:
+        return settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE
+
+    def validate_property(self, value: Property) -> Property:
+        if value.owner_id != self.context["request"].user.id:
+            raise serializers.ValidationError("Cannot upload media to another seller's property.")
+        return value
 
+    def validate_filename(self, value: str) -> str:
+        name = os.path.basename(value.replace("\\", "/")).strip()
+        if not name:
+            raise serializers.ValidationError("A file name is required.")
+        return name
 
+    def validate(self, attrs):
+        media_type = attrs["media_type"]
+        ext = os.path.splitext(attrs["filename"])[1].lower()
+        allowed = uploads.allowed_extensions(media_type)
+        if ext not in allowed:
+            raise serializers.ValidationError({"filename": f"Invalid file type. Allowed: {', '.join(allowed)}"})
+        # Check the stored path now rather than in full_clean() once every byte is in.
+        field = PropertyMedia._meta.get_field("file")
+        stored = field.generate_filename(PropertyMedia(property=attrs["property"]), attrs["filename"])
+        if len(stored) > field.max_length:
+            limit = field.max_length - (len(stored) - len(attrs["filename"]))
+            raise serializers.ValidationError({"filename": f"File names can be at most {limit} characters."})
+        if not 0 < attrs["size"] <= uploads.max_size(media_type):
+            raise serializers.ValidationError(
+                {"size": f"Must be between 1 and {uploads.max_size(media_type)} bytes."}
+            )
+        return attrs
@@ -0,0 +1,48 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import images, uploads
+from .autocomplete import listing_index
+from .models import MediaType, MediaUpload, Property, PropertyMedia
+from .search import connect_index_signals
+
+connect_index_signals(Property)
+
+
+@receiver(pre_save, sender=Property)
+@receiver(pre_delete, sender=Property)
+def remember_autocomplete_terms(sender, instance: Property, **kwargs) -> None:
+    row = None
+    fields = listing_index.fields
+    if not instance._state.adding:
+        row = sender.objects.filter(pk=instance.pk, is_approved=True).values(*fields.values()).first()
+    instance._autocomplete_terms = {(kind, row[field]) for kind, field in fields.items() if row and row[field]}
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def update_autocomplete(sender, instance: Property, signal, **kwargs) -> None:
+    previous = getattr(instance, "_autocomplete_terms", set())
+    current = listing_index.terms_for(instance) if signal is post_save and instance.is_approved else set()
+    instance._autocomplete_terms = current
+    changed = previous ^ current
+    if changed:
+        transaction.on_commit(lambda: listing_index.refresh(changed))
+
+
+@receiver(post_save, sender=PropertyMedia)
+def generate_media_variants(sender, instance: PropertyMedia, **kwargs) -> None:
+    if instance.media_type == MediaType.IMAGE and images.is_stale(instance, "file"):
+        images.schedule(instance, "file")
+
+
+@receiver(post_delete, sender=PropertyMedia)
+def delete_media_variants(sender, instance: PropertyMedia, **kwargs) -> None:
+    variants = instance.variants or {}
+    transaction.on_commit(lambda: images.delete_variants(instance.file, variants))
+
+
+@receiver(post_delete, sender=MediaUpload)
+def delete_upload_part(sender, instance: MediaUpload, **kwargs) -> None:
+    transaction.on_commit(lambda: uploads.discard_part(instance))
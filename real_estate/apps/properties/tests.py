@@ -0,0 +1,172 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from accounts.models import Seller
+from apps.accounts.models import User, UserRole
+from property.models import Property as LegacyProperty
+from property.models import PropertyImage
+
+from . import images
+from .models import MediaUpload, Property, PropertyMedia, UploadStatus
+
+
+def image_bytes(fmt: str) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (800, 600), "red").save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def image_file(name: str, fmt: str) -> ContentFile:
+    return ContentFile(image_bytes(fmt), name=name)
+
+
+class TemporaryMediaMixin:
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(
+            MEDIA_ROOT=media_root, MEDIA_UPLOAD_DIR=f"{media_root}/uploads", IMAGE_VARIANT_WORKERS=0
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+class ImageVariantTests(TemporaryMediaMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seller = Seller.objects.create(name="Seller", email="seller@example.com", phone="9000000000")
+        cls.listings = [
+            LegacyProperty.objects.create(
+                seller=seller,
+                title="Flat",
+                category=LegacyProperty.RESIDENTIAL,
+                subcategory="APARTMENT",
+                property_type="SELL",
+                price=100,
+                address="1 Main Road",
+                city="Pune",
+                state="Maharashtra",
+            )
+            for _ in range(2)
+        ]
+
+    def add_image(self, listing: LegacyProperty, name: str, fmt: str) -> PropertyImage:
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PropertyImage.objects.create(property=listing, image=image_file(name, fmt))
+        image.refresh_from_db()
+        return image
+
+    def paths(self, image: PropertyImage) -> set[str]:
+        return {image.variants[variant][ext] for variant in images.VARIANTS for ext in ("webp", "jpeg")}
+
+    def test_same_stem_on_different_listings_keeps_both_sets(self):
+        jpg = self.add_image(self.listings[0], "house.jpg", "JPEG")
+        png = self.add_image(self.listings[1], "house.png", "PNG")
+        again = self.add_image(self.listings[1], "house.jpg", "JPEG")
+
+        self.assertTrue(self.paths(jpg).isdisjoint(self.paths(png)))
+        self.assertTrue(self.paths(jpg).isdisjoint(self.paths(again)))
+        self.assertIn("house-png-card", png.variants["card"]["webp"])
+        storage = jpg.image.storage
+        for path in self.paths(jpg) | self.paths(png) | self.paths(again):
+            self.assertTrue(storage.exists(path), path)
+
+    def test_regenerating_replaces_only_this_rows_files(self):
+        image = self.add_image(self.listings[0], "house.jpg", "JPEG")
+        other = self.add_image(self.listings[1], "house.jpg", "JPEG")
+        old = self.paths(image)
+
+        images.process(PropertyImage, image.pk, "image")
+        image.refresh_from_db()
+
+        storage = image.image.storage
+        self.assertTrue(old.isdisjoint(self.paths(image)))
+        self.assertFalse(any(storage.exists(path) for path in old))
+        self.assertTrue(all(storage.exists(path) for path in self.paths(image) | self.paths(other)))
+
+
+class MediaUploadTests(TemporaryMediaMixin, TestCase):
+    URL = "/api/media-uploads/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(email="seller@example.com", password="x", role=UserRole.SELLER)
+        cls.listing = Property.objects.create(
+            owner=cls.owner,
+            title="Flat",
+            property_type="FLAT",
+            listing_type="SALE",
+            price=100,
+            area_sqft=500,
+            city="Pune",
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def start(self, filename: str, size: int):
+        return self.client.post(
+            self.URL,
+            {"property": self.listing.pk, "filename": filename, "media_type": "IMAGE", "size": size},
+            format="json",
+        )
+
+    def send(self, upload_id, offset: int, chunk: bytes):
+        return self.client.patch(
+            f"{self.URL}{upload_id}/", chunk, content_type="application/octet-stream", HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_chunks_resume_and_complete(self):
+        content = image_bytes("PNG")
+        upload_id = self.start("house.png", len(content)).data["id"]
+        half = len(content) // 2
+
+        response = self.send(upload_id, 0, content[:half])
+        self.assertEqual((response.status_code, response["Upload-Offset"]), (200, str(half)))
+        # A client that lost the response reads the offset back and carries on.
+        self.assertEqual(self.client.get(f"{self.URL}{upload_id}/").data["offset"], half)
+        response = self.send(upload_id, half, content[half:])
+
+        self.assertEqual(response.data["status"], UploadStatus.COMPLETE)
+        media = PropertyMedia.objects.get(pk=response.data["media"]["id"])
+        with media.file.open("rb") as stored:
+            self.assertEqual(stored.read(), content)
+
+    def test_wrong_offset_is_a_conflict_carrying_the_real_offset(self):
+        content = image_bytes("PNG")
+        upload_id = self.start("house.png", len(content)).data["id"]
+        self.send(upload_id, 0, content[:100])
+
+        for offset in (0, 150):
+            response = self.send(upload_id, offset, content[offset:offset + 50])
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.data["offset"], 100)
+        self.assertEqual(MediaUpload.objects.get(pk=upload_id).offset, 100)
+
+    def test_first_chunk_must_match_the_extension(self):
+        content = image_bytes("JPEG")
+        upload_id = self.start("house.png", len(content)).data["id"]
+        response = self.send(upload_id, 0, content[:1024])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("does not match", str(response.data))
+        self.assertEqual(MediaUpload.objects.get(pk=upload_id).offset, 0)
+
+    def test_name_too_long_for_the_file_field_is_refused_up_front(self):
+        max_length = PropertyMedia._meta.get_field("file").max_length
+        response = self.start(f"{'a' * max_length}.png", 1000)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("filename", response.data)
+        self.assertFalse(MediaUpload.objects.exists())
+
+        prefix = len(f"property_media/{self.listing.pk}/")
+        name = f"{'a' * (max_length - prefix - 4)}.png"
+        self.assertEqual(self.start(name, 1000).status_code, 201)
@@ -0,0 +1,162 @@
+"""
+Resumable, chunked uploads of ``PropertyMedia`` files.
+
+A client creates a ``MediaUpload`` with the file name, media type and total
+size, then sends the bytes in order, each request naming the offset it
+starts at. ``receive_chunk`` streams the request body to a chunk file on
+disk ``READ_SIZE`` bytes at a time and, under a row lock and only if the
+offset still matches, appends it to the upload's part file. The first chunk
+must carry the file's magic bytes, so content that doesn't match its
+extension is refused before the rest is sent. When the last byte lands the
+part file becomes the ``PropertyMedia`` file (moved, not copied, on
+``FileSystemStorage``) and goes through the model's usual validation.
+
+Memory per request is one read buffer whatever the file or chunk size; a
+client that loses its connection reads ``offset`` back and carries on.
+"""
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import MediaType, MediaUpload, PropertyMedia, UploadStatus
+from .validators import MAX_VIDEO_SIZE, SNIFF_LENGTH, validate_signature
+
+READ_SIZE = 64 * 1024
+
+
+class OffsetMismatch(Exception):
+    """The chunk doesn't start where the upload is; ``offset`` is where it is."""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}.")
+        self.offset = offset
+
+
+class _PartFile(File):
+    # FileSystemStorage moves a file that has a path on disk instead of copying it.
+    def temporary_file_path(self) -> str:
+        return self.file.name
+
+
+def max_size(media_type: str) -> int:
+    if media_type == MediaType.IMAGE:
+        return settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+    return MAX_VIDEO_SIZE
+
+
+def allowed_extensions(media_type: str) -> list[str]:
+    if media_type == MediaType.IMAGE:
+        return settings.ALLOWED_IMAGE_EXTENSIONS
+    return settings.ALLOWED_VIDEO_EXTENSIONS
+
+
+def upload_dir() -> Path:
+    path = Path(settings.MEDIA_UPLOAD_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def part_path(upload: MediaUpload) -> Path:
+    return upload_dir() / f"{upload.pk}.part"
+
+
+def _spool(stream, length: int):
+    """Copy exactly ``length`` bytes of ``stream`` to a new chunk file, rewound."""
+    chunk = tempfile.NamedTemporaryFile(dir=upload_dir(), suffix=".chunk")
+    remaining = length
+    while remaining:
+        block = stream.read(min(READ_SIZE, remaining))
+        if not block:
+            chunk.close()
+            raise ValidationError("The chunk ended before Content-Length bytes were received.")
+        chunk.write(block)
+        remaining -= len(block)
+    chunk.seek(0)
+    return chunk
+
+
+def receive_chunk(upload: MediaUpload, stream, offset: int, length: int) -> MediaUpload:
+    """
+    Append ``length`` bytes of ``stream`` at ``offset``. Returns the updated
+    upload, completed (with ``media`` set) if that was the last chunk.
+    """
+    if upload.status != UploadStatus.OPEN:
+        raise ValidationError("This upload is already complete.")
+    if offset != upload.offset:
+        raise OffsetMismatch(upload.offset)
+    if length <= 0 or length > settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE:
+        raise ValidationError(f"Chunks must be 1 to {settings.MEDIA_UPLOAD_MAX_CHUNK_SIZE} bytes.")
+    if offset + length > upload.size:
+        raise ValidationError("The chunk runs past the declared size.")
+
+    with _spool(stream, length) as chunk:
+        if offset == 0:
+            header = chunk.read(SNIFF_LENGTH)
+            if len(header) < SNIFF_LENGTH and length < upload.size:
+                raise ValidationError(f"The first chunk must be at least {SNIFF_LENGTH} bytes.")
+            validate_signature(header, upload.filename)
+            chunk.seek(0)
+        with transaction.atomic():
+            upload = MediaUpload.objects.select_for_update().get(pk=upload.pk)
+            if upload.offset != offset:
+                raise OffsetMismatch(upload.offset)
+            with open(part_path(upload), "ab") as part:
+                lost = part.tell() < offset
+                if lost:
+                    # The part file lost data; the client resends from what's there.
+                    upload.offset = part.tell()
+                else:
+                    # Drop bytes a crashed request appended without committing its offset.
+                    part.truncate(offset)
+                    shutil.copyfileobj(chunk, part, READ_SIZE)
+                    upload.offset = offset + length
+            upload.save(update_fields=["offset", "updated_at"])
+        if lost:
+            raise OffsetMismatch(upload.offset)
+
+    if upload.offset == upload.size:
+        return complete(upload)
+    return upload
+
+
+def complete(upload: MediaUpload) -> MediaUpload:
+    """Turn a fully received upload into its ``PropertyMedia``."""
+    path = part_path(upload)
+    try:
+        with transaction.atomic():
+            upload = MediaUpload.objects.select_for_update().get(pk=upload.pk)
+            if upload.status == UploadStatus.COMPLETE:
+                return upload
+            with open(path, "rb") as part:
+                media = PropertyMedia(
+                    property_id=upload.property_id,
+                    media_type=upload.media_type,
+                    file=_PartFile(part, name=upload.filename),
+                )
+                media.save()
+            upload.media = media
+            upload.status = UploadStatus.COMPLETE
+            upload.save(update_fields=["media", "status", "updated_at"])
+    except ValidationError:
+        # The assembled file is unusable; resuming can't fix it.
+        upload.delete()
+        raise
+    path.unlink(missing_ok=True)
+    return upload
+
+
+def discard_part(upload: MediaUpload) -> None:
+    part_path(upload).unlink(missing_ok=True)
+
+
+def purge_stale(older_than: timedelta) -> int:
+    """Delete uploads (and their part files) untouched for ``older_than``."""
+    deleted, _ = MediaUpload.objects.filter(updated_at__lt=timezone.now() - older_than).delete()
+    return deleted
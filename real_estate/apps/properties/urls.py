@@ -1,11 +1,12 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import PropertyViewSet
+from .views import MediaUploadViewSet, PropertyViewSet
 
 
 router = DefaultRouter()
 router.register(r"properties", PropertyViewSet, basename="properties")
+router.register(r"media-uploads", MediaUploadViewSet, basename="media-uploads")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -2,30 +2,69 @@ import os
 from django.core.exceptions import ValidationError
 from django.conf import settings
 
+MAX_VIDEO_SIZE = 50 * 1024 * 1024
+# Bytes needed from the start of a file to recognise every signature below.
+SNIFF_LENGTH = 16
+
+
+def sniff_extensions(header: bytes) -> set[str]:
+    """Extensions whose magic bytes match ``header`` (the first ``SNIFF_LENGTH`` bytes)."""
+    if header.startswith(b"\xff\xd8\xff"):
+        return {".jpg", ".jpeg"}
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return {".png"}
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return {".webp"}
+    if header[4:8] == b"ftyp":
+        return {".mp4"}
+    if header.startswith(b"\x1a\x45\xdf\xa3"):
+        return {".webm"}
+    return set()
+
+
+def validate_signature(header: bytes, name: str) -> None:
+    """Reject content whose magic bytes don't match the extension of ``name``."""
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in sniff_extensions(header):
+        raise ValidationError(f"File content does not match its {ext or 'missing'} extension.")
+
+
+def _read_header(value) -> bytes:
+    if value.closed:
+        with value.open("rb"):
+            return value.read(SNIFF_LENGTH)
+    position = value.tell()
+    value.seek(0)
+    header = value.read(SNIFF_LENGTH)
+    value.seek(position)
+    return header
+
 
 def validate_image_file(value):
-    """Validate uploaded image file extension and size."""
+    """Validate uploaded image file extension, size and signature."""
     ext = os.path.splitext(value.name)[1].lower()
     if ext not in settings.ALLOWED_IMAGE_EXTENSIONS:
         raise ValidationError(
             f"Invalid file type. Allowed: {', '.join(settings.ALLOWED_IMAGE_EXTENSIONS)}"
         )
-    
+
     # Check file size (10MB max)
     if value.size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
         raise ValidationError("File size exceeds 10MB limit.")
 
+    validate_signature(_read_header(value), value.name)
+
 
 def validate_video_file(value):
-    """Validate uploaded video file extension and size."""
+    """Validate uploaded video file extension, size and signature."""
     ext = os.path.splitext(value.name)[1].lower()
     if ext not in settings.ALLOWED_VIDEO_EXTENSIONS:
         raise ValidationError(
             f"Invalid file type. Allowed: {', '.join(settings.ALLOWED_VIDEO_EXTENSIONS)}"
         )
-    
+
     # Check file size (50MB max for videos)
-    max_video_size = 50 * 1024 * 1024
-    if value.size > max_video_size:
+    if value.size > MAX_VIDEO_SIZE:
         raise ValidationError("Video file size exceeds 50MB limit.")
 
+    validate_signature(_read_header(value), value.name)
@@ -1,17 +1,34 @@
-from rest_framework import permissions, viewsets
+import uuid
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import mixins, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from apps.accounts.permissions import IsAdminRole, IsSeller
+from config.db_router import allow_replica_reads
 
+from . import uploads
+from .autocomplete import listing_index
 from .filters import PropertyFilter
-from .models import Property
-from .serializers import PropertySerializer
+from .geo import geo_filter, result_limit
+from .models import MediaUpload, Property
+from .pagination import PropertyKeysetPagination
+from .serializers import MediaUploadSerializer, NearbyPropertySerializer, PropertySerializer
 
 
 class PropertyViewSet(viewsets.ModelViewSet):
     serializer_class = PropertySerializer
     filterset_class = PropertyFilter
+    pagination_class = PropertyKeysetPagination
+    # Public browse actions that can read from a replica (see config.db_router).
+    replica_actions = ("list", "search", "nearby", "autocomplete")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_actions:
+            allow_replica_reads()
 
     def get_queryset(self):
         qs = Property.objects.all().select_related("owner").prefetch_related("media")
@@ -22,7 +39,7 @@ class PropertyViewSet(viewsets.ModelViewSet):
         return qs.filter(is_approved=True)
 
     def get_permissions(self):
-        if self.action in ("list", "retrieve", "search"):
+        if self.action in ("list", "retrieve", "search", "nearby", "autocomplete"):
             return [permissions.AllowAny()]
         if self.action in ("create", "update", "partial_update", "destroy"):
             return [permissions.IsAuthenticated(), IsSeller()]
@@ -47,16 +64,91 @@ class PropertyViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], url_path="search", permission_classes=[permissions.AllowAny])
     def search(self, request):
         qs = self.filter_queryset(self.get_queryset())
+        query = request.query_params.get("q", "").strip()
+        if query:
+            qs = qs.search(query)
         page = self.paginate_queryset(qs)
         if page is not None:
             return self.get_paginated_response(PropertySerializer(page, many=True).data)
         return Response(PropertySerializer(qs, many=True).data)
 
+    @action(detail=False, methods=["get"], url_path="nearby", permission_classes=[permissions.AllowAny])
+    def nearby(self, request):
+        """``?lat=&lng=&radius=`` (km) or ``?bbox=west,south,east,north``, nearest first."""
+        try:
+            qs = geo_filter(self.filter_queryset(self.get_queryset()), request.query_params)
+        except ValueError as exc:
+            raise ValidationError({"detail": str(exc)}) from exc
+        exclude = request.query_params.get("exclude")
+        if exclude:
+            try:
+                qs = qs.exclude(pk=uuid.UUID(exclude))
+            except ValueError as exc:
+                raise ValidationError({"exclude": "Must be a property id."}) from exc
+        rows = qs[: result_limit(request.query_params)]
+        return Response({"results": NearbyPropertySerializer(rows, many=True).data})
+
+    @action(detail=False, methods=["get"], url_path="autocomplete", permission_classes=[permissions.AllowAny])
+    def autocomplete(self, request):
+        """``?q=<prefix>&kind=city|locality&limit=``: approved-listing locations, most listings first."""
+        try:
+            limit = int(request.query_params.get("limit", 8))
+        except ValueError as exc:
+            raise ValidationError({"limit": "Must be an integer."}) from exc
+        kinds = request.query_params.getlist("kind") or None
+        return Response({"results": listing_index.suggest(request.query_params.get("q", ""), limit, kinds)})
+
     @action(detail=True, methods=["put"], url_path="approve", permission_classes=[permissions.IsAuthenticated, IsAdminRole])
     def approve(self, request, pk=None):
         prop = self.get_object()
         prop.is_approved = True
-        prop.save(update_fields=["is_approved"])
+        # updated_at lets the analytics rollup see the approval.
+        prop.save(update_fields=["is_approved", "updated_at"])
         return Response({"detail": "Approved"})
 
 
+class MediaUploadViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Resumable uploads of property photos and videos (see ``.uploads``).
+
+    ``POST`` declares ``property``, ``filename``, ``media_type`` and ``size``.
+    Each ``PATCH`` sends the next raw bytes with an ``Upload-Offset`` header;
+    a 409 carries the offset to resume from. ``GET`` reports the offset and,
+    once complete, the created media. ``DELETE`` abandons the upload.
+    """
+
+    serializer_class = MediaUploadSerializer
+    permission_classes = [permissions.IsAuthenticated, IsSeller]
+
+    def get_queryset(self):
+        return MediaUpload.objects.filter(owner=self.request.user).select_related("media")
+
+    def perform_create(self, serializer):
+        serializer.save(owner=self.request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if isinstance(response.data, dict) and "offset" in response.data:
+            response["Upload-Offset"] = str(response.data["offset"])
+        return response
+
+    def partial_update(self, request, pk=None):
+        upload = self.get_object()
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers.get("Content-Length") or 0)
+        except (KeyError, ValueError) as exc:
+            raise ValidationError({"detail": "Upload-Offset and Content-Length headers are required."}) from exc
+        try:
+            # Read the raw body stream; request.data would buffer the whole chunk.
+            upload = uploads.receive_chunk(upload, request.stream, offset, length)
+        except uploads.OffsetMismatch as exc:
+            return Response({"detail": str(exc), "offset": exc.offset}, status=status.HTTP_409_CONFLICT)
+        except DjangoValidationError as exc:
+            raise ValidationError({"detail": exc.messages}) from exc
+        return Response(self.get_serializer(upload).data)
@@ -6,4 +6,5 @@ class WishlistConfig(AppConfig):
     name = "apps.wishlist"
     label = "core_wishlist"
 
-
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
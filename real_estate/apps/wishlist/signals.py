@@ -0,0 +1,5 @@
+from config import counters
+
+from .models import Wishlist
+
+counters.track(Wishlist, "property", "wishlist_count")
@@ -0,0 +1,268 @@
+"""
+Two-tier cache for the project.
+
+``TieredCache`` is a Django cache backend that puts a small in-process LRU
+in front of a shared backend (Redis, Memcached or - in development - a
+local-memory cache). Reads are served from the local tier when possible.
+Writes go to both tiers. Local entries live for at most ``LOCAL_TIMEOUT``
+seconds, which bounds how stale another worker's copy can be after a delete.
+
+App code should not talk to ``caches["default"]`` with bare keys. Use
+``get_cache("<namespace>")``, which prefixes keys per app, records hit/miss
+counts, and offers ``get_or_set_locked()`` to keep a cold key from being
+recomputed by every concurrent request.
+
+    OPTIONS = {
+        "SHARED_ALIAS": "shared",     # alias of the shared tier in CACHES
+        "LOCAL_MAX_ENTRIES": 1024,    # LRU size per process
+        "LOCAL_TIMEOUT": 5,           # seconds a local copy may be served
+    }
+"""
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_MISSING = object()
+
+
+class _LocalLRU:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return _MISSING
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        if ttl <= 0:
+            self.delete(key)
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = options.get("SHARED_ALIAS", "shared")
+        self._local_timeout = float(options.get("LOCAL_TIMEOUT", 5))
+        self._local = _LocalLRU(int(options.get("LOCAL_MAX_ENTRIES", 1024)))
+        self.stats = Counter()
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self._shared_alias]
+
+    def _local_ttl(self, timeout) -> float:
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            return self._local_timeout
+        return min(self._local_timeout, timeout - time.time())
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._local.set(self.make_and_validate_key(key, version), value, self._local_ttl(timeout))
+        return added
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version)
+        value = self._local.get(local_key)
+        if value is not _MISSING:
+            self.stats["local_hits"] += 1
+            return value
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self.stats["misses"] += 1
+            return default
+        self.stats["shared_hits"] += 1
+        self._local.set(local_key, value, self._local_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remote = []
+        for key in keys:
+            value = self._local.get(self.make_and_validate_key(key, version))
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+        self.stats["local_hits"] += len(found)
+        if remote:
+            fetched = self.shared.get_many(remote, version=version)
+            self.stats["shared_hits"] += len(fetched)
+            self.stats["misses"] += len(remote) - len(fetched)
+            for key, value in fetched.items():
+                self._local.set(self.make_and_validate_key(key, version), value, self._local_timeout)
+            found.update(fetched)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._local.set(self.make_and_validate_key(key, version), value, self._local_ttl(timeout))
+        self.stats["sets"] += 1
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        ttl = self._local_ttl(timeout)
+        for key, value in data.items():
+            if key not in failed:
+                self._local.set(self.make_and_validate_key(key, version), value, ttl)
+        self.stats["sets"] += len(data) - len(failed)
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._local.delete(self.make_and_validate_key(key, version))
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        for key in keys:
+            self._local.delete(self.make_and_validate_key(key, version))
+        self.shared.delete_many(keys, version=version)
+
+    def has_key(self, key, version=None):
+        if self._local.get(self.make_and_validate_key(key, version)) is not _MISSING:
+            return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._local.delete(self.make_and_validate_key(key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+class NamespacedCache:
+    """Key-prefixing view of a cache alias with per-namespace hit/miss counts."""
+
+    lock_timeout = 30
+    lock_wait = 2.0
+    lock_poll_interval = 0.05
+
+    def __init__(self, namespace: str, alias: str = "default"):
+        self.namespace = namespace
+        self.alias = alias
+        self.stats = Counter()
+
+    @property
+    def backend(self) -> BaseCache:
+        return caches[self.alias]
+
+    def key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str, default=None):
+        value = self.backend.get(self.key(key), _MISSING)
+        if value is _MISSING:
+            self.stats["misses"] += 1
+            return default
+        self.stats["hits"] += 1
+        return value
+
+    def get_many(self, keys) -> dict:
+        keys = list(keys)
+        fetched = self.backend.get_many([self.key(k) for k in keys])
+        found = {k: fetched[self.key(k)] for k in keys if self.key(k) in fetched}
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, value, timeout=DEFAULT_TIMEOUT) -> None:
+        self.backend.set(self.key(key), value, timeout)
+
+    def add(self, key: str, value, timeout=DEFAULT_TIMEOUT) -> bool:
+        return self.backend.add(self.key(key), value, timeout)
+
+    def delete(self, key: str) -> bool:
+        """True if ``key`` was there (and this call removed it)."""
+        return self.backend.delete(self.key(key))
+
+    def delete_many(self, keys) -> None:
+        self.backend.delete_many([self.key(k) for k in keys])
+
+    def incr(self, key: str, delta: int = 1) -> int:
+        return self.backend.incr(self.key(key), delta)
+
+    def get_or_set_locked(self, key: str, compute, timeout=DEFAULT_TIMEOUT):
+        """
+        Return ``key``, computing it with ``compute()`` on a miss. Only the
+        caller holding ``<key>:lock`` recomputes. Others poll for up to
+        ``lock_wait`` seconds before computing it themselves.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        lock_key = f"{key}:lock"
+        if self.add(lock_key, 1, self.lock_timeout):
+            try:
+                value = compute()
+                self.set(key, value, timeout)
+            finally:
+                self.delete(lock_key)
+            return value
+        self.stats["lock_waits"] += 1
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(self.lock_poll_interval)
+            value = self.backend.get(self.key(key), _MISSING)
+            if value is not _MISSING:
+                return value
+        return compute()
+
+
+_namespaces: dict[tuple[str, str], NamespacedCache] = {}
+_namespaces_lock = threading.Lock()
+
+
+def get_cache(namespace: str, alias: str = "default") -> NamespacedCache:
+    """Return the shared ``NamespacedCache`` for ``namespace`` (e.g. ``"property"``)."""
+    with _namespaces_lock:
+        if (namespace, alias) not in _namespaces:
+            _namespaces[(namespace, alias)] = NamespacedCache(namespace, alias)
+        return _namespaces[(namespace, alias)]
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of this process, per tier and per namespace."""
+    stats = {"namespaces": {}}
+    backend = caches["default"]
+    if isinstance(backend, TieredCache):
+        stats["tiers"] = dict(backend.stats)
+    for (namespace, alias), ns_cache in _namespaces.items():
+        stats["namespaces"][f"{alias}:{namespace}"] = dict(ns_cache.stats)
+    return stats
@@ -0,0 +1,124 @@
+"""
+Denormalised row counts.
+
+``track(BuyerLead, "property", "lead_count")`` keeps ``Property.lead_count``
+equal to the number of ``BuyerLead`` rows pointing at each property. Creating
+or deleting a tracked row issues one ``UPDATE ... SET lead_count =
+lead_count ± 1`` on the parent from its ``post_save`` / ``post_delete``
+handler. The handlers run on the writer's connection, so the counter commits
+or rolls back together with the row as long as the write is in a
+transaction. ``Model.delete()``, queryset deletes and ``get_or_create`` open
+one themselves; wrap a plain ``create()`` in ``transaction.atomic()``.
+
+Queryset ``update()`` / ``bulk_create()`` and changing a tracked foreign key
+send no signals. ``recount`` (and the ``repair_counters`` command) rebuilds
+a counter from the child table in a single ``UPDATE``. Models holding
+counters use ``CounterFieldsMixin`` so that a full ``save()`` of a stale
+instance doesn't overwrite them.
+"""
+from dataclasses import dataclass
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save
+
+
+@dataclass(frozen=True)
+class Counter:
+    child: type
+    fk: str
+    field: str
+
+    @property
+    def parent(self) -> type:
+        return self.child._meta.get_field(self.fk).related_model
+
+    @property
+    def label(self) -> str:
+        return f"{self.parent._meta.label}.{self.field}"
+
+
+_counters: list[Counter] = []
+
+
+def counters() -> list[Counter]:
+    """Every counter registered with ``track`` (all apps are loaded by then)."""
+    return list(_counters)
+
+
+def bump(parent, pk, field: str, delta: int, using: str = DEFAULT_DB_ALIAS) -> None:
+    if pk is None:
+        return
+    # Never below zero, so a counter that has drifted low can't fail the write.
+    value = F(field) + delta if delta > 0 else Greatest(F(field) + delta, Value(0))
+    parent._default_manager.using(using).filter(pk=pk).update(**{field: value})
+
+
+def track(child, fk: str, field: str) -> Counter:
+    """Maintain ``field`` on the model ``child.<fk>`` points at."""
+    counter = Counter(child, fk, field)
+    attname = child._meta.get_field(fk).attname
+
+    def added(sender, instance, created: bool, raw: bool = False, using: str = DEFAULT_DB_ALIAS, **kwargs):
+        if created and not raw:
+            bump(counter.parent, getattr(instance, attname), field, 1, using)
+
+    def removed(sender, instance, using: str = DEFAULT_DB_ALIAS, **kwargs):
+        bump(counter.parent, getattr(instance, attname), field, -1, using)
+
+    uid = f"counter:{counter.label}"
+    post_save.connect(added, sender=child, weak=False, dispatch_uid=uid)
+    post_delete.connect(removed, sender=child, weak=False, dispatch_uid=uid)
+    if counter not in _counters:
+        _counters.append(counter)
+    return counter
+
+
+class CounterFieldsMixin:
+    """
+    Leave ``COUNTER_FIELDS`` out of ordinary saves of existing rows, so an
+    instance loaded before an increment can't write the old count back.
+    """
+
+    COUNTER_FIELDS: tuple[str, ...] = ()
+
+    def save(self, *args, **kwargs):
+        if not args and not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS and f.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+def _counts(child, fk: str):
+    return Subquery(
+        child._default_manager.filter(**{fk: OuterRef("pk")})
+        .order_by()
+        .values(fk)
+        .annotate(n=Count("pk"))
+        .values("n"),
+        output_field=IntegerField(),
+    )
+
+
+def recount(parent, field: str, child, fk: str, queryset=None) -> int:
+    """
+    Set ``field`` from a ``COUNT(*)`` of ``child`` rows, in one ``UPDATE``
+    over ``queryset`` (default: every parent row). Works with historical
+    models, so migrations can backfill with it. Returns the rows updated.
+    """
+    queryset = parent._default_manager.all() if queryset is None else queryset
+    return queryset.update(**{field: Coalesce(_counts(child, fk), 0)})
+
+
+def drifted(counter: Counter, using: str = DEFAULT_DB_ALIAS):
+    """Parent rows whose stored count differs from the child table."""
+    return (
+        counter.parent._default_manager.using(using)
+        .annotate(actual=Coalesce(_counts(counter.child, counter.fk), 0))
+        .exclude(**{counter.field: F("actual")})
+    )
@@ -0,0 +1,156 @@
+"""
+Database backends with connection accounting and a per-process cap.
+
+Django already keeps a connection per thread for ``CONN_MAX_AGE`` seconds and
+pings it before reuse when ``CONN_HEALTH_CHECKS`` is on. ``PooledConnectionMixin``
+adds what that lacks when sizing a deployment:
+
+* a cap of ``POOL_SIZE`` open connections per process and alias (0 = no cap).
+  A thread that needs a connection beyond the cap waits up to
+  ``POOL_TIMEOUT`` seconds. A thread finishing a request gives its connection
+  back instead of keeping it idle whenever another thread is waiting;
+* counters, exposed by ``db_stats()``: connections opened and the time spent
+  opening them, how often a request reused an open connection, failed health
+  checks, pool waits, and current / peak open connections.
+
+``POOL_SIZE`` and ``POOL_TIMEOUT`` are read from the ``DATABASES`` entry.
+"""
+import threading
+import time
+import weakref
+from collections import Counter
+
+from django.db import OperationalError, connections
+
+_pools: dict[str, "_Pool"] = {}
+_pools_lock = threading.Lock()
+
+
+class _Pool:
+    def __init__(self, alias: str, size: int, timeout: float):
+        self.alias = alias
+        self.size = size
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        self.open = 0
+        self.waiting = 0
+        self.stats = Counter()
+        self.connect_seconds_max = 0.0
+
+    def acquire(self) -> None:
+        with self.condition:
+            if self.size and self.open >= self.size:
+                self.waiting += 1
+                self.stats["pool_waits"] += 1
+                started = time.monotonic()
+                try:
+                    if not self.condition.wait_for(lambda: self.open < self.size, self.timeout):
+                        self.stats["pool_timeouts"] += 1
+                        raise OperationalError(
+                            f"No {self.alias!r} database connection free after {self.timeout}s "
+                            f"(POOL_SIZE={self.size})."
+                        )
+                finally:
+                    self.waiting -= 1
+                    self.stats["pool_wait_ms"] += int((time.monotonic() - started) * 1000)
+            self.open += 1
+            self.stats["peak_open"] = max(self.stats["peak_open"], self.open)
+
+    def release(self) -> None:
+        with self.condition:
+            self.open -= 1
+            self.condition.notify()
+
+    def record_connect(self, seconds: float) -> None:
+        with self.condition:
+            self.stats["connects"] += 1
+            self.stats["connect_ms"] += int(seconds * 1000)
+            self.connect_seconds_max = max(self.connect_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self.condition:
+            stats = dict(self.stats)
+            checkouts = stats.get("connects", 0) + stats.get("reused", 0)
+            stats.update(
+                open=self.open,
+                waiting=self.waiting,
+                pool_size=self.size,
+                connect_ms_max=round(self.connect_seconds_max * 1000, 1),
+                connect_ms_avg=round(stats.get("connect_ms", 0) / stats["connects"], 1) if stats.get("connects") else None,
+                reuse_rate=round(stats.get("reused", 0) / checkouts, 3) if checkouts else None,
+            )
+        return stats
+
+
+def _pool_for(alias: str, settings_dict: dict) -> _Pool:
+    with _pools_lock:
+        if alias not in _pools:
+            _pools[alias] = _Pool(alias, settings_dict.get("POOL_SIZE", 0), settings_dict.get("POOL_TIMEOUT", 10))
+        return _pools[alias]
+
+
+class PooledConnectionMixin:
+    """Mixed into a backend's ``DatabaseWrapper``; see the module docstring."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = _pool_for(self.alias, self.settings_dict)
+        # Gives the slot back if the wrapper is discarded with the thread that owned it.
+        self._slot = None
+        self._checked_out = False
+
+    def get_new_connection(self, conn_params):
+        self.pool.acquire()
+        started = time.perf_counter()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Exception:
+            self.pool.release()
+            raise
+        self.pool.record_connect(time.perf_counter() - started)
+        self._slot = weakref.finalize(self, self.pool.release)
+        return connection
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            if self._slot is not None:
+                self._slot()
+                self._slot = None
+
+    def ensure_connection(self):
+        # The first use in each request either reuses the open connection or opens one.
+        if not self._checked_out:
+            self._checked_out = True
+            if self.connection is not None:
+                self.pool.stats["reused"] += 1
+        super().ensure_connection()
+
+    def close_if_health_check_failed(self):
+        was_open = self.connection is not None
+        super().close_if_health_check_failed()
+        if was_open and self.connection is None:
+            self.pool.stats["health_check_failures"] += 1
+
+    def close_if_unusable_or_obsolete(self):
+        # Runs when a request starts and when it finishes.
+        self._checked_out = False
+        super().close_if_unusable_or_obsolete()
+        if self.connection is not None and self.pool.waiting and not self.in_atomic_block:
+            self.close()
+
+
+def db_stats() -> dict:
+    """Connection counters of this process, per database alias."""
+    stats = {}
+    for alias in connections:
+        settings_dict = connections.settings[alias]
+        pool = _pools.get(alias)
+        stats[alias] = {
+            "engine": settings_dict["ENGINE"],
+            "conn_max_age": settings_dict["CONN_MAX_AGE"],
+            "conn_health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+            **(pool.snapshot() if pool else {}),
+        }
+    return stats
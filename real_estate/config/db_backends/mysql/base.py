@@ -0,0 +1,7 @@
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+from config.db_backends import PooledConnectionMixin
+
+
+class DatabaseWrapper(PooledConnectionMixin, MySQLDatabaseWrapper):
+    pass
@@ -0,0 +1,146 @@
+"""
+SQLite tuned for serving traffic (``SQLITE_PROFILE=performance``).
+
+* ``PRAGMAS`` from the ``DATABASES`` entry run on every new connection
+  (WAL journaling so readers don't block the writer, ``synchronous=NORMAL``,
+  a memory map, ...). The busy timeout comes from ``OPTIONS["timeout"]``.
+* ``atomic()`` opens ``BEGIN IMMEDIATE`` instead of a deferred ``BEGIN``. A
+  deferred transaction that reads and then writes can't wait for the lock
+  and fails with "database is locked" at once; an immediate one waits out
+  the busy timeout like any other writer.
+* Writers in the process queue up, first come first served, for a single
+  write slot per database file: a transaction holds it from ``BEGIN`` to
+  ``COMMIT``/``ROLLBACK``, an autocommit write for its one statement. Bursts
+  then wait in Python instead of spinning in SQLite's busy handler, and only
+  writers from other processes contend for the file lock.
+"""
+import re
+import threading
+import time
+from collections import deque
+
+from django.db import OperationalError
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.db.backends.sqlite3.base import SQLiteCursorWrapper
+
+from config.db_backends import PooledConnectionMixin
+
+WRITE_RE = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+
+
+class WriteQueue:
+    """One write slot, handed to waiters in arrival order."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._busy = False
+        self._waiters = deque()
+
+    def acquire(self, timeout: float) -> bool:
+        with self._condition:
+            if not self._busy and not self._waiters:
+                self._busy = True
+                return True
+            me = object()
+            self._waiters.append(me)
+            if not self._condition.wait_for(lambda: not self._busy and self._waiters[0] is me, timeout):
+                self._waiters.remove(me)
+                self._condition.notify_all()
+                return False
+            self._waiters.popleft()
+            self._busy = True
+            return True
+
+    def release(self) -> None:
+        with self._condition:
+            self._busy = False
+            self._condition.notify_all()
+
+
+_queues: dict[str, WriteQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def _queue_for(name: str) -> WriteQueue:
+    with _queues_lock:
+        return _queues.setdefault(name, WriteQueue())
+
+
+class QueuedCursorWrapper(SQLiteCursorWrapper):
+    def __init__(self, connection, wrapper):
+        super().__init__(connection)
+        self.wrapper = wrapper
+
+    def _run(self, method, query, params):
+        if self.wrapper.holds_write_slot or not WRITE_RE.match(query):
+            return method(query, params)
+        self.wrapper.acquire_write_slot()
+        try:
+            return method(query, params)
+        finally:
+            self.wrapper.release_write_slot()
+
+    def execute(self, query, params=None):
+        return self._run(super().execute, query, params)
+
+    def executemany(self, query, param_list):
+        return self._run(super().executemany, query, param_list)
+
+
+class DatabaseWrapper(PooledConnectionMixin, SQLiteDatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_queue = _queue_for(str(self.settings_dict["NAME"]))
+        self.holds_write_slot = False
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for pragma, value in self.settings_dict.get("PRAGMAS", {}).items():
+            connection.execute(f"PRAGMA {pragma} = {value}")
+        return connection
+
+    def create_cursor(self, name=None):
+        return self.connection.cursor(factory=lambda connection: QueuedCursorWrapper(connection, self))
+
+    def acquire_write_slot(self) -> None:
+        timeout = self.settings_dict["OPTIONS"].get("timeout", 5)
+        started = time.monotonic()
+        if not self.write_queue.acquire(timeout):
+            self.pool.stats["write_timeouts"] += 1
+            raise OperationalError(f"database is locked (no write slot after {timeout}s)")
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self.pool.stats["write_waits"] += 1
+            self.pool.stats["write_wait_ms"] += int(waited * 1000)
+        self.holds_write_slot = True
+
+    def release_write_slot(self) -> None:
+        if self.holds_write_slot:
+            self.holds_write_slot = False
+            self.write_queue.release()
+
+    def _start_transaction_under_autocommit(self):
+        self.acquire_write_slot()
+        try:
+            self.cursor().execute("BEGIN IMMEDIATE")
+        except Exception:
+            self.release_write_slot()
+            raise
+
+    def _commit(self):
+        try:
+            super()._commit()
+        finally:
+            self.release_write_slot()
+
+    def _rollback(self):
+        try:
+            super()._rollback()
+        finally:
+            self.release_write_slot()
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            self.release_write_slot()
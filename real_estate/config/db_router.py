@@ -0,0 +1,139 @@
+"""
+Read-replica routing.
+
+Every query goes to ``default`` unless the code running it opted in with
+``replica_reads()`` (the public listing, search and analytics views do).
+Even then the primary is used when any of these hold:
+
+* the request is pinned. Unsafe methods are always pinned, and so is a
+  request carrying the ``REPLICA_PIN_COOKIE`` that ``ReplicaRoutingMiddleware``
+  sets for ``REPLICA_PIN_SECONDS`` after any request that wrote. A seller who
+  has just edited a listing or paid therefore reads their own writes while
+  the replicas catch up;
+* the request has already written, or ``default`` is inside a transaction.
+
+A request reads from a single replica, chosen at random from
+``DATABASE_REPLICAS``, so its queries see one consistent snapshot. Outside a
+request (shell, management commands) nothing is routed to a replica unless
+wrapped in ``replica_reads()``.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@dataclass
+class _State:
+    pinned: bool = False
+    replica_ok: bool = False
+    wrote: bool = False
+    replica: str | None = None
+
+
+_state: ContextVar[_State | None] = ContextVar("db_routing_state", default=None)
+
+
+@contextmanager
+def replica_reads():
+    """Let reads inside the block use a replica (unless the request is pinned)."""
+    state, token = _state.get(), None
+    if state is None:
+        state = _State()
+        token = _state.set(state)
+    previous, state.replica_ok = state.replica_ok, True
+    try:
+        yield
+    finally:
+        state.replica_ok = previous
+        if token is not None:
+            _state.reset(token)
+
+
+def use_replica(view):
+    """View decorator form of ``replica_reads``."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return view(*args, **kwargs)
+
+    return wrapper
+
+
+def allow_replica_reads() -> None:
+    """Opt the rest of the current request in (for DRF actions chosen in ``initial``)."""
+    state = _state.get()
+    if state is not None:
+        state.replica_ok = True
+
+
+class ReplicaRouter:
+    def _replicas(self) -> list[str]:
+        return getattr(settings, "DATABASE_REPLICAS", [])
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        replicas = self._replicas()
+        if (
+            state is None
+            or not replicas
+            or not state.replica_ok
+            or state.pinned
+            or state.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        if state.replica is None:
+            state.replica = random.choice(replicas)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *self._replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema and rows from the primary.
+        if db in self._replicas():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Scope routing state to each request and keep writers on the primary for a while."""
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        cookie = settings.REPLICA_PIN_COOKIE
+        state = _State(pinned=request.method not in self.SAFE_METHODS or cookie in request.COOKIES)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            response.set_cookie(
+                cookie,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
@@ -0,0 +1,178 @@
+"""
+Responses for collected static files and uploaded media.
+
+Ideally the front-end server sends both directories itself. When requests
+do reach Django:
+
+* ``serve_static`` serves ``STATIC_ROOT``. It picks the pre-built ``.br`` /
+  ``.gz`` sibling the client accepts (see ``config.storage``) and marks
+  manifest-hashed names cacheable for a year.
+* ``serve_media`` serves ``MEDIA_ROOT`` with conditional requests and single
+  byte ranges (video seeking). Whole files and open-ended ranges are handed
+  to the WSGI server's ``wsgi.file_wrapper``, which gunicorn sends with
+  ``sendfile()``. With ``MEDIA_SERVE_MODE`` set to ``"x-accel-redirect"``
+  (nginx) or ``"x-sendfile"`` (Apache), the worker only checks the path and
+  leaves the transfer to the front-end server.
+"""
+import mimetypes
+import re
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.contrib.staticfiles.views import serve as finders_serve
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+from .storage import ENCODINGS
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _BoundedReader:
+    """The next ``length`` bytes of ``file``, for ranges that stop short of EOF."""
+
+    def __init__(self, file, length: int):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _resolve(root, path: str) -> Path:
+    root = Path(root).resolve()
+    target = (root / path).resolve()
+    if not target.is_relative_to(root) or not target.is_file():
+        raise Http404("File not found.")
+    return target
+
+
+def _parse_range(header: str, size: int):
+    """``(start, end)`` (inclusive) for a single satisfiable range, ``None`` to send
+    everything, or ``False`` when unsatisfiable."""
+    match = _RANGE_RE.match(header.replace(" ", ""))
+    if match is None:
+        # Multiple or malformed ranges: a full response is always allowed.
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            return False
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        # A syntactically invalid range is ignored, not refused (RFC 9110 14.2).
+        return None
+    if start >= size:
+        return False
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def file_response(request, path: Path, cache_control: str, content_type: str | None = None, encoding: str = ""):
+    stat = path.stat()
+    etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+    last_modified = http_date(stat.st_mtime)
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if (if_none_match is not None and etag in if_none_match) or (
+        if_none_match is None and not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime)
+    ):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        return response
+
+    content_type = content_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    byte_range = None
+    if "HTTP_RANGE" in request.META and request.META.get("HTTP_IF_RANGE", etag) in (etag, last_modified):
+        byte_range = _parse_range(request.META["HTTP_RANGE"], stat.st_size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.st_size}"
+        return response
+
+    file = path.open("rb")
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        length = end - start + 1
+        # Open-ended ranges keep the real file so the server can still sendfile() it.
+        body = file if end == stat.st_size - 1 else _BoundedReader(file, length)
+        response = FileResponse(body, content_type=content_type, status=206)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Content-Length"] = str(length)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    response["Cache-Control"] = cache_control
+    if encoding:
+        response["Content-Encoding"] = encoding
+    return response
+
+
+@lru_cache(maxsize=1)
+def _hashed_names() -> frozenset:
+    return frozenset(getattr(staticfiles_storage, "hashed_files", {}).values())
+
+
+def _accepted_encodings(request) -> set[str]:
+    accepted = set()
+    for part in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding and params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.lower())
+    return accepted
+
+
+@require_safe
+def serve_static(request, path: str):
+    if settings.DEBUG:
+        # Straight from the app/STATICFILES_DIRS sources, no collectstatic needed.
+        return finders_serve(request, path, insecure=True)
+    target = _resolve(settings.STATIC_ROOT, path)
+    cache_control = IMMUTABLE if path in _hashed_names() else "public, max-age=300"
+    content_type = mimetypes.guess_type(target.name)[0]
+    siblings = [
+        (encoding, target.with_name(target.name + suffix))
+        for encoding, suffix in ENCODINGS
+        if target.with_name(target.name + suffix).is_file()
+    ]
+    accepted = _accepted_encodings(request)
+    encoding, source = next(((e, p) for e, p in siblings if e in accepted), ("", target))
+    response = file_response(request, source, cache_control, content_type, encoding)
+    if siblings:
+        response["Vary"] = "Accept-Encoding"
+    return response
+
+
+@require_safe
+def serve_media(request, path: str):
+    target = _resolve(settings.MEDIA_ROOT, path)
+    cache_control = f"public, max-age={settings.MEDIA_CACHE_SECONDS}"
+    mode = settings.MEDIA_SERVE_MODE
+    if mode == "django":
+        return file_response(request, target, cache_control)
+    response = HttpResponse(content_type=mimetypes.guess_type(target.name)[0] or "application/octet-stream")
+    if mode == "x-accel-redirect":
+        relative = target.relative_to(Path(settings.MEDIA_ROOT).resolve()).as_posix()
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + quote(relative)
+    elif mode == "x-sendfile":
+        response["X-Sendfile"] = str(target)
+    else:
+        raise ValueError(f"Unknown MEDIA_SERVE_MODE {mode!r}")
+    response["Cache-Control"] = cache_control
+    return response
@@ -33,6 +33,8 @@ INSTALLED_APPS = [
     "apps.wishlist.apps.WishlistConfig",
     "apps.enquiries.apps.EnquiriesConfig",
     "apps.dashboard.apps.DashboardConfig",
+    "apps.geocoding.apps.GeocodingConfig",
+    "apps.notifications.apps.NotificationsConfig",
     # legacy apps (kept temporarily so existing pages still run)
     "accounts",
     "property",
@@ -42,6 +44,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "config.db_router.ReplicaRoutingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -76,7 +79,8 @@ _db_engine = os.environ.get("DB_ENGINE", "").strip()
 if _db_engine == "mysql" or _db_engine == "django.db.backends.mysql":
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.mysql",
+            # django.db.backends.mysql plus connection metrics and a per-process cap.
+            "ENGINE": "config.db_backends.mysql",
             "NAME": os.environ.get("DB_NAME", "real_estate_db"),
             "USER": os.environ.get("DB_USER", "root"),
             "PASSWORD": os.environ.get("DB_PASSWORD", ""),
@@ -85,7 +89,16 @@ if _db_engine == "mysql" or _db_engine == "django.db.backends.mysql":
             "OPTIONS": {
                 "charset": "utf8mb4",
                 "init_command": "SET sql_mode='STRICT_TRANS_TABLES'",
+                "connect_timeout": int(os.environ.get("DB_CONNECT_TIMEOUT", "5")),
             },
+            # Keep each thread's connection for this many seconds (its maximum lifetime;
+            # keep it below MySQL's wait_timeout) and ping it before reusing it.
+            "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "300")),
+            "CONN_HEALTH_CHECKS": os.environ.get("DB_CONN_HEALTH_CHECKS", "1") == "1",
+            # Open connections per worker process (0 = one per thread, uncapped) and how
+            # long a thread waits for one. Size against /api/admin/db/ peak_open / pool_waits.
+            "POOL_SIZE": int(os.environ.get("DB_POOL_SIZE", "0")),
+            "POOL_TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
         }
     }
 else:
@@ -98,6 +111,73 @@ else:
             "NAME": os.environ.get("DB_NAME", str(BASE_DIR / "db_core.sqlite3")),
         }
     }
+    # Opt-in profile for deployments serving traffic from SQLite (config.db_backends.sqlite3):
+    # WAL, relaxed fsync, memory-mapped reads, a busy timeout, BEGIN IMMEDIATE and one
+    # queued writer per process.
+    if os.environ.get("SQLITE_PROFILE", "") == "performance":
+        DATABASES["default"].update(
+            ENGINE="config.db_backends.sqlite3",
+            OPTIONS={"timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", "20"))},
+            PRAGMAS={
+                "journal_mode": "WAL",
+                "synchronous": "NORMAL",
+                "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+                "temp_store": "MEMORY",
+                "cache_size": -20000,  # KiB
+            },
+        )
+
+# Read replicas: DB_REPLICAS lists copies of "default" (SQLite file paths, or MySQL
+# host[:port]s using the same credentials) as "replica1", "replica2", ... Only reads that
+# opt in via config.db_router.replica_reads() use them. Django never migrates or writes
+# them; for local testing snapshot the SQLite file, e.g.
+# `sqlite3 db_core.sqlite3 ".backup replica.sqlite3"`.
+DATABASE_REPLICAS = []
+for _index, _replica in enumerate(filter(None, map(str.strip, os.environ.get("DB_REPLICAS", "").split(","))), 1):
+    _config = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    if "sqlite3" in _config["ENGINE"]:
+        _config["NAME"] = _replica
+    else:
+        _host, _, _port = _replica.partition(":")
+        _config.update(HOST=_host, PORT=_port or _config["PORT"])
+    DATABASES[f"replica{_index}"] = _config
+    DATABASE_REPLICAS.append(f"replica{_index}")
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+# After a request writes, the client reads from the primary for this long (read-your-writes).
+REPLICA_PIN_COOKIE = "db_pin"
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "15"))
+
+# Cache configuration
+# "default" is a per-process LRU in front of the "shared" tier. Point CACHE_URL at
+# redis://host:port/db (or any Redis-compatible server) or memcached://host:port to
+# share entries between workers; without it the shared tier is process-local.
+_cache_url = os.environ.get("CACHE_URL", "").strip()
+if _cache_url.startswith(("redis://", "rediss://", "unix://")):
+    _shared_cache = {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": _cache_url}
+elif _cache_url.startswith("memcached://"):
+    _shared_cache = {
+        "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+        "LOCATION": _cache_url.removeprefix("memcached://"),
+    }
+else:
+    _shared_cache = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "shared"}
+
+CACHES = {
+    "default": {
+        "BACKEND": "config.cache.TieredCache",
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", "300")),
+        "OPTIONS": {
+            "SHARED_ALIAS": "shared",
+            "LOCAL_MAX_ENTRIES": int(os.environ.get("CACHE_LOCAL_MAX_ENTRIES", "1024")),
+            "LOCAL_TIMEOUT": int(os.environ.get("CACHE_LOCAL_TIMEOUT", "5")),
+        },
+    },
+    "shared": {
+        **_shared_cache,
+        "KEY_PREFIX": os.environ.get("CACHE_KEY_PREFIX", "real_estate"),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", "300")),
+    },
+}
 
 AUTH_USER_MODEL = "core_accounts.User"
 
@@ -119,6 +199,12 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# How config.serving hands out media: "django" streams it from the worker (ranges,
+# sendfile via wsgi.file_wrapper); "x-accel-redirect" (nginx, internal location at
+# MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT) or "x-sendfile" (Apache) only emit a header.
+MEDIA_SERVE_MODE = os.environ.get("MEDIA_SERVE_MODE", "django")
+MEDIA_ACCEL_PREFIX = os.environ.get("MEDIA_ACCEL_PREFIX", "/protected-media/")
+MEDIA_CACHE_SECONDS = int(os.environ.get("MEDIA_CACHE_SECONDS", str(24 * 60 * 60)))
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -143,6 +229,7 @@ REST_FRAMEWORK = {
         "user": "1000/hour",
         "login": "10/min",
         "enquiry": "30/hour",
+        "geocode": "60/min",
     },
 }
 
@@ -178,10 +265,49 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp"]
 ALLOWED_VIDEO_EXTENSIONS = [".mp4", ".webm"]
+# Chunked media uploads (api/media-uploads/): part files live here until complete.
+MEDIA_UPLOAD_DIR = os.environ.get("MEDIA_UPLOAD_DIR", str(BASE_DIR / "tmp" / "uploads"))
+MEDIA_UPLOAD_MAX_CHUNK_SIZE = int(os.environ.get("MEDIA_UPLOAD_MAX_CHUNK_SIZE", str(8 * 1024 * 1024)))
+# Threads per process resizing uploaded photos into WebP/JPEG variants; 0 runs inline on commit.
+IMAGE_VARIANT_WORKERS = int(os.environ.get("IMAGE_VARIANT_WORKERS", "2"))
+
+# Property listing search & pagination
+# "auto" picks FTS5 (SQLite) / FULLTEXT (MySQL); "like" forces the icontains scan.
+PROPERTY_SEARCH_BACKEND = os.environ.get("PROPERTY_SEARCH_BACKEND", "auto")
+# "cursor" (keyset) or "page" (numbered pages with COUNT/OFFSET) for the legacy list.
+PROPERTY_LIST_PAGINATION = os.environ.get("PROPERTY_LIST_PAGINATION", "cursor")
+# Rendered detail pages are versioned by updated_at, so this only bounds memory use.
+PROPERTY_DETAIL_CACHE_TIMEOUT = int(os.environ.get("PROPERTY_DETAIL_CACHE_TIMEOUT", "3600"))
+
+# Lead email verification codes: "auto" (cache when the shared tier is Redis/Memcached,
+# database otherwise), "cache" or "db".
+LEAD_OTP_STORE = os.environ.get("LEAD_OTP_STORE", "auto")
+
+# Admin analytics rollups (manage.py refresh_analytics). Hourly rows older than this are
+# dropped; daily rows are kept for good.
+ANALYTICS_HOURLY_RETENTION_DAYS = int(os.environ.get("ANALYTICS_HOURLY_RETENTION_DAYS", "14"))
+
+# Geocoding (property form location search)
+# Dotted path of the remote fallback provider; empty disables remote lookups.
+GEOCODING_PROVIDER = os.environ.get("GEOCODING_PROVIDER", "apps.geocoding.providers.NominatimProvider")
+GEOCODING_PROVIDER_URL = os.environ.get("GEOCODING_PROVIDER_URL", "https://nominatim.openstreetmap.org/search")
+GEOCODING_PROVIDER_TIMEOUT = int(os.environ.get("GEOCODING_PROVIDER_TIMEOUT", "5"))
+GEOCODING_CACHE_TTL = int(os.environ.get("GEOCODING_CACHE_TTL", str(30 * 24 * 60 * 60)))
+# Failed remote lookups are remembered as "no results" for this long.
+GEOCODING_NEGATIVE_CACHE_TTL = int(os.environ.get("GEOCODING_NEGATIVE_CACHE_TTL", str(5 * 60)))
 
 # Razorpay (legacy feature)
 RAZORPAY_KEY_ID = os.environ.get("RAZORPAY_KEY_ID", "rzp_test_SOKCZwCOuqwdRA")
 RAZORPAY_KEY_SECRET = os.environ.get("RAZORPAY_KEY_SECRET", "K6f8YFpejnkbdTARp8MuqjlI")
+# Empty uses the real API; point at `manage.py fake_razorpay` (http://127.0.0.1:8765) locally.
+RAZORPAY_BASE_URL = os.environ.get("RAZORPAY_BASE_URL", "")
+RAZORPAY_CONNECT_TIMEOUT = float(os.environ.get("RAZORPAY_CONNECT_TIMEOUT", "3.05"))
+RAZORPAY_READ_TIMEOUT = float(os.environ.get("RAZORPAY_READ_TIMEOUT", "10"))
+RAZORPAY_POOL_SIZE = int(os.environ.get("RAZORPAY_POOL_SIZE", "10"))
+# Secret set on the Razorpay dashboard for payment/webhook/; empty disables the endpoint.
+RAZORPAY_WEBHOOK_SECRET = os.environ.get("RAZORPAY_WEBHOOK_SECRET", "")
+# A PENDING order for the same seller, property and amount is reused for this long.
+RAZORPAY_ORDER_REUSE_SECONDS = int(os.environ.get("RAZORPAY_ORDER_REUSE_SECONDS", str(24 * 60 * 60)))
 
 # Google OAuth (legacy seller login)
 GOOGLE_OAUTH_CLIENT_ID = os.environ.get("GOOGLE_OAUTH_CLIENT_ID", "")
@@ -0,0 +1,57 @@
+"""
+Static files storage for production.
+
+``CompressedManifestStaticFilesStorage`` is Django's manifest storage (every
+collected file also gets a content-hashed copy, and ``{% static %}`` emits the
+hashed name) that additionally writes ``.gz`` and, when the optional
+``brotli`` package is installed, ``.br`` siblings of text assets during
+``collectstatic``. ``config.serving.serve_static`` and a front-end server
+configured with ``gzip_static`` / ``brotli_static`` send those as-is, so
+nothing is compressed per request.
+"""
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip only
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".html", ".xml", ".ico"}
+# Smaller files gain nothing once headers and framing are counted.
+MIN_COMPRESS_SIZE = 256
+
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def _compressors():
+    yield ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", lambda data: brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in {*paths, *self.hashed_files.values()}:
+            if os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+                self._compress(name)
+
+    def _compress(self, name: str) -> None:
+        path = self.path(name)
+        with open(path, "rb") as source:
+            data = source.read()
+        for suffix, compress in _compressors():
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+            if len(data) < MIN_COMPRESS_SIZE:
+                continue
+            compressed = compress(data)
+            # Only keep a sibling that is meaningfully smaller.
+            if len(compressed) < len(data) * 0.95:
+                with open(path + suffix, "wb") as target:
+                    target.write(compressed)
@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from unittest import skipUnless
+
+from django.core.cache import caches
+from django.db import connection, connections, transaction
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import path
+
+from accounts.models import Seller
+
+from .cache import NamespacedCache
+from .db_router import ReplicaRouter, replica_reads, use_replica
+
+
+@use_replica
+def count_sellers(request):
+    return HttpResponse(str(Seller.objects.count()))
+
+
+def add_seller(request):
+    Seller.objects.create(name="New", email=f"new{Seller.objects.count()}@example.com", phone="1")
+    return HttpResponse(status=201)
+
+
+urlpatterns = [
+    path("sellers/", count_sellers),
+    path("sellers/add/", add_seller),
+]
+
+
+@skipUnless(connection.vendor == "sqlite", "the replica is a SQLite snapshot of the test database")
+@override_settings(DATABASE_REPLICAS=["replica1"], ROOT_URLCONF=__name__)
+class ReplicaRoutingTests(TransactionTestCase):
+    """``default`` plus ``replica1``, a second SQLite file snapshotted from it."""
+
+    def setUp(self):
+        Seller.objects.create(name="Seller", email="seller@example.com", phone="9000000000")
+        handle, replica_path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+        self.addCleanup(os.remove, replica_path)
+        connection.ensure_connection()
+        with sqlite3.connect(replica_path) as replica:
+            connection.connection.backup(replica)
+        connections.settings["replica1"] = {**connections.settings["default"], "NAME": replica_path}
+        self.addCleanup(connections.settings.pop, "replica1")
+        self.addCleanup(connections.__delitem__, "replica1")
+        self.addCleanup(lambda: connections["replica1"].close())
+        # Only the primary sees this one, so counts tell the two apart.
+        Seller.objects.create(name="Later", email="later@example.com", phone="9000000001")
+
+    def test_reads_stay_on_primary_unless_opted_in(self):
+        self.assertEqual(ReplicaRouter().db_for_read(Seller), "default")
+        self.assertEqual(Seller.objects.count(), 2)
+        with replica_reads():
+            self.assertEqual(Seller.objects.count(), 1)
+            self.assertEqual(Seller.objects.first()._state.db, "replica1")
+
+    def test_writes_go_to_primary_and_pin_the_rest_of_the_block(self):
+        with replica_reads():
+            self.assertEqual(ReplicaRouter().db_for_write(Seller), "default")
+            self.assertEqual(Seller.objects.count(), 2)
+
+    def test_transactions_read_the_primary(self):
+        with replica_reads(), transaction.atomic():
+            self.assertEqual(Seller.objects.count(), 2)
+
+    def test_writing_request_sets_pin_cookie_and_pinned_reads_use_primary(self):
+        self.assertEqual(self.client.get("/sellers/").content, b"1")
+        self.assertNotIn("db_pin", self.client.cookies)
+
+        response = self.client.post("/sellers/add/")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.cookies["db_pin"]["max-age"], 15)
+
+        self.assertEqual(self.client.get("/sellers/").content, b"3")
+        del self.client.cookies["db_pin"]
+        self.assertEqual(self.client.get("/sellers/").content, b"1")
+
+
+def _tiered(local_timeout: float) -> dict:
+    return {
+        "BACKEND": "config.cache.TieredCache",
+        "OPTIONS": {"SHARED_ALIAS": "shared", "LOCAL_TIMEOUT": local_timeout, "LOCAL_MAX_ENTRIES": 2},
+    }
+
+
+@override_settings(
+    CACHES={
+        # Two workers' in-process tiers in front of one shared LocMem "server".
+        "default": _tiered(0.2),
+        "other": _tiered(0.2),
+        "shared": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "config-tests"},
+    }
+)
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.worker, self.other = caches["default"], caches["other"]
+        for cache in (self.worker, self.other):
+            cache.clear()
+            cache.stats.clear()
+
+    def test_reads_fall_through_to_the_shared_tier(self):
+        self.worker.set("key", "value")
+        self.assertEqual(self.other.get("key"), "value")
+        self.assertEqual(self.other.stats["shared_hits"], 1)
+        self.assertEqual(self.other.get("key"), "value")
+        self.assertEqual(self.other.stats["local_hits"], 1)
+
+    def test_local_copies_expire_after_local_timeout(self):
+        self.worker.set("key", "old")
+        self.other.get("key")
+        self.worker.set("key", "new")
+        self.assertEqual(self.other.get("key"), "old")
+        time.sleep(0.25)
+        self.assertEqual(self.other.get("key"), "new")
+
+    def test_local_copy_never_outlives_the_entry(self):
+        self.worker.set("key", "value", timeout=0.1)
+        time.sleep(0.15)
+        self.assertIsNone(self.worker.get("key"))
+
+    def test_writes_and_deletes_reach_both_tiers(self):
+        self.worker.set("key", "value")
+        self.assertEqual(caches["shared"].get("key"), "value")
+        self.worker.delete("key")
+        self.assertIsNone(self.worker.get("key"))
+        self.assertIsNone(caches["shared"].get("key"))
+
+    def test_local_tier_is_bounded(self):
+        for n in range(3):
+            self.worker.set(f"key{n}", n)
+        caches["shared"].clear()
+        self.assertEqual([self.worker.get(f"key{n}") for n in range(3)], [None, 1, 2])
+
+    def test_namespaces_do_not_collide(self):
+        NamespacedCache("a").set("key", 1)
+        self.assertIsNone(NamespacedCache("b").get("key"))
+        self.assertEqual(caches["shared"].get("a:key"), 1)
+
+    def test_get_or_set_locked_computes_once_under_a_stampede(self):
+        ns_cache = NamespacedCache("stampede")
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        threads = [
+            threading.Thread(target=lambda: results.append(ns_cache.get_or_set_locked("key", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual((len(calls), results), (1, ["value"] * 5))
+        self.assertFalse(caches["shared"].has_key("stampede:key:lock"))
+
+    def test_waiter_computes_itself_once_the_lock_wait_runs_out(self):
+        ns_cache = NamespacedCache("stuck")
+        ns_cache.lock_wait = 0.1
+        ns_cache.add("key:lock", 1)  # a holder that died without finishing
+        self.assertEqual(ns_cache.get_or_set_locked("key", lambda: "value"), "value")
+        self.assertEqual(ns_cache.stats["lock_waits"], 1)
@@ -1,9 +1,13 @@
+import re
+from urllib.parse import urlsplit
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.shortcuts import render
 
+from config.serving import serve_media, serve_static
+
 from property.views import HomeView, PropertyCreateView
 from apps.dashboard.views import BuyerDashboardView, SellerDashboardView, AdminDashboardView
 
@@ -26,6 +30,7 @@ urlpatterns = [
     path("api/", include("apps.wishlist.urls")),
     path("api/", include("apps.enquiries.urls")),
     path("api/", include("apps.dashboard.urls")),
+    path("api/", include("apps.geocoding.urls")),
     # new frontend pages (API-based)
     path("auth/login/", lambda r: render_template(r, "auth/login_api.html"), name="auth_login"),
     path("auth/register/", lambda r: render_template(r, "auth/register_api.html"), name="auth_register"),
@@ -38,4 +43,7 @@ urlpatterns = [
     path("properties/", include("property.urls")),
 ]
 
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Static files and media, unless they live on another host (CDN / object storage).
+for url, view in ((settings.STATIC_URL, serve_static), (settings.MEDIA_URL, serve_media)):
+    if not urlsplit(url).netloc:
+        urlpatterns.append(re_path(rf"^{re.escape(url.lstrip('/'))}(?P<path>.+)$", view))
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class LeadsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "leads"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from leads.otp import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete expired lead verification codes and send-rate windows."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired rows."))
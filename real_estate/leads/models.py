@@ -19,4 +19,41 @@ class BuyerLead(models.Model):
         return f"{self.name} - {self.property_id}"
 
 
+class LeadOTP(models.Model):
+    """
+    Pending email verification for a lead; one row per (property, email).
+    Used by ``leads.otp.DatabaseOTPStore``.
+    """
 
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name="+")
+    email = models.EmailField()
+    code_hash = models.CharField(max_length=64)
+    name = models.CharField(max_length=100)
+    phone = models.CharField(max_length=15)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["property", "email"], name="unique_lead_otp"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.email} - {self.property_id}"
+
+
+class LeadOTPThrottle(models.Model):
+    """Codes sent to ``email`` in the fixed window starting at ``window_start``."""
+
+    email = models.EmailField()
+    window_start = models.DateTimeField(db_index=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["email", "window_start"], name="unique_lead_otp_throttle"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.email} @ {self.window_start}: {self.count}"
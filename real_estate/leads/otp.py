@@ -0,0 +1,273 @@
+"""
+Email verification codes for buyer leads.
+
+Challenges live in their own expiring store instead of the session:
+
+* ``CacheOTPStore``    - the shared cache tier; entries expire on their own.
+* ``DatabaseOTPStore`` - the ``LeadOTP``/``LeadOTPThrottle`` tables, swept by
+  ``manage.py purge_lead_otps``.
+
+``LEAD_OTP_STORE = "auto"`` (the default) uses the cache when the shared tier
+is Redis/Memcached and the database otherwise, since a local-memory cache is
+not shared between worker processes.
+
+Codes are stored as HMACs. Each (property, email) challenge allows
+``MAX_ATTEMPTS`` guesses, can be re-sent after ``RESEND_INTERVAL`` seconds,
+and each email may receive ``SENDS_PER_WINDOW`` codes per ``SEND_WINDOW``.
+A correct code is only accepted by the request whose ``consume`` removes the
+challenge, so two concurrent submissions can't both create a lead.
+"""
+import hashlib
+import hmac
+import secrets
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from config.cache import get_cache
+
+from .models import LeadOTP, LeadOTPThrottle
+
+CODE_TTL = 10 * 60
+MAX_ATTEMPTS = 5
+RESEND_INTERVAL = 30
+SEND_WINDOW = 60 * 60
+SENDS_PER_WINDOW = 5
+
+
+class OTPError(Exception):
+    message = "Verification failed."
+
+    def __init__(self, message: str | None = None, retry_after: int | None = None):
+        super().__init__(message or self.message)
+        self.message = message or self.message
+        self.retry_after = retry_after
+
+
+class OTPMissing(OTPError):
+    message = "OTP expired or missing. Please request a new code."
+
+
+class OTPExpired(OTPError):
+    message = "OTP has expired. Please request a new code."
+
+
+class OTPInvalid(OTPError):
+    message = "Invalid verification code."
+
+
+class OTPAttemptsExceeded(OTPError):
+    message = "Too many incorrect attempts. Please request a new code."
+
+
+class OTPRateLimited(OTPError):
+    message = "Too many verification codes requested. Please try again later."
+
+
+@dataclass
+class Challenge:
+    property_id: int
+    email: str
+    code_hash: str
+    name: str
+    phone: str
+    sent_at: datetime
+    expires_at: datetime
+    attempts: int = 0
+
+
+def hash_code(property_id: int, email: str, code: str) -> str:
+    message = f"{property_id}:{email}:{code}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+
+def _window_start(now: datetime) -> datetime:
+    return datetime.fromtimestamp(int(now.timestamp()) // SEND_WINDOW * SEND_WINDOW, tz=now.tzinfo)
+
+
+class CacheOTPStore:
+    def __init__(self):
+        self.cache = get_cache("leads", alias="shared")
+
+    @staticmethod
+    def _key(property_id: int, email: str) -> str:
+        return f"otp:{property_id}:{hashlib.sha1(email.encode()).hexdigest()}"
+
+    def load(self, property_id: int, email: str) -> Challenge | None:
+        key = self._key(property_id, email)
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        challenge = Challenge(**data)
+        challenge.attempts = self.cache.get(f"{key}:attempts", 0)
+        return challenge
+
+    def save(self, challenge: Challenge) -> None:
+        key = self._key(challenge.property_id, challenge.email)
+        ttl = max(1, int((challenge.expires_at - timezone.now()).total_seconds()))
+        self.cache.set(key, asdict(challenge), ttl)
+        self.cache.set(f"{key}:attempts", challenge.attempts, ttl)
+
+    def delete(self, property_id: int, email: str) -> None:
+        key = self._key(property_id, email)
+        self.cache.delete_many([key, f"{key}:attempts"])
+
+    def consume(self, challenge: Challenge) -> bool:
+        """Delete ``challenge``; False if another request got there first."""
+        key = self._key(challenge.property_id, challenge.email)
+        if not self.cache.delete(key):
+            return False
+        self.cache.delete(f"{key}:attempts")
+        return True
+
+    def add_attempt(self, challenge: Challenge) -> int:
+        key = f"{self._key(challenge.property_id, challenge.email)}:attempts"
+        try:
+            return self.cache.incr(key)
+        except ValueError:  # expired between load and now
+            return MAX_ATTEMPTS
+
+    def record_send(self, email: str, now: datetime) -> int:
+        key = f"otp:sends:{hashlib.sha1(email.encode()).hexdigest()}:{int(_window_start(now).timestamp())}"
+        self.cache.add(key, 0, SEND_WINDOW)
+        return self.cache.incr(key)
+
+    def purge_expired(self) -> int:
+        return 0
+
+
+class DatabaseOTPStore:
+    def load(self, property_id: int, email: str) -> Challenge | None:
+        row = LeadOTP.objects.filter(property_id=property_id, email=email).first()
+        if row is None:
+            return None
+        return Challenge(
+            property_id=row.property_id,
+            email=row.email,
+            code_hash=row.code_hash,
+            name=row.name,
+            phone=row.phone,
+            sent_at=row.sent_at,
+            expires_at=row.expires_at,
+            attempts=row.attempts,
+        )
+
+    def save(self, challenge: Challenge) -> None:
+        LeadOTP.objects.update_or_create(
+            property_id=challenge.property_id,
+            email=challenge.email,
+            defaults={
+                "code_hash": challenge.code_hash,
+                "name": challenge.name,
+                "phone": challenge.phone,
+                "sent_at": challenge.sent_at,
+                "expires_at": challenge.expires_at,
+                "attempts": challenge.attempts,
+            },
+        )
+
+    def delete(self, property_id: int, email: str) -> None:
+        LeadOTP.objects.filter(property_id=property_id, email=email).delete()
+
+    def consume(self, challenge: Challenge) -> bool:
+        """Delete ``challenge``; False if another request got there first."""
+        deleted, _ = LeadOTP.objects.filter(
+            property_id=challenge.property_id, email=challenge.email, code_hash=challenge.code_hash
+        ).delete()
+        return deleted > 0
+
+    def add_attempt(self, challenge: Challenge) -> int:
+        rows = LeadOTP.objects.filter(property_id=challenge.property_id, email=challenge.email)
+        rows.update(attempts=F("attempts") + 1)
+        return rows.values_list("attempts", flat=True).first() or MAX_ATTEMPTS
+
+    def record_send(self, email: str, now: datetime) -> int:
+        window_start = _window_start(now)
+        rows = LeadOTPThrottle.objects.filter(email=email, window_start=window_start)
+        if not rows.update(count=F("count") + 1):
+            try:
+                with transaction.atomic():
+                    LeadOTPThrottle.objects.create(email=email, window_start=window_start, count=1)
+            except IntegrityError:
+                rows.update(count=F("count") + 1)
+        return rows.values_list("count", flat=True).first() or 1
+
+    def purge_expired(self) -> int:
+        now = timezone.now()
+        challenges, _ = LeadOTP.objects.filter(expires_at__lte=now).delete()
+        windows, _ = LeadOTPThrottle.objects.filter(
+            window_start__lte=now - timedelta(seconds=SEND_WINDOW)
+        ).delete()
+        return challenges + windows
+
+
+def get_store():
+    choice = getattr(settings, "LEAD_OTP_STORE", "auto")
+    if choice == "auto":
+        choice = "db" if isinstance(caches["shared"], LocMemCache) else "cache"
+    return CacheOTPStore() if choice == "cache" else DatabaseOTPStore()
+
+
+def issue(property_id: int, email: str, name: str, phone: str) -> str:
+    """Create (or replace) the challenge for ``email`` and return the plain code."""
+    store = get_store()
+    now = timezone.now()
+    current = store.load(property_id, email)
+    if current is not None:
+        wait = RESEND_INTERVAL - int((now - current.sent_at).total_seconds())
+        if wait > 0:
+            raise OTPRateLimited(
+                f"Please wait {wait} seconds before requesting another code.", retry_after=wait
+            )
+    if store.record_send(email, now) > SENDS_PER_WINDOW:
+        retry_after = int((_window_start(now) + timedelta(seconds=SEND_WINDOW) - now).total_seconds())
+        raise OTPRateLimited(retry_after=max(retry_after, 1))
+    code = f"{secrets.randbelow(1_000_000):06d}"
+    store.save(
+        Challenge(
+            property_id=property_id,
+            email=email,
+            code_hash=hash_code(property_id, email, code),
+            name=name,
+            phone=phone,
+            sent_at=now,
+            expires_at=now + timedelta(seconds=CODE_TTL),
+        )
+    )
+    return code
+
+
+def verify(property_id: int, email: str, code: str) -> Challenge:
+    """
+    Check ``code`` and consume the challenge. Raises an ``OTPError`` subclass
+    carrying a user-facing message on failure.
+    """
+    store = get_store()
+    challenge = store.load(property_id, email)
+    if challenge is None:
+        raise OTPMissing()
+    if timezone.now() > challenge.expires_at:
+        store.delete(property_id, email)
+        raise OTPExpired()
+    if challenge.attempts >= MAX_ATTEMPTS:
+        store.delete(property_id, email)
+        raise OTPAttemptsExceeded()
+    if not hmac.compare_digest(challenge.code_hash, hash_code(property_id, email, code)):
+        if store.add_attempt(challenge) >= MAX_ATTEMPTS:
+            store.delete(property_id, email)
+            raise OTPAttemptsExceeded()
+        raise OTPInvalid()
+    if not store.consume(challenge):
+        raise OTPMissing()
+    return challenge
+
+
+def purge_expired() -> int:
+    """Bulk-delete expired rows; the cache store expires entries by itself."""
+    return DatabaseOTPStore().purge_expired()
@@ -0,0 +1,5 @@
+from config import counters
+
+from .models import BuyerLead
+
+counters.track(BuyerLead, "property", "lead_count")
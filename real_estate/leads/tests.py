@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from accounts.models import Seller
+from property.models import Property
+
+from . import otp
+
+EMAIL = "buyer@example.com"
+START = datetime(2026, 1, 1, 10, 0, tzinfo=dt_timezone.utc)
+
+
+class OTPStoreTestsMixin:
+    """Run against both stores; subclasses set ``LEAD_OTP_STORE``."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = Seller.objects.create(name="Seller", email="seller@example.com", phone="9000000000")
+        cls.listing = Property.objects.create(
+            seller=seller,
+            title="Flat",
+            category=Property.RESIDENTIAL,
+            subcategory="APARTMENT",
+            property_type="SELL",
+            price=100,
+            address="1 Main Road",
+            city="Pune",
+            state="Maharashtra",
+        )
+
+    def setUp(self):
+        caches["shared"].clear()
+        self.now = START
+        clock = mock.patch.object(otp.timezone, "now", lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def advance(self, seconds: int) -> None:
+        self.now += timedelta(seconds=seconds)
+
+    def issue(self) -> str:
+        return otp.issue(self.listing.pk, EMAIL, "Buyer", "9000000001")
+
+    def verify(self, code: str) -> otp.Challenge:
+        return otp.verify(self.listing.pk, EMAIL, code)
+
+    def wrong(self, code: str) -> str:
+        return f"{(int(code) + 1) % 1_000_000:06d}"
+
+    def test_code_verifies_once(self):
+        code = self.issue()
+        challenge = self.verify(code)
+        self.assertEqual((challenge.email, challenge.name, challenge.phone), (EMAIL, "Buyer", "9000000001"))
+        with self.assertRaises(otp.OTPMissing):
+            self.verify(code)
+
+    def test_resend_waits_for_the_interval(self):
+        self.issue()
+        self.advance(otp.RESEND_INTERVAL - 10)
+        with self.assertRaises(otp.OTPRateLimited) as raised:
+            self.issue()
+        self.assertEqual(raised.exception.retry_after, 10)
+        self.advance(10)
+        code = self.issue()
+        self.assertEqual(self.verify(code).email, EMAIL)
+
+    def test_sends_are_capped_per_window(self):
+        for _ in range(otp.SENDS_PER_WINDOW):
+            self.issue()
+            self.advance(otp.RESEND_INTERVAL)
+        with self.assertRaises(otp.OTPRateLimited) as raised:
+            self.issue()
+        elapsed = otp.SENDS_PER_WINDOW * otp.RESEND_INTERVAL
+        self.assertEqual(raised.exception.retry_after, otp.SEND_WINDOW - elapsed)
+        self.advance(otp.SEND_WINDOW)
+        self.issue()
+
+    def test_attempts_run_out(self):
+        code = self.issue()
+        for _ in range(otp.MAX_ATTEMPTS - 1):
+            with self.assertRaises(otp.OTPInvalid):
+                self.verify(self.wrong(code))
+        with self.assertRaises(otp.OTPAttemptsExceeded):
+            self.verify(self.wrong(code))
+        with self.assertRaises(otp.OTPMissing):
+            self.verify(code)
+
+    def test_code_expires(self):
+        code = self.issue()
+        self.advance(otp.CODE_TTL + 1)
+        with self.assertRaises(otp.OTPExpired):
+            self.verify(code)
+        with self.assertRaises(otp.OTPMissing):
+            self.verify(code)
+
+    def test_concurrent_correct_codes_pass_once(self):
+        code = self.issue()
+        store = otp.get_store()
+        # Both requests loaded the challenge before either consumed it.
+        loaded = store.load(self.listing.pk, EMAIL)
+        self.verify(code)
+        with mock.patch.object(type(store), "load", lambda *args: loaded), self.assertRaises(otp.OTPMissing):
+            self.verify(code)
+
+
+@override_settings(LEAD_OTP_STORE="db")
+class DatabaseOTPStoreTests(OTPStoreTestsMixin, TestCase):
+    def test_purge_removes_expired_rows(self):
+        self.issue()
+        self.advance(otp.SEND_WINDOW + 1)
+        self.assertEqual(otp.purge_expired(), 2)
+
+
+@override_settings(LEAD_OTP_STORE="cache")
+class CacheOTPStoreTests(OTPStoreTestsMixin, TestCase):
+    pass
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Payment
+from .models import Payment, WebhookEvent
 
 
 @admin.register(Payment)
@@ -10,3 +10,9 @@ class PaymentAdmin(admin.ModelAdmin):
     search_fields = ("seller__name", "seller__email", "property__title")
 
 
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ("event_id", "event", "order_id", "received_at", "processed_at", "outcome")
+    list_filter = ("event", "outcome")
+    search_fields = ("event_id", "order_id", "payment_id")
+    readonly_fields = ("event_id", "event", "order_id", "payment_id", "payload", "received_at")
@@ -0,0 +1,68 @@
+"""
+Process-wide Razorpay client.
+
+``razorpay.Client()`` builds a fresh ``requests.Session`` each time, so a
+client per request paid for a new TCP + TLS handshake on every order.
+``get_client()`` returns one client per process whose session keeps up to
+``RAZORPAY_POOL_SIZE`` connections alive, applies the connect/read timeouts to
+every call and talks to ``RAZORPAY_BASE_URL`` (point it at
+``manage.py fake_razorpay`` in development and tests).
+"""
+import threading
+
+from django.conf import settings
+
+try:
+    import razorpay
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:  # pragma: no cover - handled gracefully at runtime
+    razorpay = None
+
+_lock = threading.Lock()
+_client = None
+_client_config = None
+
+
+def _config() -> tuple:
+    return (
+        settings.RAZORPAY_KEY_ID,
+        settings.RAZORPAY_KEY_SECRET,
+        getattr(settings, "RAZORPAY_BASE_URL", ""),
+        (
+            getattr(settings, "RAZORPAY_CONNECT_TIMEOUT", 3.05),
+            getattr(settings, "RAZORPAY_READ_TIMEOUT", 10.0),
+        ),
+        getattr(settings, "RAZORPAY_POOL_SIZE", 10),
+    )
+
+
+def _build_client(key_id: str, key_secret: str, base_url: str, timeout: tuple, pool_size: int):
+    session = requests.Session()
+    send = session.request
+
+    def request(method, url, **kwargs):
+        kwargs.setdefault("timeout", timeout)
+        return send(method, url, **kwargs)
+
+    session.request = request
+    # Only failed connects are retried: the request never reached Razorpay, so
+    # replaying an order POST cannot create a duplicate.
+    retries = Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.2)
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    options = {"base_url": base_url.rstrip("/")} if base_url else {}
+    return razorpay.Client(session=session, auth=(key_id, key_secret), **options)
+
+
+def get_client():
+    """Return the shared client, rebuilding it if the Razorpay settings changed."""
+    global _client, _client_config
+    config = _config()
+    with _lock:
+        if _client is None or _client_config != config:
+            _client = _build_client(*config)
+            _client_config = config
+        return _client
@@ -0,0 +1,177 @@
+"""
+In-process stand-in for the Razorpay orders API.
+
+Start it with ``manage.py fake_razorpay`` (or ``FakeRazorpay()`` in a test)
+and set ``RAZORPAY_BASE_URL`` to its ``url``. It understands the calls the
+payment app makes:
+
+* ``POST /v1/orders``            - create an order
+* ``GET  /v1/orders/<id>``       - fetch an order
+* ``POST /v1/orders/<id>/pay``   - test-only: mark the order paid and return
+  the ``razorpay_*`` fields the checkout widget would post to the callback.
+
+Requests must carry the configured key id/secret as basic auth.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def sign(order_id: str, payment_id: str, key_secret: str) -> str:
+    """Signature Razorpay sends with a successful checkout."""
+    message = f"{order_id}|{payment_id}".encode()
+    return hmac.new(key_secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        if self.server.fake.verbose:
+            super().log_message(format, *args)
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, description: str) -> None:
+        self._reply(status, {"error": {"code": "BAD_REQUEST_ERROR", "description": description}})
+
+    def _authorized(self) -> bool:
+        fake = self.server.fake
+        expected = base64.b64encode(f"{fake.key_id}:{fake.key_secret}".encode()).decode()
+        return hmac.compare_digest(self.headers.get("Authorization", ""), f"Basic {expected}")
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw or b"{}")
+
+    def _route(self, method: str) -> None:
+        fake = self.server.fake
+        with fake.lock:
+            fake.request_count += 1
+            fake.connections.add(self.client_address)
+        if not self._authorized():
+            self._error(401, "The api key provided is invalid")
+            return
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        if parts[:2] != ["v1", "orders"]:
+            self._error(404, "The requested URL was not found on the server.")
+        elif method == "POST" and len(parts) == 2:
+            self._create_order()
+        elif method == "GET" and len(parts) == 3:
+            self._fetch_order(parts[2])
+        elif method == "POST" and len(parts) == 4 and parts[3] == "pay":
+            self._pay_order(parts[2])
+        else:
+            self._error(404, "The requested URL was not found on the server.")
+
+    def _create_order(self) -> None:
+        fake = self.server.fake
+        data = self._body()
+        amount = data.get("amount")
+        if not isinstance(amount, int) or amount < 100:
+            self._error(400, "The amount must be atleast INR 1.00")
+            return
+        order = {
+            "id": f"order_{secrets.token_hex(7)}",
+            "entity": "order",
+            "amount": amount,
+            "amount_paid": 0,
+            "amount_due": amount,
+            "currency": data.get("currency", "INR"),
+            "receipt": data.get("receipt"),
+            "notes": data.get("notes") or [],
+            "status": "created",
+            "attempts": 0,
+            "created_at": int(time.time()),
+        }
+        with fake.lock:
+            fake.orders[order["id"]] = order
+        self._reply(200, order)
+
+    def _fetch_order(self, order_id: str) -> None:
+        order = self.server.fake.orders.get(order_id)
+        if order is None:
+            self._error(400, "The id provided does not exist")
+        else:
+            self._reply(200, order)
+
+    def _pay_order(self, order_id: str) -> None:
+        fake = self.server.fake
+        with fake.lock:
+            order = fake.orders.get(order_id)
+            if order is None:
+                self._error(400, "The id provided does not exist")
+                return
+            order.update(status="paid", amount_paid=order["amount"], amount_due=0, attempts=order["attempts"] + 1)
+        payment_id = f"pay_{secrets.token_hex(7)}"
+        self._reply(
+            200,
+            {
+                "razorpay_order_id": order_id,
+                "razorpay_payment_id": payment_id,
+                "razorpay_signature": sign(order_id, payment_id, fake.key_secret),
+            },
+        )
+
+    def do_GET(self):  # noqa: N802 - BaseHTTPRequestHandler naming
+        self._route("GET")
+
+    def do_POST(self):  # noqa: N802
+        self._route("POST")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeRazorpay"
+
+
+class FakeRazorpay:
+    """Threaded fake API server; usable as a context manager."""
+
+    def __init__(self, key_id: str, key_secret: str, host: str = "127.0.0.1", port: int = 0, verbose: bool = False):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self.verbose = verbose
+        self.orders: dict[str, dict] = {}
+        self.request_count = 0
+        self.connections: set = set()
+        self.lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeRazorpay":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-razorpay", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeRazorpay":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
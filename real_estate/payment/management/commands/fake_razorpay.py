@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from payment.fake_razorpay import FakeRazorpay
+
+
+class Command(BaseCommand):
+    help = "Serve a local stand-in for the Razorpay orders API (set RAZORPAY_BASE_URL to its URL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+
+    def handle(self, *args, **options):
+        fake = FakeRazorpay(
+            settings.RAZORPAY_KEY_ID,
+            settings.RAZORPAY_KEY_SECRET,
+            host=options["host"],
+            port=options["port"],
+            verbose=options["verbosity"] > 1,
+        )
+        self.stdout.write(f"Fake Razorpay listening on {fake.url} (Ctrl+C to stop).")
+        try:
+            fake.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            fake.stop()
@@ -0,0 +1,31 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from payment.reconcile import purge_processed, reconcile_batch
+
+
+class Command(BaseCommand):
+    help = "Apply stored Razorpay webhook events to payments. Runs until interrupted unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Apply what is queued now, then exit.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Events per transaction.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds to sleep when idle.")
+        parser.add_argument(
+            "--keep-days", type=int, default=30, help="Delete processed events older than this many days."
+        )
+
+    def handle(self, *args, **options):
+        keep = timedelta(days=options["keep_days"])
+        purge_processed(keep)
+        while True:
+            events, updated = reconcile_batch(options["batch_size"])
+            if events:
+                self.stdout.write(f"Applied {events} event(s); {updated} payment(s) updated.")
+                continue
+            if options["once"]:
+                break
+            purge_processed(keep)
+            time.sleep(options["interval"])
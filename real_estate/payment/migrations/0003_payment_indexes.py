@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:57
+
+from django.db import migrations, models
+from django.db.models import Case, Count, IntegerField, Value, When
+
+
+def dedupe_order_ids(apps, schema_editor):
+    """
+    Keep one payment per razorpay_order_id (a successful one if any, else the
+    newest) and suffix the others' order ids so the unique constraint applies.
+    """
+    Payment = apps.get_model("payment", "Payment")
+    duplicated = (
+        Payment.objects.values("razorpay_order_id")
+        .annotate(n=Count("pk"))
+        .filter(n__gt=1)
+        .values_list("razorpay_order_id", flat=True)
+    )
+    for order_id in list(duplicated):
+        payments = (
+            Payment.objects.filter(razorpay_order_id=order_id)
+            .annotate(
+                succeeded=Case(When(status="SUCCESS", then=Value(1)), default=Value(0), output_field=IntegerField())
+            )
+            .order_by("-succeeded", "-created_at", "-pk")
+        )
+        for payment in list(payments)[1:]:
+            suffix = f"#dup{payment.pk}"
+            payment.razorpay_order_id = order_id[: 200 - len(suffix)] + suffix
+            payment.save(update_fields=["razorpay_order_id"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0002_webhookevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_order_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='payment',
+            name='razorpay_order_id',
+            field=models.CharField(max_length=200, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['property', 'created_at'], name='payment_pay_propert_493386_idx'),
+        ),
+    ]
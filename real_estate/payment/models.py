@@ -8,7 +8,7 @@ class Payment(models.Model):
     seller = models.ForeignKey(Seller, on_delete=models.CASCADE)
     property = models.ForeignKey(Property, on_delete=models.CASCADE)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
-    razorpay_order_id = models.CharField(max_length=200)
+    razorpay_order_id = models.CharField(max_length=200, unique=True)
     razorpay_payment_id = models.CharField(max_length=200, null=True, blank=True)
     razorpay_signature = models.CharField(max_length=200, null=True, blank=True)
     status = models.CharField(max_length=20, default="PENDING")
@@ -16,9 +16,35 @@ class Payment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Latest payment per property (payment.reconcile).
+            models.Index(fields=["property", "created_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.seller_id} - {self.property_id} - {self.status}"
 
 
+class WebhookEvent(models.Model):
+    """
+    A signed Razorpay webhook delivery, stored as received and applied to
+    ``Payment`` rows in batches by ``manage.py reconcile_payments``.
+    """
 
+    event_id = models.CharField(max_length=100, unique=True)
+    event = models.CharField(max_length=100)
+    order_id = models.CharField(max_length=200, blank=True)
+    payment_id = models.CharField(max_length=200, blank=True)
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    outcome = models.CharField(max_length=50, blank=True)
+
+    class Meta:
+        ordering = ["received_at"]
+        indexes = [
+            models.Index(fields=["processed_at", "received_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event} {self.event_id}"
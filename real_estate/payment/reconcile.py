@@ -0,0 +1,111 @@
+"""
+Razorpay webhook ingestion and payment reconciliation.
+
+The webhook view only verifies the signature and stores the delivery
+(``record_event``). ``reconcile_batch`` later claims unprocessed events,
+loads every referenced ``Payment`` in one query, and writes the new statuses
+with a single ``bulk_update``. In the same transaction it refreshes
+``Property.latest_payment_status`` for the affected listings. A payment that
+has reached ``SUCCESS`` is never moved back.
+"""
+import hashlib
+from datetime import timedelta
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from property.models import Property
+
+from .models import Payment, WebhookEvent
+
+EVENT_STATUS = {
+    "payment.captured": "SUCCESS",
+    "order.paid": "SUCCESS",
+    "payment.failed": "FAILED",
+}
+
+
+def refresh_latest_payment_status(property_ids: Iterable[int]) -> None:
+    """Copy each property's newest payment status onto the property row."""
+    property_ids = set(property_ids)
+    if not property_ids:
+        return
+    latest = (
+        Payment.objects.filter(property_id=OuterRef("pk"))
+        .order_by("-created_at", "-pk")
+        .values("status")[:1]
+    )
+    Property.objects.filter(pk__in=property_ids).update(
+        latest_payment_status=Coalesce(Subquery(latest), Value(""))
+    )
+
+
+def record_event(body: bytes, payload: dict, event_id: str = "") -> bool:
+    """Store a verified delivery. Returns False for a redelivered event."""
+    entities = payload.get("payload") or {}
+    payment = (entities.get("payment") or {}).get("entity") or {}
+    order = (entities.get("order") or {}).get("entity") or {}
+    try:
+        with transaction.atomic():
+            WebhookEvent.objects.create(
+                event_id=event_id or hashlib.sha256(body).hexdigest(),
+                event=str(payload.get("event", ""))[:100],
+                order_id=str(payment.get("order_id") or order.get("id") or "")[:200],
+                payment_id=str(payment.get("id") or "")[:200],
+                payload=payload,
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def _apply(event: WebhookEvent, payment: Payment | None) -> str:
+    status = EVENT_STATUS.get(event.event)
+    if status is None:
+        return "ignored"
+    if payment is None:
+        return "unknown order"
+    if payment.status == "SUCCESS" or payment.status == status:
+        return "unchanged"
+    payment.status = status
+    if event.payment_id:
+        payment.razorpay_payment_id = event.payment_id
+    return "applied"
+
+
+def reconcile_batch(size: int = 500) -> tuple[int, int]:
+    """Apply up to ``size`` pending events. Returns ``(events, payments_updated)``."""
+    with transaction.atomic():
+        events = list(
+            WebhookEvent.objects.select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True)
+            .order_by("received_at")[:size]
+        )
+        if not events:
+            return 0, 0
+        payments = {
+            payment.razorpay_order_id: payment
+            for payment in Payment.objects.filter(
+                razorpay_order_id__in={event.order_id for event in events if event.order_id}
+            )
+        }
+        changed = {}
+        now = timezone.now()
+        for event in events:
+            payment = payments.get(event.order_id)
+            event.outcome = _apply(event, payment)
+            event.processed_at = now
+            if event.outcome == "applied":
+                changed[payment.pk] = payment
+        Payment.objects.bulk_update(changed.values(), ["status", "razorpay_payment_id"])
+        WebhookEvent.objects.bulk_update(events, ["processed_at", "outcome"])
+        refresh_latest_payment_status(payment.property_id for payment in changed.values())
+    return len(events), len(changed)
+
+
+def purge_processed(older_than: timedelta) -> int:
+    deleted, _ = WebhookEvent.objects.filter(processed_at__lt=timezone.now() - older_than).delete()
+    return deleted
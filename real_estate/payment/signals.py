@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Payment
+from .reconcile import refresh_latest_payment_status
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def sync_latest_payment_status(sender, instance: Payment, **kwargs) -> None:
+    refresh_latest_payment_status([instance.property_id])
@@ -0,0 +1,175 @@
+import decimal
+import hashlib
+import hmac
+import json
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import Seller
+from property.models import Property
+
+from . import client as razorpay_client
+from .fake_razorpay import FakeRazorpay
+from .models import Payment, WebhookEvent
+from .reconcile import reconcile_batch
+from .views import get_or_create_pending_payment
+
+WEBHOOK_SECRET = "whsec_test"
+KEY_ID, KEY_SECRET = "rzp_test_key", "rzp_test_secret"
+
+
+class PaymentFixtureMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = Seller.objects.create(name="Seller", email="seller@example.com", phone="9000000000")
+        cls.listing = Property.objects.create(
+            seller=cls.seller,
+            title="Flat",
+            category=Property.RESIDENTIAL,
+            subcategory="APARTMENT",
+            property_type="SELL",
+            price=100,
+            address="1 Main Road",
+            city="Pune",
+            state="Maharashtra",
+        )
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite's")
+class PaymentIndexPlanTests(TestCase):
+    def test_latest_payment_per_property_uses_property_created_at_index(self):
+        plan = Payment.objects.filter(property_id=1).order_by("-created_at", "-pk")[:1].explain()
+        self.assertIn("USING INDEX payment_pay_propert_493386_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_order_lookup_uses_unique_index(self):
+        plan = Payment.objects.filter(razorpay_order_id="order_1").explain()
+        self.assertIn("USING INDEX sqlite_autoindex_payment_payment_", plan)
+
+
+@override_settings(RAZORPAY_WEBHOOK_SECRET=WEBHOOK_SECRET)
+class RazorpayWebhookTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        self.payment = Payment.objects.create(
+            seller=self.seller, property=self.listing, amount=100, razorpay_order_id="order_1"
+        )
+
+    def post(self, body: bytes, signature: str | None = None, event_id: str = ""):
+        headers = {}
+        if signature is not None:
+            headers["HTTP_X_RAZORPAY_SIGNATURE"] = signature
+        if event_id:
+            headers["HTTP_X_RAZORPAY_EVENT_ID"] = event_id
+        return self.client.post(reverse("payment:webhook"), body, content_type="application/json", **headers)
+
+    def deliver(self, event: str, event_id: str):
+        body = json.dumps(
+            {"event": event, "payload": {"payment": {"entity": {"id": f"pay_{event_id}", "order_id": "order_1"}}}}
+        ).encode()
+        signature = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        return self.post(body, signature, event_id)
+
+    def status(self) -> tuple[str, str]:
+        self.payment.refresh_from_db()
+        self.listing.refresh_from_db()
+        return self.payment.status, self.listing.latest_payment_status
+
+    def test_missing_or_wrong_signature_is_rejected(self):
+        body = json.dumps({"event": "payment.captured"}).encode()
+        self.assertEqual(self.post(body).status_code, 400)
+        self.assertEqual(self.post(body, "0" * 64).status_code, 400)
+        wrong_key = hmac.new(b"other", body, hashlib.sha256).hexdigest()
+        self.assertEqual(self.post(body, wrong_key).status_code, 400)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    @override_settings(RAZORPAY_WEBHOOK_SECRET="")
+    def test_unconfigured_secret_refuses_deliveries(self):
+        self.assertEqual(self.post(b"{}", "").status_code, 503)
+
+    def test_redelivered_event_is_stored_once(self):
+        self.assertEqual(self.deliver("payment.captured", "evt_1").status_code, 200)
+        self.assertEqual(self.deliver("payment.captured", "evt_1").status_code, 200)
+        self.assertEqual(WebhookEvent.objects.count(), 1)
+        self.assertEqual(reconcile_batch(), (1, 1))
+        self.assertEqual(reconcile_batch(), (0, 0))
+
+    def test_failure_after_success_does_not_downgrade(self):
+        self.deliver("payment.captured", "evt_1")
+        self.deliver("payment.failed", "evt_2")
+        self.assertEqual(reconcile_batch(), (2, 1))
+        self.assertEqual(self.status(), ("SUCCESS", "SUCCESS"))
+        self.assertEqual(
+            list(WebhookEvent.objects.values_list("outcome", flat=True)), ["applied", "unchanged"]
+        )
+
+    def test_success_after_failure_wins(self):
+        self.deliver("payment.failed", "evt_1")
+        self.assertEqual(reconcile_batch(), (1, 1))
+        self.assertEqual(self.status(), ("FAILED", "FAILED"))
+        self.deliver("payment.captured", "evt_2")
+        self.assertEqual(reconcile_batch(), (1, 1))
+        self.assertEqual(self.status(), ("SUCCESS", "SUCCESS"))
+        self.assertEqual(self.payment.razorpay_payment_id, "pay_evt_2")
+
+    def test_unknown_order_is_recorded_but_changes_nothing(self):
+        body = json.dumps({"event": "order.paid", "payload": {"order": {"entity": {"id": "order_x"}}}}).encode()
+        self.post(body, hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest())
+        self.assertEqual(reconcile_batch(), (1, 0))
+        self.assertEqual(WebhookEvent.objects.get().outcome, "unknown order")
+        self.assertEqual(self.status(), ("PENDING", "PENDING"))
+
+
+@override_settings(RAZORPAY_KEY_ID=KEY_ID, RAZORPAY_KEY_SECRET=KEY_SECRET)
+class CheckoutOrderReuseTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        self.fake = FakeRazorpay(KEY_ID, KEY_SECRET).start()
+        self.addCleanup(self.fake.stop)
+        settings = override_settings(RAZORPAY_BASE_URL=self.fake.url)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        session = self.client.session
+        session["seller_id"] = self.seller.id
+        session.save()
+
+    def checkout(self):
+        return self.client.get(reverse("payment:create"), {"property_id": self.listing.pk})
+
+    def test_repeated_checkouts_reuse_one_order_over_one_connection(self):
+        first, second = self.checkout(), self.checkout()
+        self.assertEqual(first.context["payment"], second.context["payment"])
+        self.assertEqual(Payment.objects.count(), 1)
+        self.assertEqual(list(self.fake.orders), [Payment.objects.get().razorpay_order_id])
+        self.assertIs(razorpay_client.get_client(), razorpay_client.get_client())
+
+        # A changed order amount is a new order, sent over the kept-alive connection.
+        get_or_create_pending_payment(self.seller, self.listing, decimal.Decimal("250.00"))
+        self.assertEqual(len(self.fake.orders), 2)
+        self.assertEqual(len(self.fake.connections), 1)
+
+    def test_order_stored_by_another_tab_meanwhile_is_kept(self):
+        client = razorpay_client.get_client()
+        create = client.order.create
+
+        def create_racing_tab(data):
+            # The other tab finishes its checkout while our order is in flight.
+            order = create(data)
+            Payment.objects.create(
+                seller=self.seller, property=self.listing, amount=100, razorpay_order_id="order_other_tab"
+            )
+            return order
+
+        with mock.patch.object(client.order, "create", create_racing_tab):
+            payment = get_or_create_pending_payment(self.seller, self.listing, decimal.Decimal("100.00"))
+        self.assertEqual(payment.razorpay_order_id, "order_other_tab")
+        self.assertEqual(Payment.objects.count(), 1)
+
+    def test_paid_order_settles_through_the_callback(self):
+        payment = self.checkout().context["payment"]
+        paid = razorpay_client.get_client().order.post_url(f"/v1/orders/{payment.razorpay_order_id}/pay", {})
+        response = self.client.post(reverse("payment:callback"), paid)
+        self.assertTemplateUsed(response, "payment/success.html")
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "SUCCESS")
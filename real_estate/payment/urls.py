@@ -1,12 +1,13 @@
 from django.urls import path
 
-from .views import PaymentCallbackView, PaymentCreateView
+from .views import PaymentCallbackView, PaymentCreateView, RazorpayWebhookView
 
 app_name = "payment"
 
 urlpatterns = [
     path("create/", PaymentCreateView.as_view(), name="create"),
     path("callback/", PaymentCallbackView.as_view(), name="callback"),
+    path("webhook/", RazorpayWebhookView.as_view(), name="webhook"),
 ]
 
 
@@ -1,4 +1,8 @@
 import decimal
+import hashlib
+import hmac
+import json
+from datetime import timedelta
 
 try:
     import razorpay
@@ -6,16 +10,68 @@ except ImportError:  # pragma: no cover - handled gracefully at runtime
     razorpay = None
 from django.conf import settings
 from django.contrib import messages
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 
 from accounts.models import Seller
 from accounts.views import seller_login_required
 from property.models import Property
 
+from .client import get_client
 from .models import Payment
+from .reconcile import record_event
+
+
+def _pending_payment(seller: Seller, prop: Property, amount_rupees: decimal.Decimal) -> Payment | None:
+    reusable_since = timezone.now() - timedelta(seconds=settings.RAZORPAY_ORDER_REUSE_SECONDS)
+    return Payment.objects.filter(
+        seller=seller,
+        property=prop,
+        amount=amount_rupees,
+        status="PENDING",
+        created_at__gte=reusable_since,
+    ).first()
+
+
+def get_or_create_pending_payment(seller: Seller, prop: Property, amount_rupees: decimal.Decimal) -> Payment:
+    """
+    Return the seller's still-PENDING order for this property and amount, or
+    create one with Razorpay, so reloading the checkout page reuses the order.
+
+    The gateway call happens outside any transaction: a slow Razorpay must not
+    hold row locks (or, with the SQLite profile, the process's write slot).
+    """
+    payment = _pending_payment(seller, prop, amount_rupees)
+    if payment is not None:
+        return payment
+    order = get_client().order.create(
+        {
+            "amount": int(amount_rupees * 100),
+            "currency": "INR",
+            "receipt": f"listing-{prop.pk}-{seller.pk}",
+            "payment_capture": 1,
+        }
+    )
+    with transaction.atomic():
+        # Serialises concurrent checkouts by the same seller: if another tab
+        # stored an order while ours was being created, keep that one and let
+        # the unused Razorpay order expire.
+        Seller.objects.select_for_update().filter(pk=seller.pk).first()
+        payment = _pending_payment(seller, prop, amount_rupees)
+        if payment is not None:
+            return payment
+        return Payment.objects.create(
+            seller=seller,
+            property=prop,
+            amount=amount_rupees,
+            razorpay_order_id=order["id"],
+        )
 
 
 class PaymentCreateView(View):
@@ -46,13 +102,9 @@ class PaymentCreateView(View):
             )
             return redirect("accounts:dashboard")
 
-        client = razorpay.Client(
-            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-        )
+        seller = get_object_or_404(Seller, id=request.session.get("seller_id"))
         try:
-            order = client.order.create(
-                {"amount": amount_paise, "currency": "INR", "payment_capture": 1}
-            )
+            payment = get_or_create_pending_payment(seller, prop, amount_rupees)
         except Exception as exc:  # pragma: no cover - external API failure
             messages.error(
                 request,
@@ -64,13 +116,6 @@ class PaymentCreateView(View):
                 "payment/failed.html",
                 {"property": prop, "payment": None},
             )
-        seller = get_object_or_404(Seller, id=request.session.get("seller_id"))
-        payment = Payment.objects.create(
-            seller=seller,
-            property=prop,
-            amount=amount_rupees,
-            razorpay_order_id=order["id"],
-        )
 
         return render(
             request,
@@ -102,9 +147,7 @@ class PaymentCallbackView(View):
                 {"property": payment.property, "payment": payment},
             )
 
-        client = razorpay.Client(
-            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-        )
+        client = get_client()
         try:
             client.utility.verify_payment_signature(
                 {
@@ -114,8 +157,9 @@ class PaymentCallbackView(View):
                 }
             )
         except razorpay.errors.SignatureVerificationError:
-            payment.status = "FAILED"
-            payment.save()
+            with transaction.atomic():
+                payment.status = "FAILED"
+                payment.save()
             messages.error(request, "Payment verification failed.")
             return render(
                 request,
@@ -123,10 +167,11 @@ class PaymentCallbackView(View):
                 {"property": payment.property, "payment": payment},
             )
 
-        payment.razorpay_payment_id = payment_id
-        payment.razorpay_signature = signature
-        payment.status = "SUCCESS"
-        payment.save()
+        with transaction.atomic():
+            payment.razorpay_payment_id = payment_id
+            payment.razorpay_signature = signature
+            payment.status = "SUCCESS"
+            payment.save()
 
         prop = payment.property
 
@@ -141,3 +186,26 @@ class PaymentCallbackView(View):
         )
 
 
+@method_decorator(csrf_exempt, name="dispatch")
+class RazorpayWebhookView(View):
+    """
+    Receives Razorpay webhooks, so a payment is settled even when the browser
+    never reaches the callback. Events are only stored here; they are applied
+    by ``manage.py reconcile_payments``.
+    """
+
+    def post(self, request: HttpRequest) -> HttpResponse:
+        secret = settings.RAZORPAY_WEBHOOK_SECRET
+        if not secret:
+            return HttpResponse("Webhook secret is not configured.", status=503)
+        expected = hmac.new(secret.encode(), request.body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, request.headers.get("X-Razorpay-Signature", "")):
+            return HttpResponse("Invalid signature.", status=400)
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return HttpResponse("Invalid JSON.", status=400)
+        if not isinstance(payload, dict):
+            return HttpResponse("Invalid JSON.", status=400)
+        record_event(request.body, payload, request.headers.get("X-Razorpay-Event-Id", ""))
+        return HttpResponse(status=200)
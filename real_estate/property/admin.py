@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Amenity, Property, PropertyImage
+from .models import Amenity, MapCluster, Property, PropertyImage
 
 
 class PropertyImageInline(admin.TabularInline):
@@ -21,3 +21,7 @@ class AmenityAdmin(admin.ModelAdmin):
     search_fields = ("name",)
 
 
+@admin.register(MapCluster)
+class MapClusterAdmin(admin.ModelAdmin):
+    list_display = ("zoom", "cell_x", "cell_y", "count", "min_price", "max_price")
+    list_filter = ("zoom",)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class PropertyConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "property"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
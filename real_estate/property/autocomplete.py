@@ -0,0 +1,10 @@
+"""City / state suggestions for the listing search boxes; see apps.properties.autocomplete."""
+from apps.properties.autocomplete import AutocompleteIndex
+
+from .models import Property
+
+index = AutocompleteIndex(
+    "property",
+    lambda: Property.objects.active(),
+    {"city": ("city_normalized", "city"), "state": ("state_normalized", "state")},
+)
@@ -0,0 +1,198 @@
+"""
+Precomputed map clusters of active listings.
+
+The map is split into a Web Mercator grid per zoom level: every map tile of
+that zoom holds ``CELLS_PER_TILE`` x ``CELLS_PER_TILE`` cells, and each
+``MapCluster`` row aggregates the active listings in one cell (count, price
+range, coordinate sums for the centroid). A viewport request reads only the
+cells it covers, so the payload size depends on the screen, not on how many
+listings there are.
+
+Rows are kept current by ``apply_change()``, called from the signals in
+``property.signals`` when a listing is approved, deactivated, moved,
+repriced or deleted. ``manage.py rebuild_map_clusters`` recomputes them all.
+"""
+import math
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Min, Q, Value
+from django.db.models.functions import Greatest, Least
+
+from .models import MapCluster, Property
+
+MAX_CLUSTER_ZOOM = 14
+CELLS_PER_TILE = 4
+MAX_CLUSTERS = 1000
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def grid_size(zoom: int) -> int:
+    return (1 << zoom) * CELLS_PER_TILE
+
+
+def cell_for(lat: float, lng: float, zoom: int) -> tuple[int, int]:
+    n = grid_size(zoom)
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = int((lng + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def cell_bounds(zoom: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """Return ``(south, west, north, east)`` of a cell."""
+    n = grid_size(zoom)
+
+    def lat_of(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat_of(y + 1), x / n * 360.0 - 180.0, lat_of(y), (x + 1) / n * 360.0 - 180.0
+
+
+def point_for(lat, lng, price, is_active) -> tuple | None:
+    """What a listing contributes to the clusters, or ``None`` if nothing."""
+    if not is_active or lat is None or lng is None:
+        return None
+    return float(lat), float(lng), Decimal(str(price))
+
+
+def _cells_q(cells) -> Q:
+    condition = Q()
+    for zoom, x, y in cells:
+        condition |= Q(zoom=zoom, cell_x=x, cell_y=y)
+    return condition
+
+
+def _cells(lat: float, lng: float) -> list[tuple[int, int, int]]:
+    return [(zoom, *cell_for(lat, lng, zoom)) for zoom in range(MAX_CLUSTER_ZOOM + 1)]
+
+
+def add_point(lat: float, lng: float, price) -> None:
+    cells = _cells(lat, lng)
+    increment = {
+        "count": F("count") + 1,
+        "sum_latitude": F("sum_latitude") + lat,
+        "sum_longitude": F("sum_longitude") + lng,
+        "min_price": Least("min_price", Value(price)),
+        "max_price": Greatest("max_price", Value(price)),
+    }
+    with transaction.atomic():
+        existing = set(
+            MapCluster.objects.select_for_update()
+            .filter(_cells_q(cells))
+            .values_list("zoom", "cell_x", "cell_y")
+        )
+        if existing:
+            MapCluster.objects.filter(_cells_q(existing)).update(**increment)
+        for zoom, x, y in cells:
+            if (zoom, x, y) in existing:
+                continue
+            try:
+                with transaction.atomic():
+                    MapCluster.objects.create(
+                        zoom=zoom,
+                        cell_x=x,
+                        cell_y=y,
+                        count=1,
+                        sum_latitude=lat,
+                        sum_longitude=lng,
+                        min_price=price,
+                        max_price=price,
+                    )
+            except IntegrityError:
+                # Created by a concurrent writer since we looked.
+                MapCluster.objects.filter(zoom=zoom, cell_x=x, cell_y=y).update(**increment)
+
+
+def _refresh_price_range(cluster: MapCluster) -> None:
+    south, west, north, east = cell_bounds(cluster.zoom, cluster.cell_x, cluster.cell_y)
+    prices = Property.objects.active().filter(
+        latitude__gt=south, latitude__lte=north, longitude__gte=west, longitude__lt=east
+    ).aggregate(min_price=Min("price"), max_price=Max("price"))
+    if prices["min_price"] is None:
+        return
+    cluster.min_price = prices["min_price"]
+    cluster.max_price = prices["max_price"]
+    cluster.save(update_fields=["min_price", "max_price"])
+
+
+def remove_point(lat: float, lng: float, price) -> None:
+    cells = _cells_q(_cells(lat, lng))
+    with transaction.atomic():
+        MapCluster.objects.filter(cells).update(
+            count=F("count") - 1,
+            sum_latitude=F("sum_latitude") - lat,
+            sum_longitude=F("sum_longitude") - lng,
+        )
+        MapCluster.objects.filter(cells, count__lte=0).delete()
+        # Only cells whose cheapest or dearest listing just left need a rescan.
+        for cluster in MapCluster.objects.filter(cells).filter(Q(min_price=price) | Q(max_price=price)):
+            _refresh_price_range(cluster)
+
+
+def apply_change(before: tuple | None, after: tuple | None) -> None:
+    """Move a listing's contribution from ``before`` to ``after`` (see ``point_for``)."""
+    if before == after:
+        return
+    with transaction.atomic():
+        if before is not None:
+            remove_point(*before)
+        if after is not None:
+            add_point(*after)
+
+
+def rebuild() -> int:
+    """Recompute every cluster from the active listings. Returns the row count."""
+    points = list(
+        Property.objects.active()
+        .filter(latitude__isnull=False, longitude__isnull=False)
+        .order_by()
+        .values_list("latitude", "longitude", "price")
+        .iterator(chunk_size=2000)
+    )
+    total = 0
+    with transaction.atomic():
+        MapCluster.objects.all().delete()
+        for zoom in range(MAX_CLUSTER_ZOOM + 1):
+            clusters: dict[tuple[int, int], MapCluster] = {}
+            for lat, lng, price in points:
+                x, y = cell_for(lat, lng, zoom)
+                cluster = clusters.get((x, y))
+                if cluster is None:
+                    clusters[(x, y)] = MapCluster(
+                        zoom=zoom,
+                        cell_x=x,
+                        cell_y=y,
+                        count=1,
+                        sum_latitude=lat,
+                        sum_longitude=lng,
+                        min_price=price,
+                        max_price=price,
+                    )
+                    continue
+                cluster.count += 1
+                cluster.sum_latitude += lat
+                cluster.sum_longitude += lng
+                cluster.min_price = min(cluster.min_price, price)
+                cluster.max_price = max(cluster.max_price, price)
+            MapCluster.objects.bulk_create(clusters.values(), batch_size=1000)
+            total += len(clusters)
+    return total
+
+
+def clusters_in_view(zoom: int, south: float, west: float, north: float, east: float):
+    """
+    Clusters covering the viewport at ``zoom`` (clamped to the precomputed
+    levels). ``west > east`` means the viewport spans the antimeridian.
+    """
+    zoom = max(0, min(zoom, MAX_CLUSTER_ZOOM))
+    x_min, y_min = cell_for(north, west, zoom)
+    x_max, y_max = cell_for(south, east, zoom)
+    if x_min <= x_max:
+        columns = Q(cell_x__gte=x_min, cell_x__lte=x_max)
+    else:
+        columns = Q(cell_x__gte=x_min) | Q(cell_x__lte=x_max)
+    return zoom, (
+        MapCluster.objects.filter(columns, zoom=zoom, cell_y__gte=y_min, cell_y__lte=y_max)
+        .order_by("-count")[:MAX_CLUSTERS]
+    )
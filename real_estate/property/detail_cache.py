@@ -0,0 +1,115 @@
+"""
+Versioned cache of rendered property detail pages.
+
+Each listing has a version counter in the shared cache tier under
+``property:detail:version:<pk>``. Rendered fragments are stored under
+``property:detail:<pk>:<version>``; they never change once written, so they
+are also served from the in-process tier and a warm request never touches
+the database. Anything that changes what the page shows (edits,
+approve/deactivate, images, amenities) increments the counter through the
+receivers in ``property.signals``, once right away and once more on commit,
+so a render of the old row made in between is never served.
+
+The counter only moves through ``incr`` and ``add``. A missing counter starts
+from a fresh nanosecond timestamp, never from a row read, so it can't come
+back to a version whose fragments are out of date.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from config.cache import get_cache
+
+from .models import Property
+
+BODY_TEMPLATE = "property/_property_detail_body.html"
+
+# Version pointers change on every edit, so they skip the per-process tier.
+_versions = get_cache("property", alias="shared")
+_pages = get_cache("property")
+
+
+def _timeout() -> int:
+    return getattr(settings, "PROPERTY_DETAIL_CACHE_TIMEOUT", 60 * 60)
+
+
+def version_key(pk) -> str:
+    return f"detail:version:{pk}"
+
+
+def entry_key(pk, version) -> str:
+    return f"detail:{pk}:{version}"
+
+
+def _get_version(pk) -> int:
+    version = _versions.get(version_key(pk))
+    if version is None:
+        # Whoever adds first wins; a concurrent bump may have beaten us too.
+        _versions.add(version_key(pk), time.time_ns(), _timeout())
+        version = _versions.get(version_key(pk), 0)
+    return version
+
+
+def _bump(pks) -> None:
+    for pk in pks:
+        try:
+            _versions.incr(version_key(pk))
+        except ValueError:
+            _versions.add(version_key(pk), time.time_ns(), _timeout())
+
+
+def _build_entry(pk) -> dict | None:
+    prop = (
+        Property.objects.select_related("seller")
+        .prefetch_related("images", "amenities")
+        .filter(pk=pk)
+        .first()
+    )
+    if prop is None:
+        return None
+    return {
+        "id": prop.pk,
+        "seller_id": prop.seller_id,
+        "is_active": prop.is_active,
+        "title": prop.title,
+        "address": prop.address,
+        "latitude": prop.latitude,
+        "longitude": prop.longitude,
+        "buyer_html": render_to_string(BODY_TEMPLATE, {"property": prop, "is_seller_owner": False}),
+        "owner_html": render_to_string(BODY_TEMPLATE, {"property": prop, "is_seller_owner": True}),
+    }
+
+
+def get_listing(pk) -> dict | None:
+    """
+    Return the cached render of listing ``pk`` or ``None`` if it does not
+    exist. ``owner_html``/``buyer_html`` hold the two page variants.
+    """
+    version = _get_version(pk)
+    return _pages.get_or_set_locked(entry_key(pk, version), lambda: _build_entry(pk), _timeout())
+
+
+def listing_context(entry: dict, is_seller_owner: bool) -> dict:
+    html = entry["owner_html"] if is_seller_owner else entry["buyer_html"]
+    return {
+        "listing": entry,
+        "detail_html": mark_safe(html),
+        "is_seller_owner": is_seller_owner,
+    }
+
+
+def invalidate(*pks) -> None:
+    _bump(pks)
+    transaction.on_commit(lambda: _bump(pks))
+
+
+def touch(*pks) -> None:
+    """Bump ``updated_at`` for listings whose related rows changed."""
+    if not pks:
+        return
+    Property.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+    invalidate(*pks)
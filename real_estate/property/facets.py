@@ -0,0 +1,152 @@
+"""
+Facet counts for the legacy property list.
+
+All facets are computed in a single ``UNION ALL`` of grouped queries, so the
+cost is one database round trip no matter how many facet values exist.
+
+The city facet groups on the canonical ``city_normalized`` so "Bangalore" and
+"bengaluru " count as one city; it is labelled with the most common spelling.
+"""
+from decimal import Decimal
+
+from django.db.models import Case, CharField, Count, F, Value, When
+from django.db.models.functions import Cast
+from django.http import QueryDict
+
+from .models import Property
+
+# (label, min_price, max_price): min_price <= price < max_price, None means open ended.
+PRICE_BUCKETS = [
+    ("Under ₹25 L", None, Decimal("2500000")),
+    ("₹25 L - ₹50 L", Decimal("2500000"), Decimal("5000000")),
+    ("₹50 L - ₹1 Cr", Decimal("5000000"), Decimal("10000000")),
+    ("₹1 Cr - ₹2 Cr", Decimal("10000000"), Decimal("20000000")),
+    ("₹2 Cr - ₹5 Cr", Decimal("20000000"), Decimal("50000000")),
+    ("Above ₹5 Cr", Decimal("50000000"), None),
+]
+# The smallest price step (Property.price has two decimal places). The list view's
+# max_price filter is inclusive, so refine links stop one step below the bucket's end.
+PRICE_STEP = Decimal("0.01")
+CITY_FACET_LIMIT = 10
+FACET_NAMES = ("category", "bhk", "city", "amenities", "price")
+PAGINATION_PARAMS = ("page", "cursor")
+
+
+def _price_bucket_expression() -> Case:
+    whens = [
+        When(price__lt=max_price, then=Value(label))
+        for label, _, max_price in PRICE_BUCKETS
+        if max_price is not None
+    ]
+    return Case(*whens, default=Value(PRICE_BUCKETS[-1][0]), output_field=CharField())
+
+
+def _grouped(queryset, facet: str, expression, label=None):
+    return (
+        queryset.order_by()
+        .annotate(
+            facet=Value(facet, output_field=CharField()),
+            value=expression,
+            label=Value("", output_field=CharField()) if label is None else label,
+        )
+        .values("facet", "value", "label")
+        .annotate(count=Count("pk"))
+    )
+
+
+def _query_string(params, **updates) -> str:
+    query = params.copy() if params is not None else QueryDict(mutable=True)
+    for key in PAGINATION_PARAMS:
+        query.pop(key, None)
+    for key, value in updates.items():
+        if value in (None, ""):
+            query.pop(key, None)
+        else:
+            query[key] = str(value)
+    return query.urlencode()
+
+
+def compute_facets(queryset, params=None, amenities=None) -> dict[str, list[dict]]:
+    """
+    Return facet counts for ``queryset`` keyed by facet name.
+
+    ``params`` is the request's ``GET`` QueryDict; each facet value carries a
+    ``query`` string that applies it on top of the current filters.
+    ``amenities`` is an optional iterable of ``Amenity`` rows used for labels.
+    """
+    base = Property.objects.filter(pk__in=queryset.order_by().values("pk"))
+    rows = _grouped(base, "category", F("category")).union(
+        _grouped(base.filter(bhk__isnull=False), "bhk", Cast("bhk", CharField())),
+        _grouped(base.exclude(city_normalized=""), "city", F("city_normalized"), F("city")),
+        _grouped(
+            base.filter(amenities__isnull=False), "amenities", Cast("amenities__id", CharField())
+        ),
+        _grouped(base, "price", _price_bucket_expression()),
+        all=True,
+    )
+
+    counts: dict[str, dict[str, int]] = {name: {} for name in FACET_NAMES}
+    # city_normalized -> (count, spelling) of its most common raw spelling
+    city_spellings: dict[str, tuple[int, str]] = {}
+    for row in rows:
+        facet, value = row["facet"], row["value"]
+        counts[facet][value] = counts[facet].get(value, 0) + row["count"]
+        if facet == "city":
+            spelling = (row["count"], " ".join(row["label"].split()))
+            city_spellings[value] = max(city_spellings.get(value, spelling), spelling)
+
+    category_labels = dict(Property.CATEGORY_CHOICES)
+    amenity_labels = {str(a.id): a.name for a in amenities or ()}
+    cities = sorted(counts["city"].items(), key=lambda item: (-item[1], item[0]))
+
+    return {
+        "category": [
+            {
+                "value": value,
+                "label": category_labels.get(value, value),
+                "count": count,
+                "query": _query_string(params, category=value),
+            }
+            for value, count in sorted(counts["category"].items())
+        ],
+        "bhk": [
+            {
+                "value": value,
+                "label": f"{value} BHK",
+                "count": count,
+                "query": _query_string(params, bhk=value),
+            }
+            for value, count in sorted(counts["bhk"].items(), key=lambda item: int(item[0]))
+        ],
+        "city": [
+            {
+                "value": value,
+                "label": city_spellings[value][1] or value.title(),
+                "count": count,
+                "query": _query_string(params, city=value),
+            }
+            for value, count in cities[:CITY_FACET_LIMIT]
+        ],
+        "amenities": [
+            {
+                "value": value,
+                "label": amenity_labels.get(value, value),
+                "count": count,
+            }
+            for value, count in sorted(counts["amenities"].items(), key=lambda item: -item[1])
+        ],
+        "price": [
+            {
+                "value": label,
+                "label": label,
+                "count": counts["price"][label],
+                "query": _query_string(
+                    params,
+                    min_price=min_price,
+                    max_price=None if max_price is None else max_price - PRICE_STEP,
+                ),
+            }
+            for label, min_price, max_price in PRICE_BUCKETS
+            if label in counts["price"]
+        ],
+    }
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from property.clusters import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the precomputed map clusters of active listings."
+
+    def handle(self, *args, **options):
+        total = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} map clusters."))
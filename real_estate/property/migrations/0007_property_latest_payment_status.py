@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:56
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_latest_payment_status(apps, schema_editor):
+    Payment = apps.get_model("payment", "Payment")
+    Property = apps.get_model("property", "Property")
+    latest = (
+        Payment.objects.filter(property_id=OuterRef("pk"))
+        .order_by("-created_at", "-pk")
+        .values("status")[:1]
+    )
+    Property.objects.update(latest_payment_status=Coalesce(Subquery(latest), Value("")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0006_mapcluster'),
+        ('payment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='latest_payment_status',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.RunPython(backfill_latest_payment_status, migrations.RunPython.noop),
+    ]
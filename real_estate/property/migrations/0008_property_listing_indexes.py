@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0007_property_latest_payment_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_active', 'created_at'], name='property_pr_is_acti_24376f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_active', 'price'], name='property_pr_is_acti_ba674a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_active', 'updated_at'], name='property_pr_is_acti_cd908d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['seller', 'created_at'], name='property_pr_seller__9ca4be_idx'),
+        ),
+    ]
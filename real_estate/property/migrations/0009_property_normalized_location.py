@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+from apps.geocoding.text import normalize
+
+
+def backfill_normalized_location(apps, schema_editor):
+    CityAlias = apps.get_model("core_geocoding", "CityAlias")
+    Property = apps.get_model("property", "Property")
+    aliases = dict(CityAlias.objects.values_list("alias", "city"))
+    batch = []
+    for prop in Property.objects.only("pk", "city", "state").iterator(chunk_size=1000):
+        city = normalize(prop.city)
+        prop.city_normalized = aliases.get(city, city)
+        prop.state_normalized = normalize(prop.state)
+        batch.append(prop)
+        if len(batch) == 1000:
+            Property.objects.bulk_update(batch, ["city_normalized", "state_normalized"])
+            batch = []
+    Property.objects.bulk_update(batch, ["city_normalized", "state_normalized"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0008_property_listing_indexes'),
+        ('core_geocoding', '0002_cityalias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='city_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='state_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_active', 'city_normalized'], name='property_pr_is_acti_6e4725_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['is_active', 'state_normalized'], name='property_pr_is_acti_fefeaa_idx'),
+        ),
+        migrations.RunPython(backfill_normalized_location, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+from config.counters import recount
+
+
+def backfill(apps, schema_editor):
+    recount(apps.get_model("property", "Property"), "lead_count", apps.get_model("leads", "BuyerLead"), "property")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0010_propertyimage_variants'),
+        ('leads', '0002_lead_otp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='lead_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,13 @@
 from django.db import models
+from django.db.models import Value
 
 from accounts.models import Seller
+from apps.geocoding.cities import canonical_city
+from apps.geocoding.text import normalize, prefix_q
+from apps.properties.geo import GeoQuerySetMixin
+from apps.properties.images import ResponsiveImageMixin
+from apps.properties.search import SearchQuerySetMixin
+from config.counters import CounterFieldsMixin
 
 
 class Amenity(models.Model):
@@ -13,18 +20,24 @@ class Amenity(models.Model):
         return self.name
 
 
-class PropertyQuerySet(models.QuerySet):
+class PropertyQuerySet(SearchQuerySetMixin, GeoQuerySetMixin, models.QuerySet):
     def active(self):
-        return self.filter(is_active=True)
+        # Value() makes Django emit "is_active = true" instead of the bare
+        # column, which SQLite cannot match against the (is_active, ...) indexes.
+        return self.filter(is_active=Value(True))
+
+    def inactive(self):
+        return self.filter(is_active=Value(False))
 
     def for_city(self, city: str):
+        """Listings whose (canonical) city starts with ``city``."""
         if city:
-            return self.filter(city__icontains=city)
+            return self.filter(prefix_q("city_normalized", canonical_city(city)))
         return self
 
     def for_state(self, state: str):
         if state:
-            return self.filter(state__icontains=state)
+            return self.filter(prefix_q("state_normalized", normalize(state)))
         return self
 
 
@@ -35,8 +48,17 @@ class PropertyManager(models.Manager):
     def active(self):
         return self.get_queryset().active()
 
+    def inactive(self):
+        return self.get_queryset().inactive()
+
+    def search(self, query: str):
+        return self.get_queryset().search(query)
+
+    def near(self, lat: float, lng: float, radius_km: float):
+        return self.get_queryset().near(lat, lng, radius_km)
 
-class Property(models.Model):
+
+class Property(CounterFieldsMixin, models.Model):
     RESIDENTIAL = "RES"
     COMMERCIAL = "COM"
     CATEGORY_CHOICES = [
@@ -90,6 +112,9 @@ class Property(models.Model):
     address = models.CharField(max_length=255)
     city = models.CharField(max_length=100)
     state = models.CharField(max_length=100)
+    # Lower-cased, trimmed copies maintained by save(); the city is canonical.
+    city_normalized = models.CharField(max_length=100, blank=True, editable=False)
+    state_normalized = models.CharField(max_length=100, blank=True, editable=False)
     latitude = models.FloatField(null=True, blank=True)
     longitude = models.FloatField(null=True, blank=True)
     facing = models.CharField(max_length=50, blank=True)
@@ -126,27 +151,85 @@ class Property(models.Model):
     
     amenities = models.ManyToManyField(Amenity, related_name="properties", blank=True)
     is_active = models.BooleanField(default=False)
+    # Status of the newest payment.Payment, kept in step by payment.reconcile.
+    latest_payment_status = models.CharField(max_length=20, blank=True, default="")
+    # Kept in step with the leads.BuyerLead rows by config.counters.
+    lead_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     objects = PropertyManager()
 
+    SEARCH_FIELDS = ("title", "description", "city")
+    COUNTER_FIELDS = ("lead_count",)
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["latitude", "longitude"]),
+            # Public listings: is_active filter + the list's sort orders.
+            models.Index(fields=["is_active", "created_at"]),
+            models.Index(fields=["is_active", "price"]),
+            models.Index(fields=["is_active", "updated_at"]),
+            # Seller dashboard.
+            models.Index(fields=["seller", "created_at"]),
+            # City / state filters (for_city, for_state).
+            models.Index(fields=["is_active", "city_normalized"]),
+            models.Index(fields=["is_active", "state_normalized"]),
+        ]
 
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.city_normalized = canonical_city(self.city)
+        self.state_normalized = normalize(self.state)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"city", "state"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "city_normalized", "state_normalized"}
+        super().save(*args, **kwargs)
+
 
-class PropertyImage(models.Model):
+class PropertyImage(ResponsiveImageMixin, models.Model):
     property = models.ForeignKey(
         Property, on_delete=models.CASCADE, related_name="images"
     )
     image = models.ImageField(upload_to="property_images/")
     is_primary = models.BooleanField(default=False)
+    # Resized WebP/JPEG copies, written by apps.properties.images.
+    variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self) -> str:
         return f"Image for {self.property_id}"
 
 
+class MapCluster(models.Model):
+    """
+    Active listings aggregated into one grid cell of the map at one zoom
+    level. Maintained by ``property.clusters``; see that module for the grid.
+    """
+
+    zoom = models.PositiveSmallIntegerField()
+    cell_x = models.IntegerField()
+    cell_y = models.IntegerField()
+    count = models.PositiveIntegerField(default=0)
+    sum_latitude = models.FloatField(default=0)
+    sum_longitude = models.FloatField(default=0)
+    min_price = models.DecimalField(max_digits=12, decimal_places=2)
+    max_price = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["zoom", "cell_x", "cell_y"], name="unique_map_cluster_cell"),
+        ]
+
+    def __str__(self) -> str:
+        return f"z{self.zoom} ({self.cell_x}, {self.cell_y}): {self.count}"
+
+    @property
+    def latitude(self) -> float:
+        return self.sum_latitude / self.count
 
+    @property
+    def longitude(self) -> float:
+        return self.sum_longitude / self.count
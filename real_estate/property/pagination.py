@@ -0,0 +1,19 @@
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+class CountedPaginator(Paginator):
+    """
+    ``Paginator`` that reuses a row count the caller already has (for example
+    from an aggregate query) instead of issuing its own ``COUNT(*)``.
+    """
+
+    def __init__(self, object_list, per_page, count: int | None = None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._known_count = count
+
+    @cached_property
+    def count(self) -> int:
+        if self._known_count is not None:
+            return self._known_count
+        return super().count
@@ -0,0 +1,109 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.properties import images
+from apps.properties.search import connect_index_signals
+from config import counters
+
+from . import autocomplete, clusters, detail_cache
+from .models import Amenity, Property, PropertyImage
+
+connect_index_signals(Property)
+counters.track(Property, "seller", "property_count")
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def invalidate_property_detail(sender, instance: Property, **kwargs) -> None:
+    detail_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=PropertyImage)
+@receiver(post_delete, sender=PropertyImage)
+def touch_property_on_image_change(sender, instance: PropertyImage, **kwargs) -> None:
+    detail_cache.touch(instance.property_id)
+
+
+@receiver(post_save, sender=PropertyImage)
+def generate_image_variants(sender, instance: PropertyImage, **kwargs) -> None:
+    if images.is_stale(instance, "image"):
+        images.schedule(instance, "image")
+
+
+@receiver(post_delete, sender=PropertyImage)
+def delete_image_variants(sender, instance: PropertyImage, **kwargs) -> None:
+    variants = instance.variants or {}
+    transaction.on_commit(lambda: images.delete_variants(instance.image, variants))
+
+
+@receiver(images.variants_generated, sender=PropertyImage)
+def touch_property_on_variants(sender, instance: PropertyImage, **kwargs) -> None:
+    detail_cache.touch(instance.property_id)
+
+
+@receiver(m2m_changed, sender=Property.amenities.through)
+def touch_property_on_amenity_change(sender, instance, action: str, reverse: bool, pk_set, **kwargs) -> None:
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            detail_cache.touch(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        detail_cache.touch(*pk_set)
+    elif action == "pre_clear":
+        detail_cache.touch(*instance.properties.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Amenity)
+@receiver(pre_delete, sender=Amenity)
+def touch_properties_on_amenity_edit(sender, instance: Amenity, **kwargs) -> None:
+    detail_cache.touch(*instance.properties.values_list("pk", flat=True))
+
+
+def _cluster_point(instance: Property):
+    return clusters.point_for(instance.latitude, instance.longitude, instance.price, instance.is_active)
+
+
+def _autocomplete_terms(instance: Property) -> set:
+    return autocomplete.index.terms_for(instance) if instance.is_active else set()
+
+
+@receiver(pre_save, sender=Property)
+@receiver(pre_delete, sender=Property)
+def remember_previous_state(sender, instance: Property, **kwargs) -> None:
+    """Keep the stored row's map point and suggestion terms for the post_* handlers."""
+    point, terms = None, set()
+    if instance.pk is not None:
+        fields = autocomplete.index.fields
+        row = (
+            sender.objects.filter(pk=instance.pk)
+            .values("latitude", "longitude", "price", "is_active", *fields.values())
+            .first()
+        )
+        if row is not None:
+            point = clusters.point_for(row["latitude"], row["longitude"], row["price"], row["is_active"])
+            if row["is_active"]:
+                terms = {(kind, row[field]) for kind, field in fields.items() if row[field]}
+    instance._cluster_point = point
+    instance._autocomplete_terms = terms
+
+
+@receiver(post_save, sender=Property)
+def update_map_clusters(sender, instance: Property, **kwargs) -> None:
+    clusters.apply_change(getattr(instance, "_cluster_point", None), _cluster_point(instance))
+    instance._cluster_point = _cluster_point(instance)
+
+
+@receiver(post_delete, sender=Property)
+def remove_from_map_clusters(sender, instance: Property, **kwargs) -> None:
+    clusters.apply_change(getattr(instance, "_cluster_point", None), None)
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def update_autocomplete(sender, instance: Property, signal, **kwargs) -> None:
+    previous = getattr(instance, "_autocomplete_terms", set())
+    current = _autocomplete_terms(instance) if signal is post_save else set()
+    instance._autocomplete_terms = current
+    changed = previous ^ current
+    if changed:
+        transaction.on_commit(lambda: autocomplete.index.refresh(changed))
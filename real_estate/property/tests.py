@@ -0,0 +1,163 @@
+import base64
+from datetime import timedelta
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Seller
+from apps.properties.pagination import InvalidCursor, KeysetPaginator, encode_cursor
+
+from .facets import compute_facets
+from .models import Property
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite's")
+class ListingIndexPlanTests(TestCase):
+    def assertUsesIndex(self, queryset, index: str):
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_active_newest_first_uses_is_active_created_at_index(self):
+        self.assertUsesIndex(Property.objects.active().order_by("-created_at"), "property_pr_is_acti_24376f_idx")
+
+    def test_active_by_price_uses_is_active_price_index(self):
+        self.assertUsesIndex(Property.objects.active().order_by("price"), "property_pr_is_acti_ba674a_idx")
+
+    def test_inactive_by_update_uses_is_active_updated_at_index(self):
+        self.assertUsesIndex(Property.objects.inactive().order_by("-updated_at"), "property_pr_is_acti_cd908d_idx")
+
+    def test_bare_boolean_filter_cannot_use_the_index(self):
+        # Why active()/inactive() compare against Value(): SQLite plans the bare
+        # column as a scan plus a sort.
+        plan = Property.objects.filter(is_active=True).order_by("-created_at").explain()
+        self.assertIn("TEMP B-TREE", plan)
+
+    def test_seller_listings_use_seller_created_at_index(self):
+        self.assertUsesIndex(Property.objects.filter(seller_id=1).order_by("-created_at"), "property_pr_seller__9ca4be_idx")
+
+
+class KeysetPaginationTests(TestCase):
+    PRICES = [300, 100, 200, 100, 300, 100, 200, 400, 100, 300, 200]
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = Seller.objects.create(name="Seller", email="seller@example.com", phone="9000000000")
+        for price in cls.PRICES:
+            Property.objects.create(
+                seller=seller,
+                title="Flat",
+                category=Property.RESIDENTIAL,
+                subcategory="APARTMENT",
+                property_type="SELL",
+                price=price,
+                address="1 Main Road",
+                city="Pune",
+                state="Maharashtra",
+                is_active=True,
+            )
+        # Half the listings share one timestamp, so "newest" ties too.
+        same = timezone.now() - timedelta(days=1)
+        pks = list(Property.objects.order_by("pk").values_list("pk", flat=True))
+        Property.objects.filter(pk__in=pks[::2]).update(created_at=same)
+
+    def walk(self, ordering, per_page: int = 3) -> tuple[list[int], list[list[int]], list[list[int]]]:
+        """Ids page by page forwards, then the pages again walking back from the last one."""
+        paginator = KeysetPaginator(Property.objects.active(), ordering, per_page)
+        pages, page = [], paginator.get_page()
+        while True:
+            pages.append([prop.pk for prop in page])
+            if not page.has_next:
+                break
+            page = paginator.get_page(page.next_cursor)
+        backwards = [[prop.pk for prop in page]]
+        while page.has_previous:
+            page = paginator.get_page(page.previous_cursor)
+            backwards.insert(0, [prop.pk for prop in page])
+        return [pk for ids in pages for pk in ids], pages, backwards
+
+    def test_pages_cover_every_row_once_in_order_despite_ties(self):
+        for ordering in (("price", "id"), ("-price", "-id"), ("-created_at", "-id")):
+            with self.subTest(ordering=ordering):
+                ids, pages, backwards = self.walk(ordering)
+                expected = list(Property.objects.order_by(*ordering).values_list("pk", flat=True))
+                self.assertEqual(ids, expected)
+                self.assertEqual(backwards, pages)
+                self.assertEqual([len(page) for page in pages], [3, 3, 3, 2])
+
+    def test_first_page_has_no_previous_and_counts_everything(self):
+        page = KeysetPaginator(Property.objects.active(), ("price", "id"), 3).get_page()
+        self.assertFalse(page.has_previous)
+        self.assertIsNone(page.previous_cursor)
+        self.assertEqual(page.count, len(self.PRICES))
+        page = KeysetPaginator(Property.objects.active(), ("price", "id"), 3, with_count=False).get_page()
+        self.assertIsNone(page.count)
+
+    def test_next_cursor_is_the_last_rows_sort_key(self):
+        paginator = KeysetPaginator(Property.objects.active(), ("price", "id"), 4)
+        page = paginator.get_page()
+        last = page.object_list[-1]
+        self.assertEqual(last.price, Decimal("100"))
+        self.assertEqual(page.next_cursor, encode_cursor([str(last.price), last.pk]))
+        # All four 100s were on the first page.
+        self.assertEqual(paginator.get_page(page.next_cursor).object_list[0].price, Decimal("200"))
+
+    def test_bad_cursors_raise_invalid_cursor(self):
+        paginator = KeysetPaginator(Property.objects.active(), ("-created_at", "-id"), 3)
+        tampered = base64.urlsafe_b64encode(b'{"v":["not a date",1]}').decode()
+        for cursor in ("garbage", encode_cursor([1]), tampered, base64.urlsafe_b64encode(b"[1]").decode()):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                paginator.get_page(cursor)
+
+    def test_list_view_falls_back_to_first_page_for_a_bad_cursor(self):
+        first = self.client.get(reverse("property:list"))
+        response = self.client.get(reverse("property:list"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [prop.pk for prop in response.context["page_obj"]], [prop.pk for prop in first.context["page_obj"]]
+        )
+
+    def test_api_rejects_a_bad_cursor(self):
+        self.assertEqual(self.client.get("/api/properties/", {"cursor": "garbage"}).status_code, 404)
+        self.assertEqual(self.client.get("/api/properties/").status_code, 200)
+
+
+class CityFacetTests(TestCase):
+    CITIES = ["Bengaluru", "bengaluru ", "Bangalore", "Bengaluru", "Pune", "PUNE", "Pune", "Mysuru"]
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = Seller.objects.create(name="Seller", email="seller@example.com", phone="9000000000")
+        for city in cls.CITIES:
+            Property.objects.create(
+                seller=seller,
+                title="Flat",
+                category=Property.RESIDENTIAL,
+                subcategory="APARTMENT",
+                property_type="SELL",
+                price=100,
+                address="1 Main Road",
+                city=city,
+                state="Karnataka",
+                is_active=True,
+            )
+
+    def test_spellings_of_a_city_count_as_one(self):
+        # "Bangalore" is mapped by the CityAlias rows the migrations ship with.
+        facets = compute_facets(Property.objects.active())["city"]
+        self.assertEqual(
+            [(f["value"], f["label"], f["count"]) for f in facets],
+            [("bengaluru", "Bengaluru", 4), ("pune", "Pune", 3), ("mysuru", "Mysuru", 1)],
+        )
+
+    def test_refine_link_selects_every_spelling(self):
+        facet = compute_facets(Property.objects.active())["city"][0]
+        self.assertEqual(facet["query"], "city=bengaluru")
+        response = self.client.get(f"{reverse('property:list')}?{facet['query']}")
+        self.assertEqual(response.status_code, 200)
+        # Narrowed to that one city, which keeps all four listings.
+        self.assertEqual(response.context["facets"]["city"], [facet])
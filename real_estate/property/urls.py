@@ -9,10 +9,13 @@ from .views import (
     ApprovePendingPropertyView,
     DeactivateLivePropertyView,
     PendingPropertyAdminView,
+    PropertyAutocompleteView,
+    PropertyClusterView,
     PropertyCreateView,
     PropertyDeleteView,
     PropertyDetailView,
     PropertyListView,
+    PropertyNearbyView,
     PropertyPreviewView,
     PropertyUpdateView,
 )
@@ -45,6 +48,9 @@ urlpatterns = [
         name="admin_deactivate_property",
     ),
     path("", PropertyListView.as_view(), name="list"),
+    path("nearby/", PropertyNearbyView.as_view(), name="nearby"),
+    path("clusters/", PropertyClusterView.as_view(), name="clusters"),
+    path("autocomplete/", PropertyAutocompleteView.as_view(), name="autocomplete"),
     path("<int:pk>/", PropertyDetailView.as_view(), name="detail"),
     path("<int:pk>/preview/", PropertyPreviewView.as_view(), name="preview"),
     path("create-form/", PropertyCreateView.as_view(), name="create_form"),
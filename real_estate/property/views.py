@@ -3,8 +3,9 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Count, OuterRef, Q, Subquery, Sum
-from django.http import HttpRequest, HttpResponse
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.decorators import method_decorator
@@ -13,12 +14,19 @@ from django.views import View
 from accounts.views import seller_login_required
 from accounts.models import Seller
 from apps.accounts.models import UserRole
+from apps.properties.geo import geo_filter, parse_bbox, result_limit
+from apps.properties.pagination import InvalidCursor, KeysetPaginator, resolve_ordering
+from config.db_router import use_replica
 from payment.models import Payment
 
+from . import autocomplete, clusters, detail_cache
+from .facets import compute_facets
 from .forms import PropertyForm, PropertyImageFormSet
 from .models import Amenity, Property
+from .pagination import CountedPaginator
 
 
+@method_decorator(use_replica, name="dispatch")
 class HomeView(View):
     template_name = "property/home.html"
 
@@ -33,13 +41,9 @@ class HomeView(View):
             "images"
         )
         if query:
-            properties = properties.filter(
-                Q(title__icontains=query)
-                | Q(description__icontains=query)
-                | Q(city__icontains=query)
-            )
+            properties = properties.search(query)
         if city:
-            properties = properties.filter(city__icontains=city)
+            properties = properties.for_city(city)
         if bhk:
             properties = properties.filter(bhk=bhk)
         if min_price:
@@ -58,31 +62,32 @@ class HomeView(View):
         )
 
 
+@method_decorator(use_replica, name="dispatch")
 class PropertyListView(View):
     template_name = "property/property_list.html"
+    paginate_by = 9
+
+    def filter_queryset(self, qs, params):
+        query = params.get("q")
+        category = params.get("category")
+        ptype = params.get("type")
+        city = params.get("city")
+        state = params.get("state")
+        bhk = params.get("bhk")
+        min_price = params.get("min_price")
+        max_price = params.get("max_price")
+        amenities = params.getlist("amenities")
 
-    def get(self, request: HttpRequest) -> HttpResponse:
-        qs = Property.objects.active().select_related("seller").prefetch_related(
-            "images", "amenities"
-        )
-        category = request.GET.get("category")
-        ptype = request.GET.get("type")
-        city = request.GET.get("city")
-        state = request.GET.get("state")
-        bhk = request.GET.get("bhk")
-        min_price = request.GET.get("min_price")
-        max_price = request.GET.get("max_price")
-        amenities = request.GET.getlist("amenities")
-        sort = request.GET.get("sort")
-
+        if query:
+            qs = qs.search(query)
         if category:
             qs = qs.filter(category=category)
         if ptype:
             qs = qs.filter(property_type=ptype)
         if city:
-            qs = qs.filter(city__icontains=city)
+            qs = qs.for_city(city)
         if state:
-            qs = qs.filter(state__icontains=state)
+            qs = qs.for_state(state)
         if bhk:
             qs = qs.filter(bhk=bhk)
         if min_price:
@@ -91,70 +96,98 @@ class PropertyListView(View):
             qs = qs.filter(price__lte=max_price)
         if amenities:
             qs = qs.filter(amenities__id__in=amenities).distinct()
+        return qs
 
-        if sort == "price_high":
-            qs = qs.order_by("-price")
-        elif sort == "price_low":
-            qs = qs.order_by("price")
-        else:
-            qs = qs.order_by("-created_at")
-
-        paginator = Paginator(qs, 9)
-        page_number = request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
-
-        all_amenities = Amenity.objects.all()
-
-        return render(
-            request,
-            self.template_name,
-            {
-                "page_obj": page_obj,
-                "amenities": all_amenities,
-            },
+    def get(self, request: HttpRequest) -> HttpResponse:
+        qs = Property.objects.active().select_related("seller").prefetch_related(
+            "images", "amenities"
         )
+        qs = self.filter_queryset(qs, request.GET)
+        page_obj, cursor_mode = self.paginate(request, qs)
+
+        all_amenities = list(Amenity.objects.all())
+        facets = compute_facets(qs, request.GET, all_amenities)
+        amenity_counts = {f["value"]: f["count"] for f in facets["amenities"]}
+        for amenity in all_amenities:
+            amenity.facet_count = amenity_counts.get(str(amenity.id), 0)
+
+        context = {
+            "page_obj": page_obj,
+            "cursor_mode": cursor_mode,
+            "amenities": all_amenities,
+            "facets": facets,
+        }
+        if cursor_mode:
+            context["next_query"] = self._cursor_query(request, page_obj.next_cursor)
+            context["previous_query"] = self._cursor_query(request, page_obj.previous_cursor)
+        return render(request, self.template_name, context)
+
+    def paginate(self, request: HttpRequest, qs):
+        """
+        Keyset pagination by default; ``?page=N`` links (or
+        ``PROPERTY_LIST_PAGINATION = "page"``) keep the numbered paginator.
+        """
+        sort = request.GET.get("sort")
+        if request.GET.get("page") or settings.PROPERTY_LIST_PAGINATION != "cursor":
+            if sort == "price_high":
+                qs = qs.order_by("-price")
+            elif sort == "price_low":
+                qs = qs.order_by("price")
+            elif not request.GET.get("q"):
+                qs = qs.order_by("-created_at")
+            paginator = Paginator(qs, self.paginate_by)
+            return paginator.get_page(request.GET.get("page")), False
+
+        ordering = resolve_ordering(sort, searched="search_rank" in qs.query.annotations)
+        with_count = request.GET.get("count", "1") != "0"
+        paginator = KeysetPaginator(qs, ordering, self.paginate_by, with_count)
+        try:
+            return paginator.get_page(request.GET.get("cursor")), True
+        except InvalidCursor:
+            return paginator.get_page(), True
+
+    @staticmethod
+    def _cursor_query(request: HttpRequest, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        params = request.GET.copy()
+        params.pop("page", None)
+        params["cursor"] = cursor
+        return params.urlencode()
 
 
 class PropertyDetailView(View):
     template_name = "property/property_detail.html"
 
     def get(self, request: HttpRequest, pk: int) -> HttpResponse:
+        listing = detail_cache.get_listing(pk)
+
         # Allow a logged-in seller to view their own property's detail page without
         # needing a buyer login.
         seller_id = request.session.get("seller_id")
-        if seller_id:
-            seller_property = (
-                Property.objects.select_related("seller")
-                .prefetch_related("images", "amenities")
-                .filter(pk=pk, seller_id=seller_id)
-                .first()
-            )
-            if seller_property:
-                if not seller_property.is_active:
-                    messages.info(
-                        request,
-                        "This is a preview of your listing. It will be visible to buyers after an admin activates it.",
-                    )
-                return render(
+        if seller_id and listing and listing["seller_id"] == seller_id:
+            if not listing["is_active"]:
+                messages.info(
                     request,
-                    self.template_name,
-                    {"property": seller_property, "is_seller_owner": True},
+                    "This is a preview of your listing. It will be visible to buyers after an admin activates it.",
                 )
+            return render(
+                request,
+                self.template_name,
+                detail_cache.listing_context(listing, is_seller_owner=True),
+            )
 
         if not request.user.is_authenticated or request.user.role != UserRole.BUYER:
             messages.info(request, "Login required to view property details.")
             buyer_login_url = reverse("accounts:buyer_login")
             return redirect(f"{buyer_login_url}?next={request.path}")
 
-        prop = get_object_or_404(
-            Property.objects.select_related("seller").prefetch_related("images", "amenities"),
-            pk=pk,
-            is_active=True,
-        )
+        if not listing or not listing["is_active"]:
+            raise Http404("No Property matches the given query.")
         return render(
             request,
             self.template_name,
-            {"property": prop, "is_seller_owner": False},
+            detail_cache.listing_context(listing, is_seller_owner=False),
         )
 
 
@@ -167,11 +200,9 @@ class PropertyPreviewView(View):
 
     def get(self, request: HttpRequest, pk: int) -> HttpResponse:
         seller_id = request.session.get("seller_id")
-        prop = get_object_or_404(
-            Property.objects.select_related("seller").prefetch_related("images", "amenities"),
-            pk=pk,
-            seller_id=seller_id,
-        )
+        listing = detail_cache.get_listing(pk)
+        if not listing or listing["seller_id"] != seller_id:
+            raise Http404("No Property matches the given query.")
         messages.info(
             request,
             "This is a preview of your listing. It will be visible to buyers after an admin activates it.",
@@ -179,10 +210,83 @@ class PropertyPreviewView(View):
         return render(
             request,
             self.template_name,
-            {"property": prop, "is_seller_owner": True},
+            detail_cache.listing_context(listing, is_seller_owner=True),
+        )
+
+
+@method_decorator(use_replica, name="dispatch")
+class PropertyNearbyView(View):
+    """Active listings around a point (``lat``/``lng``/``radius``) or in a ``bbox``, as JSON."""
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        try:
+            qs = geo_filter(Property.objects.active(), request.GET)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        exclude = request.GET.get("exclude")
+        if exclude and exclude.isdigit():
+            qs = qs.exclude(pk=exclude)
+        rows = qs.values("id", "title", "price", "city", "latitude", "longitude", "distance_km")
+        results = [
+            {
+                **row,
+                "price": str(row["price"]),
+                "distance_km": round(row["distance_km"], 3),
+                "url": reverse("property:detail", args=[row["id"]]),
+            }
+            for row in rows[: result_limit(request.GET)]
+        ]
+        return JsonResponse({"results": results})
+
+
+@method_decorator(use_replica, name="dispatch")
+class PropertyClusterView(View):
+    """Precomputed marker clusters for a map viewport: ``?zoom=<z>&bbox=west,south,east,north``."""
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        try:
+            zoom = int(request.GET.get("zoom", ""))
+        except ValueError:
+            return JsonResponse({"error": "'zoom' must be an integer."}, status=400)
+        try:
+            bbox = parse_bbox(request.GET.get("bbox", ""))
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+        zoom, rows = clusters.clusters_in_view(zoom, *bbox)
+        return JsonResponse(
+            {
+                "zoom": zoom,
+                "max_zoom": clusters.MAX_CLUSTER_ZOOM,
+                "clusters": [
+                    {
+                        "latitude": round(cluster.latitude, 6),
+                        "longitude": round(cluster.longitude, 6),
+                        "count": cluster.count,
+                        "min_price": str(cluster.min_price),
+                        "max_price": str(cluster.max_price),
+                    }
+                    for cluster in rows
+                ],
+            }
         )
 
 
+@method_decorator(use_replica, name="dispatch")
+class PropertyAutocompleteView(View):
+    """City / state suggestions for the search boxes: ``?q=<prefix>&kind=city|state&limit=``."""
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        try:
+            limit = int(request.GET.get("limit", 8))
+        except ValueError:
+            return JsonResponse({"error": "'limit' must be an integer."}, status=400)
+        kinds = request.GET.getlist("kind") or None
+        results = autocomplete.index.suggest(request.GET.get("q", ""), limit, kinds)
+        response = JsonResponse({"results": results})
+        response["Cache-Control"] = "public, max-age=60"
+        return response
+
+
 class PropertyCreateView(View):
     template_name = "property/property_form.html"
 
@@ -207,15 +311,16 @@ class PropertyCreateView(View):
         form = PropertyForm(request.POST)
         formset = PropertyImageFormSet(request.POST, request.FILES)
         if form.is_valid() and formset.is_valid():
-            prop = form.save(commit=False)
-            prop.seller = seller
-            prop.is_active = False
-            prop.save()
-            form.save_m2m()
-            images = formset.save(commit=False)
-            for img in images:
-                img.property = prop
-                img.save()
+            with transaction.atomic():
+                prop = form.save(commit=False)
+                prop.seller = seller
+                prop.is_active = False
+                prop.save()
+                form.save_m2m()
+                images = formset.save(commit=False)
+                for img in images:
+                    img.property = prop
+                    img.save()
             messages.info(
                 request,
                 "Property saved as draft. Complete payment so an admin can review and activate your listing.",
@@ -321,54 +426,76 @@ class AdminPanelLogoutView(View):
 
 @method_decorator(staff_member_required(login_url="/properties/admin/login/"), name="dispatch")
 class PendingPropertyAdminView(View):
+    """
+    Admin moderation panel. Only the selected tab's rows are loaded, one page
+    at a time, and every counter on the page comes from one aggregate query.
+    """
+
     template_name = "property/admin_pending_properties.html"
+    tabs = ("pending", "live", "payments", "amenities")
+    paginate_by = 20
+
+    def get_stats(self) -> dict:
+        # Property LEFT JOIN Payment: property counters are DISTINCT, payment
+        # counters see each payment row exactly once.
+        stats = Property.objects.aggregate(
+            total_properties=Count("id", distinct=True),
+            pending_count=Count("id", distinct=True, filter=Q(is_active=False)),
+            live_count=Count("id", distinct=True, filter=Q(is_active=True)),
+            payment_count=Count("payment"),
+            payment_success_count=Count("payment", filter=Q(payment__status="SUCCESS")),
+            payment_success_amount=Sum("payment__amount", filter=Q(payment__status="SUCCESS")),
+        )
+        stats["payment_success_amount"] = stats["payment_success_amount"] or 0
+        return stats
+
+    def get_tab_queryset(self, tab: str):
+        if tab == "pending":
+            return (
+                Property.objects.inactive()
+                .select_related("seller")
+                .order_by("-created_at")
+            )
+        if tab == "live":
+            return (
+                Property.objects.active()
+                .select_related("seller")
+                .order_by("-updated_at")
+            )
+        if tab == "payments":
+            return Payment.objects.select_related("seller", "property").order_by("-created_at")
+        return Amenity.objects.all()
 
     def get(self, request: HttpRequest) -> HttpResponse:
-        latest_payment_status = (
-            Payment.objects.filter(property_id=OuterRef("pk"))
-            .order_by("-created_at")
-            .values("status")[:1]
-        )
-        pending_properties = (
-            Property.objects.filter(is_active=False)
-            .annotate(payment_status=Subquery(latest_payment_status))
-            .select_related("seller")
-            .prefetch_related("images")
-            .order_by("-created_at")
+        tab = request.GET.get("tab")
+        if tab not in self.tabs:
+            tab = "pending"
+        stats = self.get_stats()
+        known_counts = {
+            "pending": stats["pending_count"],
+            "live": stats["live_count"],
+            "payments": stats["payment_count"],
+        }
+        paginator = CountedPaginator(
+            self.get_tab_queryset(tab), self.paginate_by, count=known_counts.get(tab)
         )
-        live_properties = (
-            Property.objects.filter(is_active=True)
-            .select_related("seller")
-            .prefetch_related("images")
-            .order_by("-updated_at")
-        )
-        payments = (
-            Payment.objects.select_related("seller", "property")
-            .order_by("-created_at")
-        )
-        successful_payments = payments.filter(status="SUCCESS")
-        payment_success_amount = successful_payments.aggregate(total=Sum("amount"))["total"] or 0
-        amenities = Amenity.objects.all()
+        page_obj = paginator.get_page(request.GET.get("page"))
 
         return render(
             request,
             self.template_name,
             {
-                "pending_properties": pending_properties,
-                "live_properties": live_properties,
-                "payments": payments,
-                "amenities": amenities,
-                "total_properties": pending_properties.count() + live_properties.count(),
-                "pending_count": pending_properties.count(),
-                "live_count": live_properties.count(),
-                "amenity_count": amenities.count(),
-                "payment_count": payments.count(),
-                "payment_success_count": successful_payments.count(),
-                "payment_success_amount": payment_success_amount,
+                "tab": tab,
+                "page_obj": page_obj,
+                **stats,
             },
         )
 
 
+def _redirect_to_admin_tab(tab: str) -> HttpResponse:
+    return redirect(f"{reverse('property:admin_pending')}?tab={tab}")
+
+
 @method_decorator(staff_member_required(login_url="/properties/admin/login/"), name="dispatch")
 class ApprovePendingPropertyView(View):
     def post(self, request: HttpRequest, pk: int) -> HttpResponse:
@@ -386,7 +513,7 @@ class DeactivateLivePropertyView(View):
         prop.is_active = False
         prop.save(update_fields=["is_active", "updated_at"])
         messages.info(request, f'"{prop.title}" moved back to pending.')
-        return redirect("property:admin_pending")
+        return _redirect_to_admin_tab("live")
 
 
 @method_decorator(staff_member_required(login_url="/properties/admin/login/"), name="dispatch")
@@ -395,16 +522,16 @@ class AdminAmenityCreateView(View):
         amenity_name = (request.POST.get("amenity_name") or "").strip()
         if not amenity_name:
             messages.error(request, "Amenity name is required.")
-            return redirect("property:admin_pending")
+            return _redirect_to_admin_tab("amenities")
 
         existing = Amenity.objects.filter(name__iexact=amenity_name).first()
         if existing:
             messages.info(request, f'Amenity "{existing.name}" already exists.')
-            return redirect("property:admin_pending")
+            return _redirect_to_admin_tab("amenities")
 
         Amenity.objects.create(name=amenity_name)
         messages.success(request, f'Amenity "{amenity_name}" added successfully.')
-        return redirect("property:admin_pending")
+        return _redirect_to_admin_tab("amenities")
 
 
 @method_decorator(staff_member_required(login_url="/properties/admin/login/"), name="dispatch")
@@ -414,14 +541,14 @@ class AdminAmenityDeleteView(View):
         amenity_name = amenity.name
         amenity.delete()
         messages.info(request, f'Amenity "{amenity_name}" deleted.')
-        return redirect("property:admin_pending")
+        return _redirect_to_admin_tab("amenities")
 
 
 @method_decorator(staff_member_required(login_url="/properties/admin/login/"), name="dispatch")
 class AdminPropertyDeleteView(View):
     def post(self, request: HttpRequest, pk: int) -> HttpResponse:
         prop = get_object_or_404(Property, pk=pk)
-        prop_title = prop.title
+        prop_title, tab = prop.title, "live" if prop.is_active else "pending"
         prop.delete()
         messages.info(request, f'Property "{prop_title}" deleted.')
-        return redirect("property:admin_pending")
+        return _redirect_to_admin_tab(tab)
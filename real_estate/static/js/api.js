@@ -83,6 +83,10 @@ const propertyAPI = {
         const query = new URLSearchParams(params).toString();
         return apiRequest(`/properties/search/${query ? '?' + query : ''}`);
     },
+    nearby: (params = {}) => {
+        const query = new URLSearchParams(params).toString();
+        return apiRequest(`/properties/nearby/?${query}`);
+    },
     get: (id) => apiRequest(`/properties/${id}/`),
     create: (data) => apiRequest('/properties/', {
         method: 'POST',
@@ -154,6 +158,20 @@ function formatCurrency(amount) {
     }).format(amount);
 }
 
+// URL of a resized photo ("thumb", "card" or "full"), falling back to the upload
+function mediaUrl(media, variant = 'card') {
+    const entry = media.variants && media.variants[variant];
+    return entry ? entry.jpeg : media.file;
+}
+
+// <picture> with WebP/JPEG srcsets for a PropertyMedia image
+function mediaPicture(media, alt, className, sizes = '100vw') {
+    const srcset = media.srcset || {};
+    const webp = srcset.webp ? `<source type="image/webp" srcset="${srcset.webp}" sizes="${sizes}">` : '';
+    const jpeg = srcset.jpeg ? ` srcset="${srcset.jpeg}" sizes="${sizes}"` : '';
+    return `<picture>${webp}<img src="${mediaUrl(media)}"${jpeg} class="${className}" alt="${alt}" loading="lazy"></picture>`;
+}
+
 // Show alert/toast
 function showAlert(message, type = 'info') {
     const alertDiv = document.createElement('div');
@@ -40,6 +40,43 @@ document.addEventListener("DOMContentLoaded", function () {
     categorySelect.addEventListener("change", updateSubcategories);
     updateSubcategories();
   }
-});
-
 
+  // Location suggestions: <input data-autocomplete="/properties/autocomplete/?kind=city">
+  document.querySelectorAll("input[data-autocomplete]").forEach((input, index) => {
+    const datalist = document.createElement("datalist");
+    datalist.id = `autocomplete-${index}`;
+    input.setAttribute("list", datalist.id);
+    input.setAttribute("autocomplete", "off");
+    input.after(datalist);
+    let timer = null;
+    let controller = null;
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      const query = input.value.trim();
+      if (query.length < 2) {
+        datalist.innerHTML = "";
+        return;
+      }
+      timer = setTimeout(() => {
+        if (controller) {
+          controller.abort();
+        }
+        controller = new AbortController();
+        const url = new URL(input.dataset.autocomplete, window.location.origin);
+        url.searchParams.set("q", query);
+        fetch(url, { signal: controller.signal })
+          .then((response) => (response.ok ? response.json() : { results: [] }))
+          .then(({ results }) => {
+            datalist.innerHTML = "";
+            results.forEach(({ name, count }) => {
+              const option = document.createElement("option");
+              option.value = name;
+              option.label = `${name} (${count})`;
+              datalist.appendChild(option);
+            });
+          })
+          .catch(() => {});
+      }, 150);
+    });
+  });
+});